@@ -0,0 +1,53 @@
+# bench_import_time.py
+#
+# Measures the startup time of every pipeline script with `python -X importtime`,
+# running `<script> --help`, and lists the modules that take longest to import.
+#
+# Usage:
+# python benchmarks/bench_import_time.py
+# python benchmarks/bench_import_time.py --script=scripts/eda_deepchecks.py --top=10
+
+import click
+import glob
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def import_times(script):
+    """Run `script --help` with -X importtime and return the wall time and the cumulative import time per top-level module in seconds."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    wall = time.perf_counter() - start
+
+    # lines look like "import time:   self [us] | cumulative | imported package",
+    # with nested imports indented after the last "|"
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative) / 1e6
+    return wall, modules
+
+
+@click.command()
+@click.option('--script', type=str, multiple=True, help="Scripts to measure (repeatable); all of scripts/ by default")
+@click.option('--top', type=int, default=3, help="Number of slowest top-level imports listed per script")
+def main(script, top):
+    """Report the --help startup time and the slowest imports of each script."""
+    scripts = script or sorted(glob.glob(os.path.join(ROOT, 'scripts', '*.py')))
+    for path in scripts:
+        wall, modules = import_times(os.path.abspath(path))
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+        print(f"{os.path.basename(path):<32} {wall:6.2f} s  imports {sum(modules.values()):6.2f} s  "
+              + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in slowest))
+
+
+if __name__ == '__main__':
+    main()
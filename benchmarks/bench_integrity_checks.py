@@ -0,0 +1,45 @@
+# bench_integrity_checks.py
+#
+# Compares the native integrity checks of src/integrity_checks.py with the
+# same four checks run through deepchecks on synthetic diabetes data.
+#
+# Usage:
+# python benchmarks/bench_integrity_checks.py --n-rows=768 --n-rows=1000000
+
+import click
+import os
+import sys
+import time
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from bench_validation import make_diabetes_data
+from src.integrity_checks import integrity_checks
+
+
+@click.command()
+@click.option('--n-rows', type=int, multiple=True, default=[768, 1_000_000], help="Number of rows to check (repeatable)")
+@click.option('--deepchecks/--no-deepchecks', default=True, help="Also time the checks through deepchecks")
+def main(n_rows, deepchecks):
+    """Time the four integrity checks natively and through deepchecks."""
+    warnings.filterwarnings("ignore")
+    if deepchecks:
+        from deepchecks.tabular import Dataset
+        from deepchecks.tabular.checks import ClassImbalance, PercentOfNulls, DataDuplicates, FeatureFeatureCorrelation
+
+    for n in n_rows:
+        data = make_diabetes_data(n, invalid_fraction=0)
+        start = time.perf_counter()
+        integrity_checks(data, raise_on_failure=False)
+        print(f"{n:>12,} rows  native     {time.perf_counter() - start:8.3f} s")
+
+        if deepchecks:
+            start = time.perf_counter()
+            dataset = Dataset(data, label='Outcome', cat_features=[])
+            for check in [ClassImbalance(), PercentOfNulls(), DataDuplicates(), FeatureFeatureCorrelation()]:
+                check.run(dataset)
+            print(f"{n:>12,} rows  deepchecks {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
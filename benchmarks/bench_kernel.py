@@ -0,0 +1,70 @@
+# bench_kernel.py
+#
+# Compares the throughput of the fused inference kernel
+# (src/fused_linear_kernel.py) in float64 and float32 with predict_proba of
+# the scikit-learn pipeline it was fused from, on synthetic diabetes data.
+#
+# Usage:
+# python benchmarks/bench_kernel.py --n-rows=1000000 --n-rows=10000000 --n-rows=100000000
+#
+# Rows beyond --block-rows are scored in blocks of that many rows, one block
+# of features being scored again and again, so 100M rows fit in memory. The
+# fused kernel writes each block's probabilities to one reused buffer.
+
+import click
+import os
+import pickle
+import sys
+import time
+import numpy as np
+
+root_dir = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root_dir)
+from bench_validation import make_diabetes_data
+from src.fused_linear_kernel import FusedLinearModel
+
+
+def time_blocks(predict, n_rows, block_rows):
+    """Seconds taken by `predict(n)` for blocks of `n` rows adding up to `n_rows`."""
+    start = time.perf_counter()
+    for block_start in range(0, n_rows, block_rows):
+        predict(min(block_rows, n_rows - block_start))
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, default=os.path.join(root_dir, 'results', 'models', 'random_fit.pkl'), help="Pickled search whose best pipeline is fused")
+@click.option('--n-rows', type=int, multiple=True, default=[1_000_000, 10_000_000], help="Number of rows scored (repeatable)")
+@click.option('--block-rows', type=int, default=10_000_000, help="Rows scored at a time")
+def main(pipeline_from, n_rows, block_rows):
+    """Print the rows per second of each way of scoring."""
+    with open(pipeline_from, 'rb') as f:
+        pipeline = pickle.load(f).best_estimator_
+    fused = FusedLinearModel.from_model(pipeline)
+
+    data = make_diabetes_data(min(max(n_rows), block_rows), invalid_fraction=0)
+    X = data[list(fused.feature_names)]
+    X64 = X.to_numpy(dtype=np.float64)
+    X32 = X.to_numpy(dtype=np.float32)
+    out64, out32 = np.empty(len(X)), np.empty(len(X), dtype=np.float32)
+
+    # the fused probabilities agree with the pipeline's
+    sample = slice(0, 100_000)
+    reference = pipeline.predict_proba(X.iloc[sample])[:, 1]
+    for name, X_fused in [('float64', X64), ('float32', X32)]:
+        error = np.abs(fused.predict_proba_1(X_fused[sample]) - reference).max()
+        print(f"max |fused {name} - sklearn| = {error:.2e}")
+
+    ways = {
+        'sklearn predict_proba': lambda n: pipeline.predict_proba(X.iloc[:n]),
+        'fused float64': lambda n: fused.predict_proba_1(X64[:n], out=out64[:n]),
+        'fused float32': lambda n: fused.predict_proba_1(X32[:n], out=out32[:n]),
+    }
+    for n in n_rows:
+        for name, predict in ways.items():
+            seconds = time_blocks(predict, n, block_rows)
+            print(f"{n:>12,} rows  {name:<22} {seconds:8.2f} s  {n / seconds / 1e6:8.1f} M rows/s")
+
+
+if __name__ == '__main__':
+    main()
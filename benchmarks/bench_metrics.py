@@ -0,0 +1,50 @@
+# bench_metrics.py
+#
+# Compares the test metrics of evaluate_predictor.py computed with
+# src/binary_metrics.py from one sort of the probabilities, with the
+# separate scikit-learn metrics it replaced, on synthetic predictions.
+#
+# Usage:
+# python benchmarks/bench_metrics.py --n-rows=1000000 --n-rows=10000000
+
+import click
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.binary_metrics import binary_metrics
+
+
+def sklearn_metrics(y_true, y_prob):
+    """The metrics as evaluate_predictor.py computed them, each from the labels or probabilities again."""
+    from sklearn.metrics import (accuracy_score, auc, average_precision_score, confusion_matrix, fbeta_score,
+                                 precision_recall_curve, roc_curve)
+
+    y_pred = (y_prob > 0.5).astype(int)
+    accuracy_score(y_true, y_pred)
+    fbeta_score(y_true, y_pred, beta=2, pos_label=1)
+    confusion_matrix(y_true, y_pred)
+    precision_recall_curve(y_true, y_prob, pos_label=1)
+    average_precision_score(y_true, y_prob, pos_label=1)
+    fpr, tpr, _ = roc_curve(y_true, y_prob, pos_label=1)
+    auc(fpr, tpr)
+
+
+@click.command()
+@click.option('--n-rows', type=int, multiple=True, default=[1_000_000, 10_000_000], help="Number of test rows (repeatable)")
+def main(n_rows):
+    """Print the seconds taken by each way of computing the metrics."""
+    for n in n_rows:
+        rng = np.random.default_rng(123)
+        y_true = rng.integers(0, 2, size=n)
+        y_prob = 1 / (1 + np.exp(-(2 * y_true - 1 + rng.normal(size=n) * 2)))
+        for name, compute in [('sklearn', sklearn_metrics), ('binary_metrics', binary_metrics)]:
+            start = time.perf_counter()
+            compute(y_true, y_prob)
+            print(f"{n:>12,} rows  {name:<15} {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
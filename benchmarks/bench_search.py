@@ -0,0 +1,41 @@
+# bench_search.py
+#
+# Compares the hyperparameter search strategies of
+# scripts/preprocessing_model_fitting.py on synthetic diabetes data.
+#
+# Usage:
+# python benchmarks/bench_search.py --n-rows=500 --n-rows=100000 --search=random --search=halving
+
+import click
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from bench_validation import make_diabetes_data
+from scripts.preprocessing_model_fitting import SEARCH_STRATEGIES, fit_models
+
+
+@click.command()
+@click.option('--n-rows', type=int, multiple=True, default=[500, 100_000], help="Number of training rows (repeatable)")
+@click.option('--search', type=click.Choice(SEARCH_STRATEGIES), multiple=True, default=SEARCH_STRATEGIES, help="Search strategy to time (repeatable)")
+def main(n_rows, search):
+    """Time the dummy baseline and the search of `fit_models` for each strategy."""
+    for n in n_rows:
+        data = make_diabetes_data(n, invalid_fraction=0)
+        # an outcome that depends on the features, so the best C is not trivial
+        rng = np.random.default_rng(123)
+        logit = (data['Glucose'] - 120) / 30 + (data['BMI'] - 32) / 10 + rng.logistic(size=n)
+        data['Outcome'] = (logit > 0).astype(int)
+        X_train, y_train = data.drop(columns=['Outcome']), data['Outcome']
+        for strategy in search:
+            start = time.perf_counter()
+            _, _, random_fit = fit_models(X_train, y_train, strategy)
+            print(f"{n:>12,} rows  {strategy:<10} {time.perf_counter() - start:8.2f} s  "
+                  f"best C {random_fit.best_params_['logisticregression__C']:.4g}  "
+                  f"best score {random_fit.best_score_:.4f}")
+
+
+if __name__ == '__main__':
+    main()
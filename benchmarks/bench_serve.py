@@ -0,0 +1,105 @@
+# bench_serve.py
+#
+# Load generator for scripts/serve_model.py: starts the server, sends
+# single-patient requests over keep-alive connections from concurrent
+# clients, and reports the latency percentiles and throughput.
+#
+# Usage:
+# python benchmarks/bench_serve.py --concurrency=1 --concurrency=32 --max-batch=1 --max-batch=256
+#
+# Also times one in-process prediction of a single row with the fused model
+# and with the scikit-learn pipeline it was fused from.
+
+import asyncio
+import click
+import json
+import os
+import pickle
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+root_dir = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root_dir)
+from src.fused_linear_kernel import FusedLinearModel
+
+
+async def client(host, port, bodies, latencies):
+    """Send `bodies` one after another on one keep-alive connection, recording each latency."""
+    reader, writer = await asyncio.open_connection(host, port)
+    for body in bodies:
+        request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body
+        start = time.perf_counter()
+        writer.write(request)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        content_length = int(headers.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(content_length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def generate_load(host, port, bodies, concurrency):
+    """Split `bodies` over `concurrency` clients; returns the latencies and the elapsed time."""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, bodies[i::concurrency], latencies) for i in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def start_server(model_from, max_batch):
+    """Start serve_model.py on a free port; returns the process and the port."""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(root_dir, 'scripts', 'serve_model.py'), f'--model-from={model_from}',
+         '--port=0', f'--max-batch={max_batch}'],
+        stderr=subprocess.PIPE, text=True
+    )
+    line = server.stderr.readline()
+    if 'Serving predictions on' not in line:
+        server.kill()
+        raise RuntimeError(f"The server did not start: {line}")
+    return server, int(line.rsplit(':', 1)[1])
+
+
+@click.command()
+@click.option('--model-from', type=str, default=os.path.join(root_dir, 'results', 'models', 'best_model.npz'), help="Model served")
+@click.option('--pipeline-from', type=str, default=os.path.join(root_dir, 'results', 'models', 'random_fit.pkl'), help="Pickled search of the same model, for the in-process comparison")
+@click.option('--x-test-data', type=str, default=os.path.join(root_dir, 'data', 'processed', 'X_test.csv'), help="Patients sent in the requests")
+@click.option('--n-requests', type=int, default=20_000, help="Number of requests per run")
+@click.option('--concurrency', type=int, multiple=True, default=[1, 32], help="Number of concurrent clients (repeatable)")
+@click.option('--max-batch', type=int, multiple=True, default=[1, 256], help="--max-batch of the server (repeatable)")
+def main(model_from, pipeline_from, x_test_data, n_requests, concurrency, max_batch):
+    """Time single-row predictions in process, then the server under load."""
+    X_test = pd.read_csv(x_test_data)
+    with open(pipeline_from, 'rb') as f:
+        pipeline = pickle.load(f).best_estimator_
+    fused = FusedLinearModel.from_model(pipeline)
+    row, row_df = X_test.to_numpy()[0], X_test.iloc[:1]
+    for name, predict in [('fused', lambda: fused.predict_proba_1(row)),
+                          ('sklearn pipeline', lambda: pipeline.predict_proba(row_df))]:
+        n_calls = 2000
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            predict()
+        print(f"in process  {name:<17} {(time.perf_counter() - start) / n_calls * 1e6:9.1f} us per row")
+
+    rows = X_test.to_dict(orient='records')
+    bodies = [json.dumps(rows[i % len(rows)]).encode() for i in range(n_requests)]
+    for batch in max_batch:
+        server, port = start_server(model_from, batch)
+        try:
+            # warm up the connection handling before timing
+            asyncio.run(generate_load('127.0.0.1', port, bodies[:500], 1))
+            for n_clients in concurrency:
+                latencies, elapsed = asyncio.run(generate_load('127.0.0.1', port, bodies, n_clients))
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+                print(f"max-batch {batch:>4}  clients {n_clients:>4}  p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  "
+                      f"{n_requests / elapsed:9,.0f} requests/s")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
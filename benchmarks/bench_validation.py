@@ -0,0 +1,62 @@
+# bench_validation.py
+#
+# Compares the pandera validation path of data_validation_schema.py with the
+# vectorized rule checks (--engine=fast) on synthetic diabetes data.
+#
+# Usage:
+# python benchmarks/bench_validation.py --n-rows=1000000 --n-rows=10000000
+#
+# Add e.g. --workers=1 --workers=8 to time the sharded validation on a process pool.
+
+import click
+import logging
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from scripts.data_validation_schema import drop_invalid_rows
+
+
+def make_diabetes_data(n_rows, invalid_fraction, seed=123):
+    """Generate diabetes-like data where roughly `invalid_fraction` of the rows break a rule."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'Pregnancies': rng.integers(0, 16, size=n_rows),
+        'Glucose': rng.integers(50, 241, size=n_rows),
+        'BloodPressure': rng.integers(40, 181, size=n_rows),
+        'SkinThickness': rng.integers(0, 81, size=n_rows),
+        'Insulin': rng.integers(0, 801, size=n_rows),
+        'BMI': rng.uniform(0, 65, size=n_rows),
+        'DiabetesPedigreeFunction': rng.uniform(0, 2.5, size=n_rows),
+        'Age': rng.integers(18, 91, size=n_rows),
+        'Outcome': rng.integers(0, 2, size=n_rows),
+    })
+    invalid = rng.random(n_rows) < invalid_fraction
+    data.loc[invalid, 'Glucose'] = 0
+    return data
+
+
+@click.command()
+@click.option('--n-rows', type=int, multiple=True, default=[1_000_000, 10_000_000], help="Number of rows to validate (repeatable)")
+@click.option('--invalid-fraction', type=float, default=0.01, help="Fraction of rows that break a rule")
+@click.option('--engine', type=click.Choice(['pandera', 'fast']), multiple=True, default=['pandera', 'fast'], help="Engines to time (repeatable)")
+@click.option('--workers', type=click.IntRange(min=1), multiple=True, default=[1], help="Numbers of worker processes to time (repeatable)")
+def main(n_rows, invalid_fraction, engine, workers):
+    """Time drop_invalid_rows with each validation engine."""
+    # the pandera path logs every failure case; that is not what is being measured here
+    logging.disable(logging.CRITICAL)
+    for n in n_rows:
+        data = make_diabetes_data(n, invalid_fraction)
+        for name in engine:
+            for n_workers in workers:
+                start = time.perf_counter()
+                validated = drop_invalid_rows(data, name, n_workers)
+                elapsed = time.perf_counter() - start
+                print(f"{n:>12,} rows  {name:<8} {n_workers:>3} workers {elapsed:8.2f} s  {len(validated):>12,} valid rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,45 +6,153 @@
 # python scripts/data_validation_schema.py \
 #     --raw-data=data/raw/diabetes.csv \
 #     --data-to=data/processed
+#
+# Add --data-format=parquet (or feather) to write the validated data in a
+# binary format that keeps the column dtypes for the next stages.
+#
+# To validate a large extract without loading it into memory at once,
+# add e.g. --chunksize=1000000, and --engine=fast to check the rules in one
+# vectorized pass instead of through pandera.
+#
+# Add --quarantine-to=data/processed to write the rejected rows to
+# diabetes_rejected.<format>, each with a `failed_rules` bitmask, and log only
+# the number of failures per rule.
+#
+# Add --cache-file=data/processed/validation_cache.npz to keep the verdict of
+# every validated row between runs, so that only rows not seen before are
+# validated when the raw data is refreshed.
+#
+# Add --workers=8 to validate row shards of the data on 8 processes; duplicate
+# rows are then found with one hash pass over the whole data.
 
 import click
 import os
 import sys
+import numpy as np
 import pandas as pd
-import pandera as pa
 import json
 import logging
+import multiprocessing
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.validate_diabetes_data import validate_diabetes_data
-from src.read_csv_data import read_csv_data
-from src.save_csv_data import save_csv_data
+from src.check_diabetes_rules import flag_diabetes_rules, count_failed_rules, duplicated_rows, RULE_BITS, DUPLICATE_RULE
+from src.file_format import DATA_FORMATS
+from src.hash_split import row_hashes
+from src.read_csv_data import DIABETES_DTYPES
+from src.read_data import read_data
+from src.save_data import save_data, DataWriter
+from src.validation_cache import ValidationCache
 
-@click.command()
-@click.option('--raw-data', type=str, help="Path to raw data")
-@click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
-def main(raw_data, data_to):
-    '''This script runs through schema data validation checks, 
-    and then preprocesses the data to be used in exploratory data analysis.'''
+def log_violation_counts(violation_counts):
+    """Log the number of rows failing each rule, leaving out rules without failures."""
+    violation_counts = violation_counts[violation_counts > 0]
+    if not violation_counts.empty:
+        logging.error("\n" + json.dumps(violation_counts.astype(int).to_dict(), indent=2))
 
-    # load data
-    diabetes_original = read_csv_data(raw_data)
 
-    # validate data
-    # Configure logging
-    logging.basicConfig(
-        filename=os.path.join("reports", "validation_errors.log"),
-        filemode="w",
-        format="%(asctime)s - %(message)s",
-        level=logging.INFO,
-    )
+def flag_rule_violations(data):
+    """Return the `failed_rules` bitmask of the vectorized rule checks, without checking for duplicates."""
+    return flag_diabetes_rules(data, check_duplicates=False)[0]
+
+
+# data being validated by forked workers, see `flag_rows_sharded`
+_shard_data = None
+
+
+def _flag_shard_bounds(bounds, flag_shard):
+    """Validate the rows `bounds[0]:bounds[1]` of the data inherited from the parent process."""
+    start, stop = bounds
+    return flag_shard(_shard_data.iloc[start:stop])
+
+
+def flag_rows_sharded(data, engine='pandera', workers=1):
+    """Return the `failed_rules` bitmask of every row, without checking for duplicates.
+
+    With more than one worker, the rows are split into one contiguous shard
+    per worker and the shards are validated on a process pool."""
+    global _shard_data
+    if engine == 'fast':
+        flag_shard = flag_rule_violations
+    else:
+        # pandera is slow to import, so it is only imported when it is used
+        from src.validate_diabetes_data import flag_diabetes_data as flag_shard
+    if workers <= 1 or len(data) < 2 * workers:
+        return flag_shard(data)
+
+    bounds = np.linspace(0, len(data), workers + 1).astype(int)
+    bounds = list(zip(bounds[:-1], bounds[1:]))
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = (data.iloc[start:stop] for start, stop in bounds)
+            return np.concatenate(list(executor.map(flag_shard, shards)))
+
+    # forked workers inherit `data`, so only the shard bounds and the
+    # bitmasks are sent between processes instead of the rows themselves
+    _shard_data = data
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+            return np.concatenate(list(executor.map(partial(_flag_shard_bounds, flag_shard=flag_shard), bounds)))
+    finally:
+        _shard_data = None
+
+
+def flag_rows(data, engine='pandera', workers=1):
+    """Return the `failed_rules` bitmask of every row, including duplicates of an earlier row.
+
+    Duplicates are the only rule that spans shards, so they are found with
+    one hash pass over all of `data` after the shards are validated."""
+    failed_rules = flag_rows_sharded(data, engine, workers)
+    failed_rules[duplicated_rows(data)] |= np.uint16(RULE_BITS[DUPLICATE_RULE])
+    return failed_rules
+
+
+def quarantine_rows(data, workers=1):
+    """Split `data` into valid and rejected rows in a single pass of the vectorized rule checks.
+
+    The rejected rows keep their values and get a `failed_rules` column with
+    the bitmask of the rules they failed (see `src.check_diabetes_rules.RULE_BITS`)."""
+    failed_rules = flag_rows(data, 'fast', workers)
+    validated, rejected = split_failed_rows(data, failed_rules)
+    return validated, rejected, count_failed_rules(failed_rules)
+
+
+def split_failed_rows(data, failed_rules):
+    """Split `data` into the rows without failed rules and the rejected rows, with a `failed_rules` column."""
+    valid = failed_rules == 0
+    validated = data[valid].reset_index(drop=True)
+    rejected = data[~valid].assign(failed_rules=failed_rules[~valid])
+    return validated, rejected
+
+
+def flag_rows_cached(data, cache, engine='pandera', workers=1):
+    """Return the `failed_rules` bitmask of every row, validating with `engine` only the rows not in `cache`."""
+    flag_new_rows = partial(flag_rows_sharded, engine=engine, workers=workers)
+    failed_rules, n_validated = cache.flag_rows(data, flag_new_rows)
+    logging.info(f"Validated {n_validated} new rows, {len(data) - n_validated} rows were cached or duplicates.")
+    return failed_rules
+
+
+def drop_invalid_rows(data, engine='pandera', workers=1):
+    """Validate `data` and return it without the rows that failed validation.
+
+    With the fast engine or more than one worker, only the number of
+    failures per rule is logged instead of every pandera failure case."""
+    if engine == 'fast' or workers > 1:
+        failed_rules = flag_rows(data, engine, workers)
+        log_violation_counts(count_failed_rules(failed_rules))
+        return split_failed_rows(data, failed_rules)[0]
+
+    import pandera as pa
+    from src.validate_diabetes_data import validate_diabetes_data
 
     # Initialize error cases DataFrame
     error_cases = pd.DataFrame()
-    data = diabetes_original.copy()
 
    # Validate data and handle errors
     try:
-        validated_data = validate_diabetes_data(data)
+        validate_diabetes_data(data)
     except pa.errors.SchemaErrors as e:
         error_cases = e.failure_cases
 
@@ -55,17 +163,122 @@ def main(raw_data, data_to):
     # Filter out invalid rows based on the error cases
     if not error_cases.empty:
         invalid_indices = error_cases["index"].dropna().unique()
-        diabetes_validated = (
+        return (
             data.drop(index=invalid_indices)
             .reset_index(drop=True)
             .drop_duplicates()
             .dropna(how="all")
         )
-    else:
-        diabetes_validated = data
+    return data
+
+
+def validate_data(diabetes_original, engine='pandera', workers=1, cache_file=None, quarantine=False):
+    """Validate the raw diabetes data in memory and return `(validated, rejected)`.
+
+    `rejected` holds the rejected rows with their `failed_rules` bitmask when
+    `quarantine` is True or a cache is used, and is None otherwise."""
+    if cache_file:
+        cache = ValidationCache.load(cache_file)
+        failed_rules = flag_rows_cached(diabetes_original, cache, engine, workers)
+        cache.save(cache_file)
+        log_violation_counts(count_failed_rules(failed_rules))
+        return split_failed_rows(diabetes_original, failed_rules)
+    if quarantine:
+        diabetes_validated, diabetes_rejected, violation_counts = quarantine_rows(diabetes_original, workers)
+        log_violation_counts(violation_counts)
+        return diabetes_validated, diabetes_rejected
+    return drop_invalid_rows(diabetes_original.copy(), engine, workers), None
+
+
+def configure_logging(log_path=os.path.join("reports", "validation_errors.log")):
+    """Send the validation errors to `log_path`, overwriting the log of the last run."""
+    logging.basicConfig(
+        filename=log_path,
+        filemode="w",
+        format="%(asctime)s - %(message)s",
+        level=logging.INFO,
+    )
+
+
+def drop_invalid_rows_chunked(chunks, file_path, engine='pandera', quarantine_path=None):
+    """Validate an iterator of chunks and write the valid rows of each chunk to `file_path`.
+
+    Duplicates across chunks are found by hashing every kept row by its
+    values, whatever dtypes were inferred for its chunk, so memory use is bounded by the chunk size plus one hash per unique row.
+    With `quarantine_path`, rejected rows are written there instead of being
+    dropped, with their values as strings, and one summary of the rule
+    failures is logged at the end."""
+    seen_hashes = set()
+    total_counts = 0
+    with ExitStack() as stack:
+        writer = stack.enter_context(DataWriter(file_path))
+        # the rejected rows keep their raw values, e.g. text in a numeric
+        # column of a later chunk, so their columns are written as strings
+        quarantine_writer = stack.enter_context(DataWriter(quarantine_path, dtype=dict.fromkeys(DIABETES_DTYPES, 'string'))) \
+            if quarantine_path else None
+
+        for chunk in chunks:
+            if quarantine_writer is None:
+                chunk_validated = drop_invalid_rows(chunk, engine)
+            else:
+                chunk_validated, chunk_rejected, violation_counts = quarantine_rows(chunk)
+
+            # drop rows already written by an earlier chunk
+            hashes = row_hashes(chunk_validated)
+            is_new = np.fromiter((h not in seen_hashes for h in hashes), dtype=bool, count=len(hashes))
+            seen_hashes.update(hashes[is_new].tolist())
+
+            writer.write(chunk_validated[is_new])
+            if quarantine_writer is not None:
+                duplicates = chunk_validated[~is_new].assign(failed_rules=np.uint16(RULE_BITS[DUPLICATE_RULE]))
+                violation_counts[DUPLICATE_RULE] += len(duplicates)
+                quarantine_writer.write(pd.concat([chunk_rejected, duplicates]))
+                total_counts = total_counts + violation_counts
+
+    if quarantine_path:
+        log_violation_counts(total_counts)
+
+
+@click.command()
+@click.option('--raw-data', type=str, help="Path to raw data")
+@click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
+@click.option('--data-format', type=click.Choice(DATA_FORMATS), default='csv', help="File format of the validated data")
+@click.option('--engine', type=click.Choice(['pandera', 'fast']), default='pandera', help="Validate with the pandera schema, or with the vectorized rule checks")
+@click.option('--quarantine-to', type=str, default=None, help="Path to directory where rejected rows will be written to, with a bitmask of the rules they failed (uses the vectorized rule checks)")
+@click.option('--chunksize', type=int, default=None, help="Validate the raw data in chunks of this many rows instead of loading it all at once")
+@click.option('--cache-file', type=str, default=None, help="Path to an .npz file keeping the verdict of every validated row, so that later runs only validate new rows")
+@click.option('--workers', type=click.IntRange(min=1), default=1, help="Number of processes validating row shards in parallel")
+def main(raw_data, data_to, data_format, engine, quarantine_to, chunksize, cache_file, workers):
+    '''This script runs through schema data validation checks, 
+    and then preprocesses the data to be used in exploratory data analysis.'''
+
+    # validate data
+    # Configure logging
+    configure_logging()
+
+    validated_path = os.path.join(data_to, f"diabetes_validated.{data_format}")
+    rejected_path = os.path.join(quarantine_to, f"diabetes_rejected.{data_format}") if quarantine_to else None
+    if chunksize is not None and cache_file is not None:
+        raise click.UsageError("--cache-file cannot be combined with --chunksize.")
+    if chunksize is not None and workers > 1:
+        raise click.UsageError("--workers cannot be combined with --chunksize.")
+    if chunksize is not None and data_format == 'npy':
+        raise click.UsageError("--chunksize cannot write the npy format; use csv, parquet or feather.")
+    if chunksize is not None:
+        # stream the raw data; dtypes are still inferred here (per chunk) so that
+        # malformed values become validation failures instead of parser errors
+        drop_invalid_rows_chunked(read_data(raw_data, chunksize=chunksize), validated_path, engine, rejected_path)
+        return
+
+    # load data
+    diabetes_original = read_data(raw_data)
+    diabetes_validated, diabetes_rejected = validate_data(
+        diabetes_original, engine, workers, cache_file, quarantine=rejected_path is not None)
+    if rejected_path:
+        save_data(diabetes_rejected, rejected_path)
     
     # save processed 
-    save_csv_data(diabetes_validated, os.path.join(data_to, "diabetes_validated.csv"))
+    save_data(diabetes_validated, validated_path)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -14,16 +14,22 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.read_zip import read_zip
 
-@click.command()
-@click.option('--url', type=str, help="URL of dataset to be downloaded")
-@click.option('--write-to', type=str, help="Path to directory where raw data will be written to")
-def main(url, write_to):
-    """Downloads data zip data from the web to a local filepath and extracts it."""
+
+def download_data(url, write_to):
+    """Download the zip file at `url` and extract it into `write_to`, creating the directory if needed."""
     try:
         read_zip(url, write_to)
     except:
         os.makedirs(write_to)
         read_zip(url, write_to)
 
+
+@click.command()
+@click.option('--url', type=str, help="URL of dataset to be downloaded")
+@click.option('--write-to', type=str, help="Path to directory where raw data will be written to")
+def main(url, write_to):
+    """Downloads data zip data from the web to a local filepath and extracts it."""
+    download_data(url, write_to)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -4,20 +4,23 @@
 
 # Usage: 
 # python scripts/eda_deepchecks.py \
-#     --validated-data=data/processed/diabetes_validated.csv \
-#     --data-to=data/processed \
+#     --x-train-data=data/processed/X_train.csv \
+#     --y-train-data=data/processed/y_train.csv \
 #     --plot-to=results/figures
+#
+# The train set is written by scripts/split_dataset.py. Nothing downstream
+# depends on this script, so it can run while the model is being fitted.
+#
+# On large training sets, add e.g. --deepchecks-sample-size=10000 to run the
+# outlier and feature-label correlation checks on a stratified sample, and
+# --deepchecks-jobs=4 to run the checks concurrently. The cheap integrity
+# checks run without deepchecks unless --deepchecks-full-report is given.
 
 import click
 import os
 import sys
 import pandas as pd
 
-import altair as alt
-import altair_ally as aly
-
-from sklearn.model_selection import train_test_split
-
 import warnings
 for warning_type in [FutureWarning, DeprecationWarning]:
     warnings.filterwarnings("ignore", category=warning_type)
@@ -26,35 +29,16 @@ for warning_type in [FutureWarning, DeprecationWarning]:
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.data_deepchecks import data_deepchecks
-from src.read_csv_data import read_csv_data
-from src.save_csv_data import save_csv_data
+from src.read_data import read_data
+from src.stage_scheduler import run_concurrently
 
 
-@click.command()
-@click.option('--validated-data', type=str, help="Path to validated data")
-@click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
-@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
-def main(validated_data, data_to, plot_to):
-    '''This script splits the raw data into train and test sets,
-    Plots the densities of each feature, correlation heatmap between features, 
-    and pairwise scatterplot in the training data by outcome
-    and displays them as a grid of plots. Also saves the plots.'''
-
-    diabetes_validated = read_csv_data(validated_data)
+def explore_data(diabetes_train, plot_to=None, deepchecks_sample_size=None, deepchecks_jobs=1, deepchecks_full_report=False,
+                 plot_jobs=1):
+    """Run the deepchecks on the training data and, if `plot_to` is given, save the EDA plots there,
+    rendering up to `plot_jobs` plots at the same time.
 
-    # EDA
-    # print(diabetes.shape)
-    diabetes_validated.shape
-    diabetes_validated.info()
-
-    # Create the split
-    diabetes_train, diabetes_test = train_test_split(diabetes_validated,
-                                         train_size = 0.7, 
-                                         random_state = 123)
-    
-    save_csv_data(diabetes_train, os.path.join(data_to, "diabetes_train.csv"))
-    save_csv_data(diabetes_test, os.path.join(data_to, "diabetes_test.csv"))
-    
+    Returns the report of `src.data_deepchecks.data_deepchecks`."""
     # Explore training data
     census_summary = diabetes_train.describe()
     census_summary
@@ -64,37 +48,71 @@ def main(validated_data, data_to, plot_to):
     features
 
     # Conduct deepchecks
-    data_deepchecks(diabetes_train)
-    
+    deepchecks_report = data_deepchecks(diabetes_train, sample_size=deepchecks_sample_size, n_jobs=deepchecks_jobs,
+                                        full_report=deepchecks_full_report)
+    if plot_to is None:
+        return deepchecks_report
+
+    # imported here rather than at the top, so that --help does not wait for them
+    import altair as alt
+    import altair_ally as aly
+
     # Visualize feature distributions
-    feature_histograms = alt.Chart(diabetes_train).transform_calculate(
-    ).mark_bar(opacity=0.5).encode( 
-        x = alt.X(alt.repeat()).type('quantitative').bin(maxbins=30), 
-        y= alt.Y('count()').stack(False),
-        color = 'Outcome:N'
-    ).properties( 
-        height=250,
-        width=250
-    ).repeat(
-        features, 
-        columns=3
-    )
-    
-    feature_histograms.save(os.path.join(plot_to, 'feature_histograms.png'),
-                            scale_factor=2.0)
+    def save_feature_histograms():
+        feature_histograms = alt.Chart(diabetes_train).transform_calculate(
+        ).mark_bar(opacity=0.5).encode( 
+            x = alt.X(alt.repeat()).type('quantitative').bin(maxbins=30), 
+            y= alt.Y('count()').stack(False),
+            color = 'Outcome:N'
+        ).properties( 
+            height=250,
+            width=250
+        ).repeat(
+            features, 
+            columns=3
+        )
+
+        feature_histograms.save(os.path.join(plot_to, 'feature_histograms.png'),
+                                scale_factor=2.0)
 
     # Visualize correlations across features
-    corr_plot = aly.corr(diabetes_train)
+    def save_corr_plot():
+        corr_plot = aly.corr(diabetes_train)
 
-    corr_plot.save(os.path.join(plot_to, 'correlation_heatmap.png'),
-                   scale_factor=2.0)
+        corr_plot.save(os.path.join(plot_to, 'correlation_heatmap.png'),
+                       scale_factor=2.0)
 
-    
     # Visualize relationships
-    scatter_plot = aly.pair(diabetes_train[features].sample(300), color='Outcome:N')
+    def save_scatter_plot():
+        scatter_plot = aly.pair(diabetes_train[features].sample(300), color='Outcome:N')
+
+        scatter_plot.save(os.path.join(plot_to, 'pairwise_scatterplot.png'), 
+                          scale_factor=2.0)
+
+    # the plots are independent, so they are rendered concurrently
+    run_concurrently([save_feature_histograms, save_corr_plot, save_scatter_plot], max_workers=plot_jobs)
+    return deepchecks_report
+
+
+@click.command()
+@click.option('--x-train-data', type=str, help="Path to X_train data")
+@click.option('--y-train-data', type=str, help="Path to y_train data")
+@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--deepchecks-sample-size', type=click.IntRange(min=1), default=None, help="Number of rows the expensive deepchecks run on (all rows by default)")
+@click.option('--deepchecks-jobs', type=click.IntRange(min=1), default=1, help="Number of deepchecks run concurrently")
+@click.option('--deepchecks-full-report', is_flag=True, default=False, help="Run every data check with deepchecks, including the ones with a native implementation")
+@click.option('--plot-jobs', type=click.IntRange(min=1), default=1, help="Number of plots rendered at the same time")
+def main(x_train_data, y_train_data, plot_to, deepchecks_sample_size, deepchecks_jobs, deepchecks_full_report, plot_jobs):
+    '''This script runs the deepchecks on the training data,
+    Plots the densities of each feature, correlation heatmap between features, 
+    and pairwise scatterplot in the training data by outcome
+    and displays them as a grid of plots. Also saves the plots.'''
+    diabetes_train = pd.concat([read_data(x_train_data), read_data(y_train_data)], axis=1)
+
+    # EDA
+    diabetes_train.info()
 
-    scatter_plot.save(os.path.join(plot_to, 'pairwise_scatterplot.png'), 
-                      scale_factor=2.0)
+    explore_data(diabetes_train, plot_to, deepchecks_sample_size, deepchecks_jobs, deepchecks_full_report, plot_jobs)
  
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -5,60 +5,88 @@
 # Usage:
 # python scripts/evaluate_predictor.py \
 #     --x-train-data='./data/processed/X_train.csv' \
-#     --pipeline-from=results/models/random_fit.pkl \
+#     --pipeline-from=results/models/best_model.npz \
+#     --cv-results-from=results/models/cv_results.csv \
 #     --x-test-data='./data/processed/X_test.csv' \
 #     --y-test-data='./data/processed/y_test.csv' \
 #     --results-to='./results/tables' \
 #     --plot-to='./results/figures'
+#
+# --pipeline-from is either the best model saved as arrays (.npz), whose
+# cross-validation scores are read from --cv-results-from, or a pickled
+# search such as results/models/random_fit.pkl. It can also be a pipeline
+# trained with `preprocessing_model_fitting.py --online` (online_model.npz
+# or online_fit.pkl), which has no cross-validation scores, so
+# mean_scores.csv is not written.
+#
+# With --chunksize, the test set is streamed in chunks of that many rows, so
+# its size is limited by the disk rather than the memory: the predictions
+# are appended to pred_results_1_df.csv chunk by chunk, the confusion matrix
+# and test scores are accumulated exactly, and the precision-recall and ROC
+# curves are approximated from histograms of the probabilities in --n-bins
+# bins (src/binary_metrics.py). The prediction chart shows the first 5000
+# test rows. Only the column names of X_train are read.
 
 import click
 import os
-import altair as alt
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import pickle
 import sys
-from sklearn.metrics import (
-    fbeta_score, 
-    confusion_matrix,
-    ConfusionMatrixDisplay,
-    PrecisionRecallDisplay,
-    RocCurveDisplay
-)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.save_coeff_table import save_coefficients_table
-from src.read_csv_data import read_csv_data
+from src.read_data import read_data, zip_chunks
 from src.save_csv_data import save_csv_data
-
-@click.command()
-@click.option('--x-train-data', type=str, help="Path to X_train data")
-@click.option('--x-test-data', type=str, help="Path to X_train data")
-@click.option('--y-test-data', type=str, help="Path to X_train data")
-@click.option('--pipeline-from', type=str, help="Path to directory where the fit pipeline object lives")
-@click.option('--results-to', type=str, help="Path to directory where the table will be written to")
-@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
-def main(x_train_data, x_test_data, y_test_data, pipeline_from, results_to, plot_to):
-
-    
-    #read in csv files for training and testing model
-    X_train = read_csv_data(x_train_data)
-    X_test = read_csv_data(x_test_data)
-    y_test= read_csv_data(y_test_data)
-
-    # read in random_fit model (pipeline object)
-    with open(pipeline_from, 'rb') as f:
-        random_fit = pickle.load(f)
-
-    mean_scores = pd.DataFrame(random_fit.cv_results_).sort_values(
-        "rank_test_score").head(3)[["mean_test_score",
-                                "mean_train_score"]]
+from src.stage_scheduler import run_concurrently
+from src.linear_model_artifact import load_linear_model
+from src.binary_metrics import binary_metrics, BinaryMetricsHistogram
+from src.save_data import DataWriter
+
+# Rows of the prediction chart when the test set is streamed
+CHART_ROWS = 5000
+
+
+def predict_test_rows(best_model, X_test, y_test):
+    """Predict the test rows in one pass: the labels are the class whose probability is over 0.5, as predicted by
+    `predict`. Returns the true and predicted label, whether they are equal and the probability of the positive class
+    of each row, each column keeping its own dtype."""
+    y_test = np.asarray(y_test).ravel()
+    # as the outcome of interest is in the second column
+    y_pred_prob_1 = best_model.predict_proba(X_test)[:, 1]
+    y_pred = best_model.classes_[(y_pred_prob_1 > 0.5).astype(int)]
+    return pd.DataFrame({'y_test': y_test, 'y_pred': y_pred, 'pred_bool': y_test == y_pred,
+                         'y_pred_prob_1': y_pred_prob_1})
+
+
+def evaluate_model(random_fit, X_train, X_test, y_test, results_to, plot_to=None, plot_jobs=1, cv_results=None,
+                   n_bins=1000):
+    """Score the best model of the search (or a fitted pipeline) on the test set and save the result tables to
+    `results_to`, and the figures to `plot_to` if it is given, rendering up to `plot_jobs` figures at the same time.
+    `cv_results` are the search scores of a model given without its search, e.g. a loaded `.npz` model.
+    `X_test` and `y_test` are DataFrames, or iterators of their chunks (e.g. from `read_data` with a `chunksize`),
+    which are streamed: the curves are then approximated with `n_bins` probability bins."""
+    # imported here rather than at the top, so that --help does not wait for them
+    import altair as alt
+    from matplotlib.figure import Figure
+    from sklearn.metrics import (
+        ConfusionMatrixDisplay,
+        PrecisionRecallDisplay,
+        RocCurveDisplay
+    )
     
-    save_csv_data(mean_scores, os.path.join(results_to, "mean_scores.csv"))
+    if cv_results is None:
+        cv_results = getattr(random_fit, 'cv_results_', None)
+    # A pipeline trained online has no cross-validation scores
+    if cv_results is not None:
+        mean_scores = pd.DataFrame(cv_results).sort_values(
+            "rank_test_score").head(3)[["mean_test_score",
+                                    "mean_train_score"]]
+
+        save_csv_data(mean_scores, os.path.join(results_to, "mean_scores.csv"))
 
     # Best model from the search object
-    best_model = random_fit.best_estimator_
+    best_model = getattr(random_fit, 'best_estimator_', random_fit)
 
     coeff_df_sorted = save_coefficients_table(best_model, X_train, results_to)
     
@@ -70,67 +98,133 @@ def main(x_train_data, x_test_data, y_test_data, pipeline_from, results_to, plot
             )
     coeff_table.to_html(os.path.join(results_to, 'coeff_table.html'))
 
-    # Make predictions using the best model
-    y_pred = best_model.predict(X_test)
-    y_test = y_test.squeeze()
-    
-    y_pred_prob = best_model.predict_proba(X_test)
-    pred_bool = (y_test == y_pred)
-    pred_results_1 = np.vstack([y_test, y_pred, pred_bool, y_pred_prob[:, 1]])  # as the outcome of interest is in the second column
-    pred_results_1_df = pd.DataFrame(pred_results_1.T, 
-                                 columns = ['y_test', 'y_pred', 'pred_bool', 'y_pred_prob_1'])
-    pred_results_1_df['pred_bool'] = pred_results_1_df['pred_bool'] == 1
-    pred_results_1_df.head()
-
-    save_csv_data(pred_results_1_df, os.path.join(results_to, "pred_results_1_df.csv"))
+    if isinstance(X_test, pd.DataFrame):
+        pred_results_1_df = predict_test_rows(best_model, X_test, y_test)
+        save_csv_data(pred_results_1_df, os.path.join(results_to, "pred_results_1_df.csv"))
+
+        # Compute all the test metrics from one sort of the probabilities
+        metrics = binary_metrics(pred_results_1_df['y_test'], pred_results_1_df['y_pred_prob_1'],
+                                 pos_label = 1, beta = 2)
+    else:
+        # Stream the test set chunk by chunk: the predictions are appended to
+        # the file as they are made, and the metrics accumulated in histograms
+        # of the probabilities. The prediction chart only shows the first
+        # CHART_ROWS rows.
+        histogram = BinaryMetricsHistogram(n_bins = n_bins, pos_label = 1, beta = 2)
+        chart_rows = []
+        n_chart_rows = 0
+        with DataWriter(os.path.join(results_to, "pred_results_1_df.csv")) as writer:
+            for X_chunk, y_chunk in zip_chunks(X_test, y_test):
+                pred_chunk = predict_test_rows(best_model, X_chunk, y_chunk)
+                writer.write(pred_chunk)
+                histogram.update(pred_chunk['y_test'], pred_chunk['y_pred_prob_1'])
+                if n_chart_rows < CHART_ROWS:
+                    chart_rows.append(pred_chunk.head(CHART_ROWS - n_chart_rows))
+                    n_chart_rows += len(chart_rows[-1])
+        pred_results_1_df = pd.concat(chart_rows, ignore_index = True)
+        metrics = histogram.result()
 
     # Compute accuracy
-    accuracy = best_model.score(X_test, y_test)
+    accuracy = metrics.accuracy
 
     # Compute F2 score (beta = 2)
     # Theoretically, this metric should be used to best evaluate the question
     # However, due to restriction to use 571 materials only, score is calculated but not used in report
-    f2_score = fbeta_score(y_test, y_pred, beta = 2, pos_label = 1)
+    f2_score = metrics.fbeta
 
     test_scores_df = pd.DataFrame({'accuracy': [accuracy], 'F2 score (beta = 2)': [f2_score]})
     save_csv_data(test_scores_df, os.path.join(results_to, "test_scores_df.csv"))
 
     # Confusion matrix result 
-    confusion_matrix_df = pd.DataFrame(confusion_matrix(y_test, y_pred))
+    confusion_matrix_df = pd.DataFrame(metrics.confusion_matrix)
     save_csv_data(confusion_matrix_df, os.path.join(results_to, "confusion_matrix_df.csv"), index=True)
 
-    # Confusion matrix display
-    confusion_matrix_plot = ConfusionMatrixDisplay.from_predictions(y_test, y_pred)
-    plt.savefig(os.path.join(plot_to, 'confusion_matrix_plot.png'))
-    plt.close()
-
-    # Predict probability on test set positive class (diabetic) 
-    precision_recall_plot = PrecisionRecallDisplay.from_predictions(y_test, y_pred_prob[:, 1], pos_label = 1)
-    plt.savefig(os.path.join(plot_to, 'precision_recall_plot.png'))
-    plt.close()
-
-    roc_curve = RocCurveDisplay.from_predictions(y_test, y_pred_prob[:, 1], pos_label = 1)
-    plt.savefig(os.path.join(plot_to, 'roc_curve.png'))
-    plt.close()
-
     # Calculate the number of correct predictions and misclassifications
     # Created for reference (before confusion matrix can be used)
     # No longer used in the final report
-    value_counts = pred_results_1_df['pred_bool'].value_counts()
+    n_correct = np.trace(metrics.confusion_matrix)
 
     value_counts_df = pd.DataFrame({
-        'correct predictions': [value_counts.get(True, 0)], 
-        'misclassifications': [value_counts.get(False, 0)]
+        'correct predictions': [n_correct], 
+        'misclassifications': [metrics.confusion_matrix.sum() - n_correct]
         })
     save_csv_data(value_counts_df, os.path.join(results_to, "value_counts_df.csv"))
 
-    predict_chart = alt.Chart(pred_results_1_df, title = 'Test Set Prediction Accuracy').mark_tick().encode(
-        x = alt.X('y_pred_prob_1').title('Positive Class Prediction Prob'),
-        y = alt.Y('pred_bool').title('Pred. Accuracy'),
-        color = alt.Color('y_test:N').title('Outcome')
-        )
-    predict_chart.save(os.path.join(plot_to, 'predict_chart.png'),
-                            scale_factor=2.0)
+    if plot_to is None:
+        return
+
+    # The figures are independent, so they are rendered concurrently. Each
+    # matplotlib figure is a Figure object of its own rather than the pyplot
+    # current figure, which is shared by all threads. The displays are built
+    # from the computed metrics, as their `from_predictions` would compute
+    # them again.
+    def save_display(display, file_name, **kwargs):
+        figure = Figure()
+        display.plot(ax=figure.subplots(), **kwargs)
+        figure.savefig(os.path.join(plot_to, file_name))
+
+    def save_predict_chart():
+        predict_chart = alt.Chart(pred_results_1_df, title = 'Test Set Prediction Accuracy').mark_tick().encode(
+            x = alt.X('y_pred_prob_1').title('Positive Class Prediction Prob'),
+            y = alt.Y('pred_bool').title('Pred. Accuracy'),
+            color = alt.Color('y_test:N').title('Outcome')
+            )
+        predict_chart.save(os.path.join(plot_to, 'predict_chart.png'),
+                                scale_factor=2.0)
+
+    confusion_matrix_display = ConfusionMatrixDisplay(metrics.confusion_matrix,
+                                                      display_labels = best_model.classes_)
+    # Predict probability on test set positive class (diabetic)
+    precision_recall_display = PrecisionRecallDisplay(metrics.precision, metrics.recall,
+                                                      average_precision = metrics.average_precision,
+                                                      estimator_name = 'Classifier', pos_label = 1,
+                                                      prevalence_pos_label = metrics.prevalence)
+    roc_curve_display = RocCurveDisplay(fpr = metrics.fpr, tpr = metrics.tpr, roc_auc = metrics.roc_auc,
+                                        estimator_name = 'Classifier', pos_label = 1)
+
+    run_concurrently([
+        # Confusion matrix display
+        lambda: save_display(confusion_matrix_display, 'confusion_matrix_plot.png'),
+        lambda: save_display(precision_recall_display, 'precision_recall_plot.png', name = 'Classifier'),
+        lambda: save_display(roc_curve_display, 'roc_curve.png', name = 'Classifier'),
+        save_predict_chart,
+    ], max_workers=plot_jobs)
+
+
+@click.command()
+@click.option('--x-train-data', type=str, help="Path to X_train data")
+@click.option('--x-test-data', type=str, help="Path to X_train data")
+@click.option('--y-test-data', type=str, help="Path to X_train data")
+@click.option('--pipeline-from', type=str, help="Path to directory where the fit pipeline object lives")
+@click.option('--cv-results-from', type=str, default=None, help="Path to the cross-validation scores of an .npz model")
+@click.option('--results-to', type=str, help="Path to directory where the table will be written to")
+@click.option('--plot-to', type=str, help="Path to directory where the plot will be written to")
+@click.option('--plot-jobs', type=click.IntRange(min=1), default=1, help="Number of figures rendered at the same time")
+@click.option('--chunksize', type=click.IntRange(min=1), default=None, help="Stream the test set, reading this many rows at a time")
+@click.option('--n-bins', type=click.IntRange(min=1), default=1000, help="Number of probability bins of the curves when streaming")
+def main(x_train_data, x_test_data, y_test_data, pipeline_from, cv_results_from, results_to, plot_to, plot_jobs,
+         chunksize, n_bins):
+    #read in data files (csv, parquet, feather or memory-mapped npy) for training and testing model
+    if chunksize is None:
+        X_train = read_data(x_train_data, mmap_mode='r')
+        X_test = read_data(x_test_data, mmap_mode='r')
+        y_test= read_data(y_test_data, mmap_mode='r')
+    else:
+        # only the column names of X_train are used (for the coefficients
+        # table), so read its first row rather than the whole file
+        X_train = next(iter(read_data(x_train_data, chunksize=1))).iloc[:0]
+        X_test = read_data(x_test_data, chunksize=chunksize)
+        y_test = read_data(y_test_data, chunksize=chunksize)
+
+    # read in the best model as arrays, or the random_fit model (pipeline object)
+    if pipeline_from.endswith('.npz'):
+        random_fit = load_linear_model(pipeline_from)
+    else:
+        with open(pipeline_from, 'rb') as f:
+            random_fit = pickle.load(f)
+    cv_results = None if cv_results_from is None else read_data(cv_results_from)
+
+    evaluate_model(random_fit, X_train, X_test, y_test, results_to, plot_to, plot_jobs, cv_results, n_bins)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
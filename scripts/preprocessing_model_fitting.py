@@ -6,50 +6,100 @@
 # python scripts/preprocessing_model_fitting.py \
 #     --processed-dir ./data/processed \
 #     --results-dir ./results
+#
+# Add --data-format=parquet (or feather) to read binary X_train/y_train files.
+# With --data-format=npy the arrays are memory-mapped, so the search workers
+# share one copy of the training data instead of each receiving their own.
+#
+# Add --search=warm-start to fit the C candidates of each fold along a
+# warm-started regularization path instead of independently; the scores and
+# the best C are the same as with the default randomized search.
+# On large training sets, add --search=halving to evaluate the candidates on
+# growing subsamples of the rows, dropping the worst two thirds at each step.
+#
+# For training sets larger than memory, or to update a model with new data,
+# add --online: the scaler and an SGD logistic regression are updated chunk by
+# chunk (--chunksize rows at a time) with partial_fit, and the model is saved
+# to models/online_fit.pkl. With --update, the saved online model continues
+# learning from the files in --processed-dir instead of starting over, e.g.
+# from each day's new data without refitting on all of history.
+#
+# Besides the pickled search (models/random_fit.pkl), the best pipeline is
+# saved as NumPy arrays to models/best_model.npz (models/online_model.npz
+# with --online) and the cross-validation scores to models/cv_results.csv.
+# Loading them needs neither pickle nor scikit-learn, see
+# src/linear_model_artifact.py.
+#
+# The 5 folds are split once and shared by the dummy baseline and the search.
+# The warm-start search also standardizes them once for all its candidates;
+# add --fold-cache-dir=DIR to keep its standardized folds in memory-mapped
+# files in DIR instead of in memory.
 
 import os
+import pickle
+import numpy as np
 import pandas as pd
-from sklearn.dummy import DummyClassifier
-from sklearn.model_selection import cross_val_score, RandomizedSearchCV
-from sklearn.pipeline import make_pipeline
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from scipy.stats import loguniform
 import click
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_csv_data import read_csv_data
+from src.file_format import DATA_FORMATS
+from src.read_csv_data import DIABETES_DTYPES
+from src.read_data import read_data, zip_chunks
 from src.save_csv_data import save_csv_data
 from src.save_model import save_model
+from src.linear_model_artifact import save_linear_model, save_search_results
 
+# Strategies of the hyperparameter search of `fit_models`
+SEARCH_STRATEGIES = ['random', 'warm-start', 'halving']
 
-@click.command()
-@click.option('--processed-dir', type=str, help="Path to the directory containing processed data")
-@click.option('--results-dir', type=str, help="Path to the directory where results will be saved")
-def main(processed_dir, results_dir):
+
+def fit_models(X_train, y_train, search='random', fold_cache_dir=None):
     """
-    Main function to load data, calculate dummy score, and optimize Logistic Regression.
+    Calculate the dummy baseline score and tune a Logistic Regression with a randomized search.
 
     Parameters:
-    ----------
-    processed_dir : str
-        Directory containing processed X_train, y_train CSV files.
-    results_dir : str
-        Directory to save the models and results.
+    -----------
+    X_train, y_train : pandas.DataFrame, pandas.Series
+        The training features and target.
+    search : str, optional, default 'random'
+        'random' for scikit-learn's RandomizedSearchCV, 'warm-start' for
+        `src.warm_start_search_cv.WarmStartSearchCV`, which evaluates the same
+        C candidates along a warm-started path in each fold, or 'halving' for
+        scikit-learn's HalvingRandomSearchCV, which evaluates the candidates
+        on growing subsamples of the rows and keeps the best third each time.
+    fold_cache_dir : str, optional
+        Existing directory where the standardized folds of the warm-start
+        search are memory-mapped from, see `src.fold_cache.FoldCache`. Kept in
+        memory when omitted.
+
+    Returns:
+    --------
+    mean_cv_score : float
+        Mean 5-fold cross-validation accuracy of the most-frequent Dummy Classifier.
+    log_pipe : sklearn.pipeline.Pipeline
+        The (unfitted) scaler and Logistic Regression pipeline that was tuned.
+    random_fit : sklearn.model_selection.RandomizedSearchCV, WarmStartSearchCV or HalvingRandomSearchCV
+        The fitted search, refit on all of the training data. The
+        `cv_results_` of HalvingRandomSearchCV have a row per candidate and
+        iteration, ranked by the scores of the last iteration first.
     """
-    # Load training data
-    X_train = read_csv_data(os.path.join(processed_dir, 'X_train.csv'))
-    y_train = read_csv_data(os.path.join(processed_dir, 'y_train.csv'))['Outcome']
+    if search not in SEARCH_STRATEGIES:
+        raise ValueError(f"`search` must be one of {SEARCH_STRATEGIES}.")
+    # imported here rather than at the top, so that --help does not wait for them
+    from sklearn.dummy import DummyClassifier
+    from sklearn.model_selection import RandomizedSearchCV, check_cv, cross_val_score
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import LogisticRegression
+    from scipy.stats import loguniform
+    # The 5 stratified folds of the baseline and the search
+    folds = check_cv(5, y_train, classifier=True)
 
-    # Calculate Dummy Classifier's cross-validation score
+    # Calculate Dummy Classifier's cross-validation score. The most frequent
+    # class does not depend on the features, so they are not copied into the folds
     dummy_clf = DummyClassifier(strategy="most_frequent")
-    mean_cv_score = cross_val_score(dummy_clf, X_train, y_train, cv=5).mean()
-
-    # Save the Dummy Classifier's mean CV score
-    os.makedirs(os.path.join(results_dir, 'tables'), exist_ok=True)
-    dummy_score_path = os.path.join(results_dir, 'tables', 'mean_cv_score.csv')
-    save_csv_data(pd.DataFrame({'mean_cv_score': [mean_cv_score]}), dummy_score_path)
+    mean_cv_score = cross_val_score(dummy_clf, np.zeros((len(y_train), 0)), y_train, cv=folds).mean()
 
     # Optimize Logistic Regression
     log_pipe = make_pipeline(
@@ -58,19 +108,163 @@ def main(processed_dir, results_dir):
     )
 
     param_dist = {"logisticregression__C": loguniform(1e-5, 1e+5)}
-    random_search = RandomizedSearchCV(
-        log_pipe, param_dist, n_iter=20, n_jobs=-1, cv=5, return_train_score=True, random_state=123
-    )
-    random_fit = random_search.fit(X_train, y_train)
+    # The searches split the rows with the same splitter rather than a
+    # FoldCache, so the pickled search does not carry the cache. Only the
+    # warm-start search reuses standardized folds: it fits every candidate of
+    # a fold on the same rows, while the pipeline of each candidate of the
+    # other searches standardizes its rows itself.
+    fit_params = {}
+    if search == 'warm-start':
+        from src.fold_cache import FoldCache
+        from src.warm_start_search_cv import WarmStartSearchCV
+
+        random_search = WarmStartSearchCV(
+            log_pipe, param_dist, n_iter=20, n_jobs=-1, cv=folds, return_train_score=True, random_state=123
+        )
+        fit_params['fold_cache'] = FoldCache(X_train, y_train, cv=folds, preprocessing=StandardScaler(),
+                                             memmap_dir=fold_cache_dir)
+    elif search == 'halving':
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingRandomSearchCV
+
+        random_search = HalvingRandomSearchCV(
+            log_pipe, param_dist, n_candidates=20, factor=3, min_resources='exhaust', n_jobs=-1, cv=folds,
+            return_train_score=True, random_state=123
+        )
+    else:
+        random_search = RandomizedSearchCV(
+            log_pipe, param_dist, n_iter=20, n_jobs=-1, cv=folds, return_train_score=True, random_state=123
+        )
+    random_fit = random_search.fit(X_train, y_train, **fit_params)
+    return mean_cv_score, log_pipe, random_fit
+
+
+def fit_online(chunks, online_pipe=None):
+    """
+    Train a scaler and logistic regression pipeline incrementally, one chunk at a time.
+
+    Each chunk first updates the running mean and variance of the
+    StandardScaler, and is then standardized with them and used for one
+    `partial_fit` pass of an SGDClassifier with the logistic loss. Only one
+    chunk is in memory at a time, whatever the size of the training set.
+
+    Parameters:
+    -----------
+    chunks : iterable of (pandas.DataFrame, pandas.Series)
+        The training features and target, chunk by chunk.
+    online_pipe : sklearn.pipeline.Pipeline, optional
+        A pipeline returned by `fit_online` before, which continues learning
+        from `chunks`. A new pipeline is trained when omitted.
+
+    Returns:
+    --------
+    online_pipe : sklearn.pipeline.Pipeline
+        The fitted scaler and logistic regression pipeline. The SGDClassifier
+        step is named 'logisticregression', like the step of the batch
+        pipeline of `fit_models`, so it is evaluated the same way.
+    """
+    # imported here rather than at the top, so that --help does not wait for them
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import SGDClassifier
+
+    if online_pipe is None:
+        online_pipe = Pipeline([
+            ('standardscaler', StandardScaler()),
+            ('logisticregression', SGDClassifier(loss='log_loss', average=True, random_state=123))
+        ])
+    scaler = online_pipe.named_steps['standardscaler']
+    sgd = online_pipe.named_steps['logisticregression']
+    for X_chunk, y_chunk in chunks:
+        scaler.partial_fit(X_chunk)
+        sgd.partial_fit(scaler.transform(X_chunk), y_chunk, classes=[0, 1])
+    return online_pipe
+
+
+def read_training_chunks(processed_dir, data_format, chunksize):
+    """Iterate over the X_train and y_train files of `processed_dir` together, `chunksize` rows at a time.
+    Raises a ValueError if the files do not have the same number of rows."""
+    X_chunks = read_data(os.path.join(processed_dir, f'X_train.{data_format}'), dtype=DIABETES_DTYPES,
+                         chunksize=chunksize)
+    y_chunks = read_data(os.path.join(processed_dir, f'y_train.{data_format}'), dtype=DIABETES_DTYPES,
+                         chunksize=chunksize)
+    for X_chunk, y_chunk in zip_chunks(X_chunks, y_chunks):
+        yield X_chunk, y_chunk['Outcome']
+
+
+def save_fit_results(results_dir, mean_cv_score, log_pipe, random_fit):
+    """Save the dummy score and best parameters to `results_dir`/tables and the models to `results_dir`/models."""
+    # Save the Dummy Classifier's mean CV score
+    os.makedirs(os.path.join(results_dir, 'tables'), exist_ok=True)
+    dummy_score_path = os.path.join(results_dir, 'tables', 'mean_cv_score.csv')
+    save_csv_data(pd.DataFrame({'mean_cv_score': [mean_cv_score]}), dummy_score_path)
 
     # Save the pipeline and RandomizedSearchCV results using save_model
     os.makedirs(os.path.join(results_dir, 'models'), exist_ok=True)
     save_model(log_pipe, os.path.join(results_dir, 'models', 'log_pipe.pkl'))
     save_model(random_fit, os.path.join(results_dir, 'models', 'random_fit.pkl'))
 
+    # Save the best model as plain arrays, and the search scores separately,
+    # so that they can be loaded for scoring without unpickling the search
+    save_linear_model(random_fit.best_estimator_, os.path.join(results_dir, 'models', 'best_model.npz'))
+    save_search_results(random_fit, os.path.join(results_dir, 'models', 'cv_results.csv'))
+
     # Save best parameters
     best_params_path = os.path.join(results_dir, 'tables', 'best_params.csv')
-    save_csv_data(pd.DataFrame([random_search.best_params_]), best_params_path)
+    save_csv_data(pd.DataFrame([random_fit.best_params_]), best_params_path)
+
+
+@click.command()
+@click.option('--processed-dir', type=str, help="Path to the directory containing processed data")
+@click.option('--results-dir', type=str, help="Path to the directory where results will be saved")
+@click.option('--data-format', type=click.Choice(DATA_FORMATS), default='csv', help="File format of the processed data")
+@click.option('--search', type=click.Choice(SEARCH_STRATEGIES), default='random', help="Strategy of the hyperparameter search")
+@click.option('--fold-cache-dir', type=click.Path(exists=True, file_okay=False), default=None, help="Directory where the standardized folds of the warm-start search are memory-mapped from")
+@click.option('--online', is_flag=True, default=False, help="Train an SGD logistic regression incrementally on chunks of the training data instead of searching")
+@click.option('--chunksize', type=click.IntRange(min=1), default=100_000, help="Number of rows per chunk with --online")
+@click.option('--update', is_flag=True, default=False, help="With --online, continue training the saved online model instead of starting over")
+def main(processed_dir, results_dir, data_format, search, fold_cache_dir, online, chunksize, update):
+    """
+    Main function to load data, calculate dummy score, and optimize Logistic Regression.
+
+    Parameters:
+    ----------
+    processed_dir : str
+        Directory containing processed X_train, y_train files.
+    results_dir : str
+        Directory to save the models and results.
+    data_format : str
+        File format of the processed data ('csv', 'parquet', 'feather' or 'npy').
+    search : str
+        Strategy of the hyperparameter search, see `fit_models`.
+    fold_cache_dir : str
+        Directory where the standardized folds are memory-mapped from, or None.
+    online : bool
+        Whether to train incrementally with `fit_online` instead.
+    chunksize : int
+        Number of rows read at a time with `online`.
+    update : bool
+        Whether `online` training continues from the saved online model.
+    """
+    if update and not online:
+        raise click.UsageError("--update requires --online.")
+    if online:
+        online_fit_path = os.path.join(results_dir, 'models', 'online_fit.pkl')
+        online_pipe = None
+        if update:
+            with open(online_fit_path, 'rb') as f:
+                online_pipe = pickle.load(f)
+        online_pipe = fit_online(read_training_chunks(processed_dir, data_format, chunksize), online_pipe)
+        save_model(online_pipe, online_fit_path)
+        save_linear_model(online_pipe, os.path.join(results_dir, 'models', 'online_model.npz'))
+        return
+
+    # Load training data
+    X_train = read_data(os.path.join(processed_dir, f'X_train.{data_format}'), mmap_mode='r')
+    y_train = read_data(os.path.join(processed_dir, f'y_train.{data_format}'), mmap_mode='r')['Outcome']
+
+    mean_cv_score, log_pipe, random_fit = fit_models(X_train, y_train, search, fold_cache_dir)
+    save_fit_results(results_dir, mean_cv_score, log_pipe, random_fit)
 
 
 if __name__ == '__main__':
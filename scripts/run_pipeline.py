@@ -0,0 +1,170 @@
+# run_pipeline.py
+
+# Usage:
+# python scripts/run_pipeline.py \
+#     --raw-data=data/raw/diabetes.csv \
+#     --results-dir=results \
+#     --plot-to=results/figures
+#
+# Runs every stage of the analysis in one process: validation, EDA and
+# deepchecks, train/test split, model fitting and evaluation. DataFrames and
+# fitted models are passed from stage to stage in memory. Add
+# --data-to=data/processed to also write the intermediate data files that the
+# separate scripts exchange, and --url=... to download the raw data first.
+# With --cache-dir=.stage_cache, the result of each stage is cached under a
+# hash of its input data, its source code and its parameters, so a rerun only
+# recomputes the stages whose inputs or code changed. Add --jobs=4 to run
+# independent stages, like the EDA and the model fitting, at the same time.
+
+import click
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.file_format import DATA_FORMATS
+from src.read_data import read_data
+from src.save_data import save_data
+from src.stage_cache import StageCache
+from src.stage_scheduler import StageScheduler, Result
+from scripts.download_data import download_data
+from scripts.data_validation_schema import configure_logging, validate_data
+from scripts.eda_deepchecks import explore_data
+from scripts.split_dataset import split_train_test, split_features_target
+from scripts.preprocessing_model_fitting import SEARCH_STRATEGIES, fit_models, save_fit_results
+from scripts.evaluate_predictor import evaluate_model
+
+# Files written by the EDA and evaluation stages, restored on a cache hit
+EDA_FIGURES = ['feature_histograms.png', 'correlation_heatmap.png', 'pairwise_scatterplot.png']
+EVALUATION_TABLES = ['mean_scores.csv', 'coeff_table.csv', 'coeff_table.html', 'pred_results_1_df.csv',
+                     'test_scores_df.csv', 'confusion_matrix_df.csv', 'value_counts_df.csv']
+EVALUATION_FIGURES = ['confusion_matrix_plot.png', 'precision_recall_plot.png', 'roc_curve.png', 'predict_chart.png']
+
+
+def run_pipeline(raw_data, results_dir, plot_to=None, data_to=None, data_format='csv', engine='pandera', workers=1,
+                 cache=None, jobs=1, search='random'):
+    """
+    Run the analysis from the raw data to the evaluation of the tuned model in
+    one process, and return the seconds taken by each stage.
+
+    Parameters:
+    -----------
+    raw_data : str
+        Path to the raw diabetes data.
+    results_dir : str
+        Directory where the models (`models/`) and result tables (`tables/`) are saved.
+    plot_to : str, optional
+        Directory where the EDA and evaluation figures are saved. No figures
+        are rendered when omitted.
+    data_to : str, optional
+        Directory where the validated data and the X/y matrices of the
+        train/test split are saved in `data_format`. Nothing is saved when omitted.
+    data_format : str, optional, default 'csv'
+        File format of the files written to `data_to`.
+    engine : str, optional, default 'pandera'
+        Validation engine, 'pandera' or 'fast'.
+    workers : int, optional, default 1
+        Number of processes validating row shards in parallel.
+    cache : src.stage_cache.StageCache, optional
+        Cache of the stage results. Stages whose input data, code and
+        parameters are unchanged are restored from it instead of being run.
+    jobs : int, optional, default 1
+        Number of threads running independent stages, and rendering the
+        figures of a stage, at the same time.
+    search : str, optional, default 'random'
+        Strategy of the hyperparameter search, see
+        `scripts.preprocessing_model_fitting.fit_models`.
+
+    Returns:
+    --------
+    dict
+        Seconds taken by each stage, in the order they finished.
+    """
+    timings = {}
+
+    def timed(stage, function, *args, depends_on=(), output_files=(), cached=True, **kwargs):
+        start = time.perf_counter()
+        if cache is None or not cached:
+            result = function(*args, **kwargs)
+        else:
+            result = cache.run(function, *args, stage=stage, depends_on=depends_on, output_files=output_files,
+                               **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    def figures(names):
+        return [] if plot_to is None else [os.path.join(plot_to, name) for name in names]
+
+    def save(names, *data):
+        if data_to is not None:
+            for name, data_frame in zip(names, data):
+                save_data(data_frame, os.path.join(data_to, f"{name}.{data_format}"))
+
+    def features_target(diabetes_train, diabetes_test):
+        X_train, y_train = split_features_target(diabetes_train)
+        X_test, y_test = split_features_target(diabetes_test)
+        save(["X_train", "y_train", "X_test", "y_test"], X_train, y_train, X_test, y_test)
+        return X_train, y_train['Outcome'], X_test, y_test
+
+    # Stages that do not depend on each other, e.g. the EDA and the model
+    # fitting, run at the same time when jobs > 1
+    scheduler = StageScheduler(max_workers=jobs)
+    # the raw data is always read, as the later stages are keyed by its content
+    scheduler.add('read', timed, 'read', read_data, raw_data, cached=False)
+    scheduler.add('validate', timed, 'validate', validate_data, Result('read'), engine, workers,
+                  depends_on=['scripts.data_validation_schema', 'src.check_diabetes_rules',
+                              'src.validate_diabetes_data', 'src.validation_cache'])
+    scheduler.add('save_validated', save, ["diabetes_validated"], Result('validate', 0))
+
+    scheduler.add('split', timed, 'split', split_train_test, Result('validate', 0))
+    scheduler.add('eda', timed, 'eda', explore_data, Result('split', 0), plot_to, plot_jobs=jobs,
+                  depends_on=['scripts.eda_deepchecks', 'src.data_deepchecks', 'src.integrity_checks',
+                              'src.stage_scheduler'],
+                  output_files=figures(EDA_FIGURES))
+
+    scheduler.add('features', features_target, Result('split', 0), Result('split', 1))
+    scheduler.add('fit', timed, 'fit', fit_models, Result('features', 0), Result('features', 1), search,
+                  depends_on=['src.fold_cache', 'src.warm_start_search_cv'])
+    scheduler.add('save_fit', save_fit_results, results_dir, Result('fit', 0), Result('fit', 1), Result('fit', 2))
+
+    tables_dir = os.path.join(results_dir, 'tables')
+    scheduler.add('evaluate', timed, 'evaluate', evaluate_model, Result('fit', 2), Result('features', 0),
+                  Result('features', 2), Result('features', 3), tables_dir, plot_to, plot_jobs=jobs,
+                  depends_on=['scripts.evaluate_predictor', 'src.binary_metrics', 'src.save_coeff_table',
+                              'src.stage_scheduler'],
+                  output_files=[os.path.join(tables_dir, name) for name in EVALUATION_TABLES] + figures(EVALUATION_FIGURES))
+    scheduler.run()
+    return timings
+
+
+@click.command()
+@click.option('--raw-data', type=str, default=os.path.join('data', 'raw', 'diabetes.csv'), help="Path to raw data")
+@click.option('--url', type=str, default=None, help="URL of the zipped dataset to download into the directory of --raw-data first")
+@click.option('--results-dir', type=str, default='results', help="Path to the directory where models and tables will be saved")
+@click.option('--plot-to', type=str, default=None, help="Path to the directory where figures will be saved (no figures when omitted)")
+@click.option('--data-to', type=str, default=None, help="Path to the directory where intermediate data will be saved (none when omitted)")
+@click.option('--data-format', type=click.Choice(DATA_FORMATS), default='csv', help="File format of the intermediate data")
+@click.option('--engine', type=click.Choice(['pandera', 'fast']), default='pandera', help="Validate with the pandera schema, or with the vectorized rule checks")
+@click.option('--workers', type=click.IntRange(min=1), default=1, help="Number of processes validating row shards in parallel")
+@click.option('--cache-dir', type=str, default=None, help="Path to the directory caching the stage results (no caching when omitted)")
+@click.option('--cache-max-bytes', type=click.IntRange(min=0), default=None, help="Size cap of the stage cache; least recently used results are evicted beyond it")
+@click.option('--jobs', type=click.IntRange(min=1), default=1, help="Number of independent stages and figures run at the same time")
+@click.option('--search', type=click.Choice(SEARCH_STRATEGIES), default='random', help="Strategy of the hyperparameter search")
+def main(raw_data, url, results_dir, plot_to, data_to, data_format, engine, workers, cache_dir, cache_max_bytes, jobs,
+         search):
+    """Runs the whole diabetes analysis in one process."""
+    configure_logging()
+    if url is not None:
+        download_data(url, os.path.dirname(raw_data))
+
+    cache = None if cache_dir is None else StageCache(cache_dir, cache_max_bytes)
+    start = time.perf_counter()
+    timings = run_pipeline(raw_data, results_dir, plot_to, data_to, data_format, engine, workers, cache, jobs, search)
+    for stage, seconds in timings.items():
+        cached = " (cached)" if cache is not None and stage in cache.hits else ""
+        print(f"{stage:<10} {seconds:8.2f} s{cached}")
+    print(f"{'total':<10} {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# score.py
+#
+# Scores new patients with the saved best model, streaming the input file in
+# fixed-size batches, so files of any size are scored in constant memory.
+#
+# Usage:
+# python scripts/score.py \
+#     --model-from=results/models/best_model.npz \
+#     --input-data=data/new_patients.csv \
+#     --predictions-to=results/predictions.csv
+#
+# The model is loaded once: either the arrays saved by
+# preprocessing_model_fitting.py (best_model.npz or online_model.npz) or a
+# pickled search or pipeline (e.g. random_fit.pkl). The input can be a CSV,
+# Parquet, Feather or .npy file with the feature columns; other columns
+# (e.g. Outcome) are ignored. The predictions file (CSV, Parquet or Feather,
+# by its extension) has the predicted label and positive-class probability
+# of each input row, in the same order. Rows with a missing or non-finite
+# feature value are not scored: their 'valid' column is False and their
+# prediction is empty (src/score_batch.py). The scaler and logistic regression
+# of the model are folded into one weight vector and bias
+# (src/fused_linear_kernel.py), so each batch is one matrix product.
+
+import click
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.file_format import infer_file_format
+from src.fused_linear_kernel import FusedLinearModel
+from src.load_best_model import load_best_model
+from src.read_csv_data import DIABETES_DTYPES
+from src.read_data import read_data
+from src.save_data import DataWriter
+from src.score_batch import score_batch
+
+# The diabetes columns are read as float64, like the models were fitted on
+# them; narrower dtypes (e.g. the Float32 BMI of DIABETES_DTYPES) would
+# change the probabilities slightly.
+SCORING_DTYPES = dict.fromkeys(DIABETES_DTYPES, 'float64')
+
+
+@click.command()
+@click.option('--model-from', type=str, help="Path to the saved model (.npz arrays, or a pickled search or pipeline)")
+@click.option('--input-data', type=str, help="Path to the features of the patients to score")
+@click.option('--predictions-to', type=str, help="Path of the predictions file (.csv, .parquet or .feather)")
+@click.option('--batch-size', type=click.IntRange(min=1), default=100_000, help="Number of rows read and scored at a time")
+def main(model_from, input_data, predictions_to, batch_size):
+    """Score the rows of the input file batch by batch and write the predictions incrementally."""
+    if infer_file_format(predictions_to) == 'npy':
+        raise click.UsageError("--predictions-to cannot be an npy file; use csv, parquet or feather.")
+    model = FusedLinearModel.from_model(load_best_model(model_from))
+    batches = read_data(input_data, dtype=SCORING_DTYPES, chunksize=batch_size)
+    with DataWriter(predictions_to) as writer:
+        for batch in batches:
+            writer.write(score_batch(model, batch))
+
+
+if __name__ == '__main__':
+    main()
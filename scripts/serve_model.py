@@ -0,0 +1,109 @@
+# serve_model.py
+#
+# Serves predictions of the saved best model over HTTP, one patient per
+# request, from a single asyncio process.
+#
+# Usage:
+# python scripts/serve_model.py \
+#     --model-from=results/models/best_model.npz \
+#     --port=8000
+#
+# curl -s localhost:8000/predict -d '{"Pregnancies": 2, "Glucose": 138,
+#     "BloodPressure": 62, "SkinThickness": 35, "Insulin": 0, "BMI": 33.6,
+#     "DiabetesPedigreeFunction": 0.127, "Age": 47}'
+# {"y_pred": 0, "y_pred_prob_1": 0.379122971634426}
+#
+# The body can also be a JSON list of the feature values in the training
+# column order. GET /health answers {"status": "ok"}. Add
+# --unix-socket=PATH to serve on a Unix socket instead of TCP.
+#
+# The model is loaded once at startup (best_model.npz, or a pickled search or
+# pipeline such as random_fit.pkl) and its scaler and logistic regression are
+# folded into one weight vector and bias (src/fused_linear_kernel.py).
+# Requests that arrive together are scored together in one matrix product,
+# up to --max-batch rows at a time; --max-batch=1 scores them one by one.
+# The request handling is in src/prediction_service.py. Feature values that
+# are not finite numbers (e.g. NaN) are answered with 400 Bad Request.
+
+import asyncio
+import click
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fused_linear_kernel import FusedLinearModel
+from src.load_best_model import load_best_model
+from src.prediction_service import MicroBatcher, respond
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found'}
+
+
+async def handle_connection(reader, writer, batcher):
+    """Answer the HTTP/1.1 requests of one connection, kept alive until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            status, response = await respond(method, path, body, batcher)
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            content = json.dumps(response).encode()
+            writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(content)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(model, host='127.0.0.1', port=8000, unix_socket=None, max_batch=256):
+    """Serve `model` until the process is stopped."""
+    batcher = MicroBatcher(model, max_batch)
+
+    async def handler(reader, writer):
+        await handle_connection(reader, writer, batcher)
+
+    if unix_socket is not None:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+        address = unix_socket
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        address = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    click.echo(f"Serving predictions on {address}", err=True)
+    async with server:
+        await server.serve_forever()
+
+
+@click.command()
+@click.option('--model-from', type=str, help="Path to the saved model (.npz arrays, or a pickled search or pipeline)")
+@click.option('--host', type=str, default='127.0.0.1', help="Address to listen on")
+@click.option('--port', type=click.IntRange(min=0), default=8000, help="TCP port to listen on (0 for any free port)")
+@click.option('--unix-socket', type=str, default=None, help="Path of a Unix socket to listen on instead of TCP")
+@click.option('--max-batch', type=click.IntRange(min=1), default=256, help="Maximum number of concurrent requests scored together")
+def main(model_from, host, port, unix_socket, max_batch):
+    """Load the model once, fuse it, and serve predictions until interrupted."""
+    model = FusedLinearModel.from_model(load_best_model(model_from))
+    try:
+        asyncio.run(serve(model, host, port, unix_socket, max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
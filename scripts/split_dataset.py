@@ -4,54 +4,161 @@
 
 # Usage: 
 # python scripts/split_dataset.py \
-#     --train-file ./data/processed/diabetes_train.csv \
-#     --test-file ./data/processed/diabetes_test.csv \
+#     --validated-data ./data/processed/diabetes_validated.csv \
 #     --output-dir ./data/processed
+#
+# Splits the validated data into train (70%) and test sets and writes the
+# X_train, y_train, X_test and y_test files in one pass. Use --train-size,
+# --random-state and --stratify to change the split.
+#
+# For validated data larger than memory, add --hash-split and e.g.
+# --chunksize=1000000: rows are streamed chunk by chunk and assigned to the
+# train or test set by a seeded hash, the same whatever the chunk size.
+#
+# Alternatively, separate features from target in an existing split with
+# --train-file ./data/processed/diabetes_train.csv \
+# --test-file ./data/processed/diabetes_test.csv, which can also be
+# streamed with --chunksize.
+#
+# Add --data-format=parquet (or feather) to write binary files.
 
 import os
 import pandas as pd
 import click
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_csv_data import read_csv_data
-from src.save_csv_data import save_csv_data
+from src.read_csv_data import DIABETES_DTYPES
+from src.file_format import DATA_FORMATS
+from src.read_data import read_data
+from src.save_data import save_data, DataWriter
+from src.hash_split import HashSplitter
+
+
+def split_train_test(diabetes_validated, train_size=0.7, random_state=123, stratify=False):
+    """Split the validated data into train and test sets, optionally with the same 'Outcome' ratio in both."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(diabetes_validated, train_size = train_size, random_state = random_state,
+                            stratify = diabetes_validated['Outcome'] if stratify else None)
+
+
+def split_features_target(data):
+    """Separate the features from the 'Outcome' target variable."""
+    return data.drop(columns=['Outcome']), data[['Outcome']]
+
+
+def hash_split_chunked(validated_data, output_dir, data_format='csv', chunksize=1_000_000, train_size=0.7,
+                       random_state=123, stratify=False):
+    """
+    Stream the validated data in chunks and write the features and target of
+    the rows that `src.hash_split.HashSplitter` assigns to the train and test
+    sets, chunk by chunk, so that the data never has to fit in memory.
+    """
+    splitter = HashSplitter(train_size, random_state, stratify)
+    chunks = read_data(validated_data, dtype=DIABETES_DTYPES, chunksize=chunksize)
+    writers = {name: DataWriter(os.path.join(output_dir, f'{name}.{data_format}'))
+               for name in ['X_train', 'y_train', 'X_test', 'y_test']}
+    try:
+        for chunk in chunks:
+            for data, split in zip(splitter.split(chunk), ['train', 'test']):
+                X, y = split_features_target(data)
+                writers[f'X_{split}'].write(X)
+                writers[f'y_{split}'].write(y)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def save_features_target(diabetes_train, diabetes_test, output_dir, data_format='csv'):
+    """Save the features and target of the train and test sets as X_train, y_train, X_test and y_test."""
+    for data, split in [(diabetes_train, 'train'), (diabetes_test, 'test')]:
+        X, y = split_features_target(data)
+        save_data(X, os.path.join(output_dir, f'X_{split}.{data_format}'))
+        save_data(y, os.path.join(output_dir, f'y_{split}.{data_format}'))
 
 
 @click.command()
-@click.option('--train-file', type=str, default="../data/processed/diabetes_train.csv", help="Path to the processed diabetes_train CSV file")
-@click.option('--test-file', type=str, default="../data/processed/diabetes_test.csv", help="Path to the processed diabetes_test CSV file")
+@click.option('--validated-data', type=str, default=None, help="Path to the validated data to split into train and test sets")
+@click.option('--train-size', type=click.FloatRange(min=0, max=1, min_open=True, max_open=True), default=0.7, help="Fraction of the validated data in the train set")
+@click.option('--random-state', type=int, default=123, help="Seed of the train/test split")
+@click.option('--stratify', is_flag=True, default=False, help="Keep the same Outcome ratio in the train and test sets")
+@click.option('--hash-split', is_flag=True, default=False, help="Assign each row to the train or test set by a seeded hash of its values, so the split can be streamed with --chunksize")
+@click.option('--train-file', type=str, default=None, help="Path to the processed diabetes_train CSV file, instead of --validated-data")
+@click.option('--test-file', type=str, default=None, help="Path to the processed diabetes_test CSV file, instead of --validated-data")
 @click.option('--output-dir', type=str, default="../data/processed/", help="Path to the directory where split data will be saved")
-def main(train_file, test_file, output_dir):
+@click.option('--data-format', type=click.Choice(DATA_FORMATS), default='csv', help="File format of the split data")
+@click.option('--chunksize', type=int, default=None, help="Process the datasets in chunks of this many rows instead of loading them all at once")
+def main(validated_data, train_size, random_state, stratify, hash_split, train_file, test_file, output_dir, data_format, chunksize):
     """
-    Processes separate train and test datasets, separates features and target variable, 
-    and saves them as separate CSV files.
+    Splits the validated data into train and test sets, or processes separate
+    train and test datasets, separates features and target variable,
+    and saves them as separate files.
 
     Parameters:
     -----------
-    train_file : str
-        Path to the input CSV file containing the processed training dataset.
-    test_file : str
-        Path to the input CSV file containing the processed testing dataset.
+    validated_data : str, optional
+        Path to the validated dataset to split.
+    train_size : float
+        Fraction of the validated dataset in the train set.
+    random_state : int
+        Seed of the train/test split.
+    stratify : bool
+        Whether to split with the same 'Outcome' ratio in the train and test sets.
+    hash_split : bool
+        Whether to split with `src.hash_split.HashSplitter` instead of
+        scikit-learn's `train_test_split`. Required to split the validated
+        dataset chunk by chunk.
+    train_file : str, optional
+        Path to the input file containing the processed training dataset.
+    test_file : str, optional
+        Path to the input file containing the processed testing dataset.
     output_dir : str
         Directory where the resulting split datasets (X_train, y_train, X_test, y_test) will be saved.
+    data_format : str
+        File format of the split datasets ('csv', 'parquet', 'feather' or 'npy').
+    chunksize : int, optional
+        If given, the datasets are read with the known diabetes dtypes in chunks
+        of this many rows and the outputs are written chunk by chunk.
     """
+    if chunksize is not None and data_format == 'npy':
+        raise click.UsageError("--chunksize cannot write the npy format; use csv, parquet or feather.")
+    if validated_data is not None:
+        if train_file is not None or test_file is not None:
+            raise click.UsageError("--validated-data cannot be combined with --train-file or --test-file.")
+        if chunksize is not None:
+            if not hash_split:
+                raise click.UsageError("--chunksize with --validated-data requires --hash-split.")
+            hash_split_chunked(validated_data, output_dir, data_format, chunksize, train_size, random_state, stratify)
+            return
+        diabetes_validated = read_data(validated_data)
+        if hash_split:
+            diabetes_train, diabetes_test = HashSplitter(train_size, random_state, stratify).split(diabetes_validated)
+        else:
+            diabetes_train, diabetes_test = split_train_test(diabetes_validated, train_size, random_state, stratify)
+        save_features_target(diabetes_train, diabetes_test, output_dir, data_format)
+        return
+    if train_file is None or test_file is None:
+        raise click.UsageError("Give --validated-data, or both --train-file and --test-file.")
+    if hash_split:
+        raise click.UsageError("--hash-split requires --validated-data.")
+
+    if chunksize is not None:
+        for input_file, split in [(train_file, 'train'), (test_file, 'test')]:
+            chunks = read_data(input_file, dtype=DIABETES_DTYPES, chunksize=chunksize)
+            with DataWriter(os.path.join(output_dir, f'X_{split}.{data_format}')) as X_writer, \
+                 DataWriter(os.path.join(output_dir, f'y_{split}.{data_format}')) as y_writer:
+                for chunk in chunks:
+                    X, y = split_features_target(chunk)
+                    X_writer.write(X)
+                    y_writer.write(y)
+        return
+
     # Load the processed datasets
-    diabetes_train = read_csv_data(train_file)
-    diabetes_test = read_csv_data(test_file)
-
-    # Separate features and target variable for train set
-    X_train = diabetes_train.drop(columns=['Outcome'])
-    y_train = diabetes_train[['Outcome']]
-
-    # Separate features and target variable for test set
-    X_test = diabetes_test.drop(columns=['Outcome'])
-    y_test = diabetes_test[['Outcome']]
-
-    # Save the split data as CSV files
-    save_csv_data(X_train, os.path.join(output_dir, 'X_train.csv'))
-    save_csv_data(y_train, os.path.join(output_dir, 'y_train.csv'))
-    save_csv_data(X_test, os.path.join(output_dir, 'X_test.csv'))
-    save_csv_data(y_test, os.path.join(output_dir, 'y_test.csv'))
+    diabetes_train = read_data(train_file)
+    diabetes_test = read_data(test_file)
+
+    # Separate features and target variable, and save the split data
+    save_features_target(diabetes_train, diabetes_test, output_dir, data_format)
 
 
 if __name__ == '__main__':
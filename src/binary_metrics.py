@@ -0,0 +1,294 @@
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class BinaryMetrics:
+    """
+    Test metrics of a binary classifier, computed by `binary_metrics`.
+
+    The curves are the arrays of scikit-learn's `precision_recall_curve`
+    and `roc_curve` (with its default `drop_intermediate=True`), so they can
+    be given to `PrecisionRecallDisplay` and `RocCurveDisplay`.
+    """
+    confusion_matrix: np.ndarray
+    accuracy: float
+    fbeta: float
+    precision: np.ndarray
+    recall: np.ndarray
+    pr_thresholds: np.ndarray
+    average_precision: float
+    fpr: np.ndarray
+    tpr: np.ndarray
+    roc_thresholds: np.ndarray
+    roc_auc: float
+    prevalence: float
+
+
+def binary_metrics(y_true, y_prob, pos_label=1, threshold=0.5, beta=2):
+    """
+    Compute the confusion matrix, accuracy, F-beta score, precision-recall
+    and ROC curves, average precision and ROC AUC from one sort of the
+    predicted probabilities.
+
+    The rows are sorted by decreasing probability once. The cumulative count
+    of positives along that order gives the true and false positives at every
+    threshold, from which the curves are read, and at `threshold`, from
+    which the confusion matrix and the scores are read. The values are the
+    same as scikit-learn's metrics of the labels predicted by
+    `y_prob > threshold`, which are the labels of `predict` for a logistic
+    regression at the default threshold of 0.5.
+
+    Parameters:
+    -----------
+    y_true : array-like
+        The true labels.
+    y_prob : array-like
+        The predicted probability of the positive class of each row.
+    pos_label : int or str, optional, default 1
+        The positive label; every other label is negative.
+    threshold : float, optional, default 0.5
+        Rows with a probability over `threshold` are predicted positive.
+    beta : float, optional, default 2
+        Weight of the recall in the F-beta score.
+
+    Returns:
+    --------
+    BinaryMetrics
+        The metrics. The confusion matrix has the negative class in its
+        first row and column, and the true labels in its rows.
+
+    Raises:
+    -------
+    ValueError
+        If `y_true` and `y_prob` differ in length, or `y_true` does not have
+        both positive and negative rows.
+    """
+    y_true = np.asarray(y_true).ravel()
+    y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+    if len(y_true) != len(y_prob):
+        raise ValueError("`y_true` and `y_prob` must have the same length.")
+
+    # The one sort, by decreasing probability. The arrays of one value per
+    # row are deleted as soon as they are used, to bound the memory on large
+    # test sets.
+    order = np.argsort(y_prob, kind="mergesort")[::-1]
+    y_score = y_prob[order]
+    cum_positives = np.cumsum(y_true[order] == pos_label, dtype=np.float64)
+    del order
+    n_rows = len(y_true)
+    n_positives = cum_positives[-1] if n_rows else 0.0
+    if n_positives == 0 or n_positives == n_rows:
+        raise ValueError("`y_true` must have both positive and negative rows.")
+
+    # Confusion matrix and scores at `threshold`
+    n_predicted = n_rows - int(np.searchsorted(y_score[::-1], threshold, side="right"))
+    tp = cum_positives[n_predicted - 1] if n_predicted else 0.0
+    fp, fn = n_predicted - tp, n_positives - tp
+    tn = n_rows - n_positives - fp
+    confusion_matrix = np.array([[tn, fp], [fn, tp]], dtype=np.int64)
+    accuracy = (tp + tn) / n_rows
+    fbeta = _fbeta(tp, n_predicted, n_positives, beta)
+
+    # Positives at each distinct probability, as in scikit-learn's `_binary_clf_curve`
+    threshold_idxs = np.r_[np.flatnonzero(y_score[1:] != y_score[:-1]), n_rows - 1]
+    tps = cum_positives[threshold_idxs]
+    del cum_positives
+    thresholds = y_score[threshold_idxs]
+    del y_score
+    # the rows predicted positive at each threshold, less the true positives
+    fps = threshold_idxs + 1.0
+    del threshold_idxs
+    fps -= tps
+
+    return BinaryMetrics(
+        confusion_matrix=confusion_matrix,
+        accuracy=float(accuracy),
+        fbeta=float(fbeta),
+        **_curves(tps, fps, thresholds, n_positives),
+        prevalence=float(n_positives / n_rows),
+    )
+
+
+class BinaryMetricsHistogram:
+    """
+    Test metrics of a binary classifier accumulated over chunks of the test
+    set, for test sets that do not fit in memory.
+
+    The confusion matrix, accuracy, F-beta score and prevalence are exact:
+    they only need the counts of each label predicted at `threshold`. The
+    curves are approximated from histograms of the predicted probabilities
+    of the positive and negative rows, in `n_bins` bins of equal width over
+    [0, 1]: the rows of a bin are treated as tied at its lower edge. The
+    histograms of chunks read one after another, or by different workers,
+    are added together by `merge`, so the memory used does not depend on the
+    number of rows.
+
+    Parameters:
+    -----------
+    n_bins : int, optional, default 1000
+        Number of probability bins of the curves.
+    pos_label : int or str, optional, default 1
+        The positive label; every other label is negative.
+    threshold : float, optional, default 0.5
+        Rows with a probability over `threshold` are predicted positive.
+    beta : float, optional, default 2
+        Weight of the recall in the F-beta score.
+
+    Raises:
+    -------
+    ValueError
+        If `n_bins` is not a positive integer.
+    """
+
+    def __init__(self, n_bins=1000, pos_label=1, threshold=0.5, beta=2):
+        if not isinstance(n_bins, (int, np.integer)) or n_bins < 1:
+            raise ValueError("The `n_bins` parameter must be a positive integer.")
+        self.n_bins = int(n_bins)
+        self.pos_label = pos_label
+        self.threshold = threshold
+        self.beta = beta
+        # rows of each bin, negative in the first column and positive in the second
+        self.counts = np.zeros((self.n_bins, 2), dtype=np.int64)
+        # rows predicted positive at `threshold`, negative then positive
+        self.predicted_positive = np.zeros(2, dtype=np.int64)
+
+    @property
+    def n_rows(self):
+        """Number of rows accumulated."""
+        return int(self.counts.sum())
+
+    def update(self, y_true, y_prob):
+        """
+        Add the rows of a chunk of the test set.
+
+        Parameters:
+        -----------
+        y_true : array-like
+            The true labels of the chunk.
+        y_prob : array-like
+            The predicted probability of the positive class of each row.
+
+        Returns:
+        --------
+        BinaryMetricsHistogram
+            This histogram.
+
+        Raises:
+        -------
+        ValueError
+            If `y_true` and `y_prob` differ in length.
+        """
+        y_true = np.asarray(y_true).ravel()
+        y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+        if len(y_true) != len(y_prob):
+            raise ValueError("`y_true` and `y_prob` must have the same length.")
+        positive = (y_true == self.pos_label).astype(np.int64)
+        bins = np.clip(np.floor(y_prob * self.n_bins), 0, self.n_bins - 1).astype(np.int64)
+        self.counts += np.bincount(2 * bins + positive, minlength=2 * self.n_bins).reshape(self.n_bins, 2)
+        self.predicted_positive += np.bincount(positive[y_prob > self.threshold], minlength=2)
+        return self
+
+    def merge(self, other):
+        """
+        Add the rows accumulated by another histogram, e.g. of another worker.
+
+        Returns:
+        --------
+        BinaryMetricsHistogram
+            This histogram.
+
+        Raises:
+        -------
+        ValueError
+            If `other` has other bins, positive label, threshold or beta.
+        """
+        if (other.n_bins, other.pos_label, other.threshold, other.beta) != \
+                (self.n_bins, self.pos_label, self.threshold, self.beta):
+            raise ValueError("Only histograms with the same bins, positive label, threshold and beta can be merged.")
+        self.counts += other.counts
+        self.predicted_positive += other.predicted_positive
+        return self
+
+    def result(self):
+        """
+        The metrics of the rows accumulated.
+
+        Returns:
+        --------
+        BinaryMetrics
+            The metrics, with the curves approximated by the bins: their
+            thresholds are the lower edges of the bins with rows.
+
+        Raises:
+        -------
+        ValueError
+            If the rows are not both positive and negative.
+        """
+        n_negatives, n_positives = self.counts.sum(axis=0)
+        n_rows = n_negatives + n_positives
+        if n_positives == 0 or n_negatives == 0:
+            raise ValueError("`y_true` must have both positive and negative rows.")
+
+        fp, tp = self.predicted_positive
+        fn, tn = n_positives - tp, n_negatives - fp
+        confusion_matrix = np.array([[tn, fp], [fn, tp]], dtype=np.int64)
+
+        # Cumulative counts by decreasing probability, at the bins with rows
+        counts = self.counts[::-1]
+        occupied = counts.sum(axis=1) > 0
+        cum_counts = np.cumsum(counts, axis=0, dtype=np.float64)[occupied]
+        thresholds = (np.arange(self.n_bins) / self.n_bins)[::-1][occupied]
+
+        return BinaryMetrics(
+            confusion_matrix=confusion_matrix,
+            accuracy=float((tp + tn) / n_rows),
+            fbeta=float(_fbeta(float(tp), fp + tp, float(n_positives), self.beta)),
+            **_curves(cum_counts[:, 1], cum_counts[:, 0], thresholds, float(n_positives)),
+            prevalence=float(n_positives / n_rows),
+        )
+
+
+def _fbeta(tp, n_predicted, n_positives, beta):
+    """F-beta score from the counts, in the order of operations of scikit-learn."""
+    beta2 = beta ** 2
+    precision = tp / n_predicted if n_predicted else 0.0
+    recall = tp / n_positives
+    denominator = beta2 * precision + recall
+    return 0.0 if np.isclose(denominator, 0) else (1 + beta2) * precision * recall / denominator
+
+
+def _curves(tps, fps, thresholds, n_positives):
+    """
+    Precision-recall and ROC curves, average precision and ROC AUC from the
+    true and false positives at each threshold, by decreasing threshold, as
+    computed by scikit-learn's `precision_recall_curve` and `roc_curve`.
+    """
+    # Precision-recall curve, by decreasing recall
+    precision = np.empty(len(tps) + 1)
+    np.divide(tps[::-1], (tps + fps)[::-1], out=precision[:-1])
+    precision[-1] = 1
+    recall = np.empty(len(tps) + 1)
+    np.divide(tps[::-1], n_positives, out=recall[:-1])
+    recall[-1] = 0
+    average_precision = -np.sum(np.diff(recall) * precision[:-1])
+
+    # ROC curve, without the points in between collinear ones
+    if len(fps) > 2:
+        corners = np.flatnonzero(np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True])
+        roc_fps, roc_tps, roc_thresholds = fps[corners], tps[corners], thresholds[corners]
+    else:
+        roc_fps, roc_tps, roc_thresholds = fps, tps, thresholds
+    fpr = np.r_[0, roc_fps] / roc_fps[-1]
+    tpr = np.r_[0, roc_tps] / roc_tps[-1]
+
+    return dict(
+        precision=precision,
+        recall=recall,
+        pr_thresholds=thresholds[::-1],
+        average_precision=float(average_precision),
+        fpr=fpr,
+        tpr=tpr,
+        roc_thresholds=np.r_[np.inf, roc_thresholds],
+        roc_auc=float(np.trapz(tpr, fpr)),
+    )
@@ -8,22 +8,69 @@ for warning_type in [FutureWarning, DeprecationWarning]:
 # warnings.filterwarnings("ignore", category=DeprecationWarning)
 # warnings.filterwarnings("ignore", category=FutureWarning)
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import (
-    ClassImbalance, 
-    PercentOfNulls,
-    OutlierSampleDetection,
-    DataDuplicates,
-    MixedDataTypes,
-    FeatureLabelCorrelation, 
-    FeatureFeatureCorrelation
-)
-from deepchecks.tabular.checks.data_integrity import PercentOfNulls
+from src.integrity_checks import DataCheckResult, DataChecksReport, INTEGRITY_CHECKS, run_integrity_check
+
 
+def _data_checks():
+    """
+    Return the data checks, in the order they are reported. Each entry has the
+    check with its condition, whether the condition holds on good data, the
+    message of a failure, its severity, and whether the check is expensive
+    enough to run on a sample of the rows when `sample_size` is given. The
+    checks also in `src.integrity_checks.INTEGRITY_CHECKS` run natively unless
+    a full report is requested.
+
+    deepchecks takes seconds to import, so it is only imported here.
+    """
+    from deepchecks.tabular.checks import (
+        ClassImbalance, 
+        PercentOfNulls,
+        OutlierSampleDetection,
+        DataDuplicates,
+        MixedDataTypes,
+        FeatureLabelCorrelation, 
+        FeatureFeatureCorrelation
+    )
 
-def data_deepchecks(diabetes_train_dataframe):
+    return [
+        # validate training data for class imbalance for target variable;
+        # the ratio condition holds when the classes are imbalanced
+        ("class_imbalance", lambda: ClassImbalance().add_condition_class_ratio_less_than(0.4),
+         False, "Class imbalance exceeds the maximum acceptable threshold.", "error", False),
+        # validate training data for percent of nulls
+        ("percent_of_nulls", lambda: PercentOfNulls().add_condition_percent_of_nulls_not_greater_than(0.05),
+         True, "Percent of nulls exceeds the maximum acceptable threshold for at least one column.", "error", False),
+        # validate training data for percent of outlier samples using loOP algo
+        ("outlier_samples", lambda: (
+            OutlierSampleDetection(nearest_neighbors_percent = 0.01, extent_parameter = 3)
+            .add_condition_outlier_ratio_less_or_equal(max_outliers_ratio = 0.001, outlier_score_threshold = 0.9)),
+         True, "Number of outlier samples exceeds the maximum acceptable threshold.", "error", True),
+        # set duplicate condition to 0 as would not expect any two patient with the exact same situation
+        ("data_duplicates", lambda: DataDuplicates().add_condition_ratio_less_or_equal(0),
+         True, "Data duplicates exceed the maximum acceptable threshold.", "error", False),
+        # validate training data for mixed data types across all columns; only a warning
+        ("mixed_data_types", lambda: MixedDataTypes().add_condition_rare_type_ratio_not_in_range((0.01, 0.2)),
+         True, "Percentage of rare data type in dangerous zone for at least one column", "warning", False),
+        # anomalous correlations between target/response variable and features/explanatory variables
+        ("feature_label_correlation", lambda: FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.7),
+         True, "Feature-Label correlation exceeds the maximum acceptable threshold.", "error", True),
+        # anomalous correlations between features/explanatory variables
+        ("feature_feature_correlation", lambda: FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(threshold = 0.7, n_pairs = 0),
+         True, "Feature-feature correlation exceeds the maximum acceptable threshold.", "error", False),
+    ]
+
+
+# The outlier check needs at least 1 / nearest_neighbors_percent rows
+MIN_SAMPLE_SIZE = 100
+
+
+def data_deepchecks(diabetes_train_dataframe, sample_size=None, random_state=123, n_jobs=1, raise_on_failure=True,
+                    full_report=False):
     """
     Perform various deep checks on the training dataset to validate its quality. 
 
@@ -35,16 +82,39 @@ def data_deepchecks(diabetes_train_dataframe):
     5. Mixed data types across columns.
     6. Correlations between the target variable and features, as well as between features.
 
+    The outlier and feature-label correlation checks scale badly with the
+    number of rows. With `sample_size`, they run on a sample of the rows
+    stratified on 'Outcome', while the other checks still see all the data.
+
+    The class imbalance, nulls, duplicates and feature-feature correlation
+    checks are run with the vectorized code of `src.integrity_checks`, which
+    gives the same results in a fraction of the time, unless `full_report`
+    is True.
+
     Parameters
     ----------
     diabetes_train_dataframe : pandas.DataFrame
         The DataFrame containing diabetes-related training data, which includes columns such as 'Pregnancies', 'Glucose', 
         'BloodPressure', and other related measurements. The data is validated based on specific criteria for 
         each column.
+    sample_size : int, optional
+        Number of rows the expensive checks run on, at least `MIN_SAMPLE_SIZE`.
+        All rows are used when omitted or when the data has no more rows than this.
+    random_state : int, optional, default 123
+        Seed of the stratified sample.
+    n_jobs : int, optional, default 1
+        Number of checks run concurrently on a thread pool.
+    raise_on_failure : bool, optional, default True
+        Whether to raise (or warn) for failed checks as described below.
+        With False, every check runs and the failures are only reported.
+    full_report : bool, optional, default False
+        Whether to run every check with deepchecks.
 
     Returns
     -------
-    None
+    DataChecksReport
+        Whether each check passed and the seconds it took. When an error is
+        raised, the checks after the failed one may not have run.
 
     Raises
     -------
@@ -58,65 +128,64 @@ def data_deepchecks(diabetes_train_dataframe):
     """
 
     ## Deepchecks - data related
-    # validate training data for class imbalance for target variable 
     # Do these on training data as part of EDA! 
-    diabetes_train_ds = Dataset(diabetes_train_dataframe, label = 'Outcome', cat_features=[])
-
-    check_lab_cls_imb = ClassImbalance().add_condition_class_ratio_less_than(0.4)
-    check_lab_cls_imb_result = check_lab_cls_imb.run(dataset = diabetes_train_ds)
-
-    if check_lab_cls_imb_result.passed_conditions():
-        raise ValueError("Class imbalance exceeds the maximum acceptable threshold.")
-    
-    # validate training data for percent of nulls
-    check_pct_nulls = PercentOfNulls().add_condition_percent_of_nulls_not_greater_than(0.05)
-    check_pct_nulls_result = check_pct_nulls.run(dataset = diabetes_train_ds)
-
-    if not check_pct_nulls_result.passed_conditions():
-        raise ValueError("Percent of nulls exceeds the maximum acceptable threshold for at least one column.")
-    
-    # validate training data for percent of outlier samples using loOP algo
-    check_out_sample = (
-        OutlierSampleDetection(nearest_neighbors_percent = 0.01, extent_parameter = 3)
-        .add_condition_outlier_ratio_less_or_equal(max_outliers_ratio = 0.001, outlier_score_threshold = 0.9)
-    )
-    check_out_sample_result = check_out_sample.run(dataset = diabetes_train_ds)
-
-    if not check_out_sample_result.passed_conditions():
-        raise ValueError("Number of outlier samples exceeds the maximum acceptable threshold.")
-    
-    # validate training data for data duplicates
-    # set duplicate condition to 0 as would not expect any two patient with the exact same situation
-    check_data_dup = DataDuplicates().add_condition_ratio_less_or_equal(0)
-    check_data_dup_result = check_data_dup.run(dataset = diabetes_train_ds)
-
-    if not check_data_dup_result.passed_conditions():
-        raise ValueError("Data duplicates exceed the maximum acceptable threshold.")
-    
-    # validate training data for mixed data types across all columns
-    check_mix_dtype = MixedDataTypes().add_condition_rare_type_ratio_not_in_range((0.01, 0.2))
-    check_mix_dtype_result = check_mix_dtype.run(dataset = diabetes_train_ds)
-
-    if not check_mix_dtype_result.passed_conditions():
-        # raise a warning instead of an error in this case
-        warnings.warn("Percentage of rare data type in dangerous zone for at least one column")
-
-    ## Deepchecks - correlation
-    # validate training data for anomalous correlations between target/response variable 
-    # and features/explanatory variables, 
-    # as well as anomalous correlations between features/explanatory variables
-
-    check_feat_lab_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.7)
-    check_feat_lab_corr_result = check_feat_lab_corr.run(dataset = diabetes_train_ds)
-
-    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(threshold = 0.7, n_pairs = 0)
-    check_feat_feat_corr_result = check_feat_feat_corr.run(dataset = diabetes_train_ds)
-
-    if not check_feat_lab_corr_result.passed_conditions():
-        raise ValueError("Feature-Label correlation exceeds the maximum acceptable threshold.")
-
-    if not check_feat_feat_corr_result.passed_conditions():
-        raise ValueError("Feature-feature correlation exceeds the maximum acceptable threshold.")
-
-    
+    from deepchecks.tabular import Dataset
 
+    # One Dataset is shared by all the checks on the full data, and one by the checks on the sample
+    diabetes_train_ds = Dataset(diabetes_train_dataframe, label = 'Outcome', cat_features=[])
+    diabetes_sample = _stratified_sample(diabetes_train_dataframe, sample_size, random_state)
+    if diabetes_sample is None:
+        diabetes_sample_ds = diabetes_train_ds
+        n_sample_rows = len(diabetes_train_dataframe)
+    else:
+        diabetes_sample_ds = Dataset(diabetes_sample, label = 'Outcome', cat_features=[])
+        n_sample_rows = len(diabetes_sample)
+
+    def run_check(spec):
+        name, make_check, passes_on_good_data, message, severity, expensive = spec
+        if not full_report and name in INTEGRITY_CHECKS:
+            return run_integrity_check(name, diabetes_train_dataframe)
+        on_sample = expensive and diabetes_sample is not None
+        start = time.perf_counter()
+        result = make_check().run(dataset = diabetes_sample_ds if on_sample else diabetes_train_ds)
+        passed = result.passed_conditions() == passes_on_good_data
+        return DataCheckResult(name, passed, message, severity, time.perf_counter() - start, on_sample)
+
+    checks = _data_checks()
+    report = DataChecksReport(len(diabetes_train_dataframe), n_sample_rows)
+    if n_jobs > 1:
+        executor = ThreadPoolExecutor(max_workers=n_jobs)
+        results = (future.result() for future in [executor.submit(run_check, spec) for spec in checks])
+    else:
+        # run one check at a time, so that a failure stops the remaining checks
+        executor = None
+        results = (run_check(spec) for spec in checks)
+
+    try:
+        # results are consumed in order, so failures are raised in the order
+        # of the checks and warnings are issued from the calling thread
+        for result in results:
+            report.checks.append(result)
+            if raise_on_failure:
+                result.raise_if_failed()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return report
+
+
+def _stratified_sample(diabetes_train_dataframe, sample_size, random_state):
+    """Return `sample_size` rows stratified on 'Outcome', or None if all rows should be used."""
+    from sklearn.model_selection import train_test_split
+
+    if sample_size is None:
+        return None
+    sample_size = max(sample_size, MIN_SAMPLE_SIZE)
+    if sample_size >= len(diabetes_train_dataframe):
+        return None
+    outcome = diabetes_train_dataframe['Outcome']
+    # every class needs two rows to be stratified
+    stratify = outcome if outcome.value_counts().min() >= 2 else None
+    sample, _ = train_test_split(diabetes_train_dataframe, train_size=sample_size,
+                                 stratify=stratify, random_state=random_state)
+    return sample
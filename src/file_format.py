@@ -0,0 +1,55 @@
+import os
+
+# File extensions understood by `read_data` and `save_data`, and the storage
+# format each one maps to. Arrow IPC files are read and written as Feather V2.
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.npy': 'npy',
+}
+
+# Formats the pipeline scripts accept for their `--data-format` option,
+# each of which is also the extension of the files written
+DATA_FORMATS = ['csv', 'parquet', 'feather', 'npy']
+
+def npy_columns_path(file_path):
+    """Returns the path of the sidecar file holding the column names of a `.npy` file."""
+    return os.path.splitext(file_path)[0] + '.columns.json'
+
+def infer_file_format(file_path, file_format=None):
+    """
+    Returns the storage format of a data file.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the data file.
+    file_format : str, optional
+        Explicit format ('csv', 'parquet', 'feather' or 'npy'). When omitted,
+        the format is picked from the file extension.
+
+    Returns:
+    --------
+    str
+        One of 'csv', 'parquet', 'feather' or 'npy'.
+
+    Raises:
+    -------
+    ValueError
+        If the format is not supported or cannot be inferred from the extension.
+    """
+    supported = sorted(set(FILE_FORMATS.values()))
+    if file_format is not None:
+        if file_format not in supported:
+            raise ValueError(f"Unsupported file format '{file_format}'. Supported formats are: {', '.join(supported)}.")
+        return file_format
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(
+            f"Cannot infer the file format of '{file_path}'. "
+            f"Supported extensions are: {', '.join(FILE_FORMATS)}."
+        )
+    return FILE_FORMATS[extension]
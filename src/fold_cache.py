@@ -0,0 +1,83 @@
+import os
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import check_cv
+
+
+class FoldCache:
+    """
+    Cross-validation folds computed once and shared by every model fitted on
+    them.
+
+    The fold indices are computed once, like `cv` is split by scikit-learn's
+    searches (stratified k-fold for class labels). For each fold, the
+    `preprocessing` (e.g. a StandardScaler) is fitted once on the training
+    rows and the transformed training and validation arrays are kept, in
+    memory or as memory-mapped `.npy` files in `memmap_dir`.
+
+    A FoldCache can be passed as `cv` to scikit-learn's searches and
+    `cross_val_score`, which then reuse its indices, and as `fold_cache` to
+    `src.warm_start_search_cv.WarmStartSearchCV.fit`, which also reuses its
+    arrays.
+
+    Parameters:
+    -----------
+    X : pandas.DataFrame or numpy.ndarray
+        The training features.
+    y : pandas.Series or numpy.ndarray
+        The training target.
+    cv : int or cross-validation generator, optional, default 5
+        Folds, as in scikit-learn's searches.
+    preprocessing : transformer, optional
+        Transformer fitted on the training rows of each fold. The arrays are
+        the untransformed values when omitted.
+    memmap_dir : str, optional
+        Directory where the arrays are saved and memory-mapped from. Kept in
+        memory when omitted.
+    """
+
+    def __init__(self, X, y, cv=5, preprocessing=None, memmap_dir=None):
+        if memmap_dir is not None and not os.path.isdir(memmap_dir):
+            raise FileNotFoundError(f"The directory '{memmap_dir}' does not exist.")
+        self.indices = list(check_cv(cv, y, classifier=True).split(X, y))
+        self.preprocessing_times = []
+        self._folds = []
+        for k, (train, test) in enumerate(self.indices):
+            X_train, X_test = take_rows(X, train), take_rows(X, test)
+            start = time.perf_counter()
+            if preprocessing is not None:
+                fitted = clone(preprocessing).fit(X_train)
+                X_train, X_test = fitted.transform(X_train), fitted.transform(X_test)
+            self.preprocessing_times.append(time.perf_counter() - start)
+            arrays = [np.asarray(X_train), np.asarray(X_test), np.asarray(take_rows(y, train)),
+                      np.asarray(take_rows(y, test))]
+            if memmap_dir is not None:
+                arrays = [_memmap(array, os.path.join(memmap_dir, f"fold{k}_{name}.npy"))
+                          for array, name in zip(arrays, ["X_train", "X_test", "y_train", "y_test"])]
+            self._folds.append(tuple(arrays))
+
+    def __len__(self):
+        return len(self.indices)
+
+    def fold(self, k):
+        """Returns the (preprocessed) X_train, X_test, y_train and y_test arrays of fold `k`."""
+        return self._folds[k]
+
+    def split(self, X=None, y=None, groups=None):
+        """Yields the train and test row indices of each fold, like a scikit-learn splitter."""
+        yield from self.indices
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return len(self.indices)
+
+
+def take_rows(data, rows):
+    """Rows of a DataFrame, Series or array by position."""
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+
+def _memmap(array, file_path):
+    """Save `array` to `file_path` and return it memory-mapped read-only."""
+    np.save(file_path, array)
+    return np.load(file_path, mmap_mode="r")
@@ -0,0 +1,122 @@
+import numpy as np
+from src.linear_model_artifact import LinearModel, linear_model_arrays
+
+FLOAT_DTYPES = (np.float32, np.float64)
+
+
+class FusedLinearModel:
+    """
+    A StandardScaler and binary linear classifier folded into one weight
+    vector and bias.
+
+    Standardizing and then applying the linear model is affine, so
+
+        (x - mean) / scale · coef + intercept = x · weights + bias
+
+    with `weights = coef / scale` and
+    `bias = intercept - Σ coef * mean / scale`. Scoring a row is then one dot
+    product and a sigmoid, without the per-call validation and copies of a
+    scikit-learn pipeline.
+
+    The features are used as they are when they are a float32 or float64
+    array, and the computation runs in their dtype: float32 halves the
+    memory traffic, at a relative precision of about 1e-6. Other inputs are
+    converted to float64, or to the `dtype` given. The only array allocated
+    is the result, one value per row, and it can be passed as `out` instead,
+    e.g. to reuse one buffer across batches.
+
+    Parameters:
+    -----------
+    weights : numpy.ndarray
+        Weight of each raw (unstandardized) feature.
+    bias : float
+        Decision function of a row of zeros.
+    classes : numpy.ndarray
+        The negative and positive class labels.
+    feature_names : numpy.ndarray, optional
+        Names of the features, in the order of `weights`.
+    """
+
+    def __init__(self, weights, bias, classes, feature_names=None):
+        self.weights = weights
+        self.bias = bias
+        self.classes_ = classes
+        self.feature_names = feature_names
+        self._weights = {np.dtype(dtype): np.asarray(weights, dtype=dtype) for dtype in FLOAT_DTYPES}
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Fuse a `src.linear_model_artifact.LinearModel`, or a fitted scaler and
+        binary linear classifier pipeline (see `linear_model_arrays`).
+        """
+        if not isinstance(model, LinearModel):
+            model = LinearModel(**linear_model_arrays(model))
+        weights = model.coef_[0] / model.scale
+        bias = float(model.intercept_[0] - np.dot(weights, model.mean))
+        return cls(weights, bias, model.classes_, model.feature_names)
+
+    def decision_function(self, X, out=None, dtype=None):
+        """
+        Decision function of each row of `X`, or of the single row `X`.
+
+        Parameters:
+        -----------
+        X : numpy.ndarray or pandas.DataFrame
+            The raw features, one row per patient.
+        out : numpy.ndarray, optional
+            Array of one value per row, of the computation dtype, written
+            with the result and returned.
+        dtype : numpy.dtype, optional
+            float32 or float64, the dtype of the computation. The dtype of `X`
+            when it is one of them, float64 otherwise.
+
+        Returns:
+        --------
+        numpy.ndarray
+            The decision function, of the computation dtype.
+
+        Raises:
+        -------
+        ValueError
+            If `dtype` is neither float32 nor float64.
+        """
+        X = np.asarray(X)
+        if dtype is None:
+            dtype = X.dtype if X.dtype in FLOAT_DTYPES else np.float64
+        dtype = np.dtype(dtype)
+        if dtype not in self._weights:
+            raise ValueError("The `dtype` must be float32 or float64.")
+        X = X.astype(dtype, copy=False)
+        if X.ndim == 1:
+            return np.dot(X, self._weights[dtype]) + dtype.type(self.bias)
+        out = np.matmul(X, self._weights[dtype], out=out)
+        out += dtype.type(self.bias)
+        return out
+
+    def predict_proba_1(self, X, out=None, dtype=None):
+        """
+        Probability of the positive class of each row of `X`, or of the single
+        row `X`. Computed in place in the decision function, see
+        `decision_function` for the parameters.
+        """
+        z = self.decision_function(X, out=out, dtype=dtype)
+        # exp(-z) overflows to inf for very negative z, whose probability is then 0
+        with np.errstate(over='ignore'):
+            if np.ndim(z) == 0:
+                return 1 / (1 + np.exp(-z))
+            # 1 / (1 + exp(-z)), without temporaries
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+            z += 1
+            np.reciprocal(z, out=z)
+        return z
+
+    def predict_proba(self, X, dtype=None):
+        """Probabilities of the negative and positive class for each row of `X`."""
+        positive = self.predict_proba_1(X, dtype=dtype)
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X, dtype=None):
+        """Class label of each row of `X`."""
+        return self.classes_[(self.decision_function(X, dtype=dtype) > 0).astype(int)]
@@ -0,0 +1,163 @@
+import hashlib
+from fractions import Fraction
+import numpy as np
+import pandas as pd
+
+# Rows of each class are split in blocks of this many rows, of which
+# train_size * STRATIFY_BLOCK_SIZE go to the train set, the fractional part
+# being carried over to the next blocks
+STRATIFY_BLOCK_SIZE = 100
+
+# Scale from 53-bit integers to [0, 1)
+_UNIT = 2.0 ** -53
+
+
+class HashSplitter:
+    """
+    Splits data into train and test sets one chunk at a time, so that the
+    data never has to fit in memory.
+
+    Each row goes to the train set when a seeded 64-bit hash of its values,
+    scaled to [0, 1), is below `train_size`. The split of a row only depends
+    on its values and the seed, so it is reproducible and the same whatever
+    the chunk size, or the dtypes the values were read with.
+
+    With `stratify`, the rows of each class of `label` are instead numbered
+    in the order they are read, and split in blocks of `STRATIFY_BLOCK_SIZE`
+    consecutive rows, of which a seeded random choice of
+    train_size * STRATIFY_BLOCK_SIZE go to the train set. When that is not a
+    whole number, the blocks take turns rounding it down or up, so that the
+    first k blocks of a class hold floor(k * train_size * STRATIFY_BLOCK_SIZE)
+    train rows (e.g. 0.4 of a row per block for a `train_size` of 0.004).
+    Every class then has the same train fraction, up to the last blocks. The
+    split depends on the order of the rows, but not on the chunk size.
+
+    Parameters:
+    -----------
+    train_size : float, optional, default 0.7
+        Fraction of the rows in the train set, strictly between 0 and 1.
+    random_state : int, optional, default 123
+        Seed of the split.
+    stratify : bool, optional, default False
+        Whether to keep the same class ratio in the train and test sets.
+    label : str, optional, default 'Outcome'
+        Column holding the classes when `stratify` is True.
+    """
+
+    def __init__(self, train_size=0.7, random_state=123, stratify=False, label='Outcome'):
+        if not 0 < train_size < 1:
+            raise ValueError("`train_size` must be strictly between 0 and 1.")
+        self.train_size = train_size
+        self.random_state = random_state
+        self.stratify = stratify
+        self.label = label
+        # rows of each class seen so far, for the stratified split
+        self.class_counts = {}
+        # train rows per block, from the decimal value of `train_size` so that
+        # e.g. 0.7 gives exactly 70 rows per block
+        self._block_train_rows = Fraction(repr(train_size)).limit_denominator(10 ** 6) * STRATIFY_BLOCK_SIZE
+        self._seed = np.frombuffer(hashlib.sha256(str(random_state).encode()).digest()[:8], dtype=np.uint64)
+
+    def train_mask(self, chunk):
+        """
+        Returns a boolean mask that is True for the rows of `chunk` in the
+        train set. Chunks must be passed in the order of the data when
+        `stratify` is True.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame")
+        if self.stratify:
+            return self._stratified_train_mask(chunk)
+        return row_unit_hashes(chunk, self._seed) < self.train_size
+
+    def split(self, chunk):
+        """Returns the train and test rows of `chunk`."""
+        train = self.train_mask(chunk)
+        return chunk[train], chunk[~train]
+
+    def _stratified_train_mask(self, chunk):
+        if self.label not in chunk.columns:
+            raise ValueError(f"Column '{self.label}' is missing from the data.")
+        labels = chunk[self.label]
+        if labels.isna().any():
+            raise ValueError(f"Column '{self.label}' must not contain missing values when stratifying.")
+
+        train = np.zeros(len(chunk), dtype=bool)
+        for value, rows in pd.Series(np.arange(len(chunk))).groupby(labels.to_numpy()):
+            rows = rows.to_numpy()
+            start = self.class_counts.get(value, 0)
+            self.class_counts[value] = start + len(rows)
+            # number of each row among the rows of its class, its block and its place in the block
+            numbers = start + np.arange(len(rows), dtype=np.uint64)
+            blocks, places = np.divmod(numbers, np.uint64(STRATIFY_BLOCK_SIZE))
+            first_block = blocks[0]
+            n_blocks = int(blocks[-1] - first_block) + 1
+            # train rows of each block: the whole train rows of the blocks up to
+            # its end, less those up to its start
+            block_ends = int(first_block) + np.arange(n_blocks + 1, dtype=np.int64)
+            n_train_per_block = np.diff(block_ends * self._block_train_rows.numerator
+                                        // self._block_train_rows.denominator)
+            # a seeded random order of the places of each block touched by the chunk
+            block_seeds = _mix(self._seed ^ _label_seed(value) ^ _mix(first_block + np.arange(n_blocks, dtype=np.uint64)))
+            keys = _mix(block_seeds[:, None] ^ np.arange(STRATIFY_BLOCK_SIZE, dtype=np.uint64))
+            ranks = np.argsort(np.argsort(keys, axis=1), axis=1)
+            block_index = (blocks - first_block).astype(np.intp)
+            train[rows] = ranks[block_index, places.astype(np.intp)] < n_train_per_block[block_index]
+        return train
+
+
+def row_hashes(data):
+    """
+    Returns a uint64 hash of the values of each row of `data`, that does not
+    depend on the dtypes the values were read with.
+
+    Values are hashed as float32 numbers, so that e.g. Int16 and int64
+    columns, Float32 and float64 columns, or the numbers of a text column,
+    give the same hashes, and missing values hash alike in every dtype.
+    Values that are not numbers (e.g. 'abc' in a numeric column) are hashed
+    by their text as well.
+    """
+    values = {}
+    text = {}
+    for col in data.columns:
+        column = data[col]
+        if not pd.api.types.is_numeric_dtype(column):
+            numbers = pd.to_numeric(column, errors="coerce")
+            not_number = numbers.isna() & column.notna()
+            if not_number.any():
+                text[col] = column.where(not_number, "").astype(str)
+            column = numbers
+        values[col] = column.to_numpy(dtype=np.float32, na_value=np.nan)
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(values), index=False).to_numpy()
+    if text:
+        text = pd.DataFrame(text)
+        has_text = (text != "").any(axis=1).to_numpy()
+        text_hashes = pd.util.hash_pandas_object(text[has_text], index=False).to_numpy()
+        hashes[has_text] = _mix(hashes[has_text] ^ text_hashes)
+    return hashes
+
+
+def row_unit_hashes(data, seed):
+    """
+    Returns for each row of `data` a number in [0, 1) derived from a 64-bit
+    hash of its values (see `row_hashes`), scrambled with `seed`, a uint64
+    array of one value.
+    """
+    hashed = _mix(row_hashes(data) ^ seed)
+    # the 53 high bits are exact in float64, so the result stays below 1
+    return (hashed >> np.uint64(11)).astype(np.float64) * _UNIT
+
+
+def _label_seed(value):
+    """A uint64 derived from a class value, the same for e.g. 1, 1.0 and numpy.int8(1)."""
+    if isinstance(value, (int, float, np.number)) and float(value).is_integer():
+        value = int(value)
+    return np.frombuffer(hashlib.sha256(str(value).encode()).digest()[:8], dtype=np.uint64)
+
+
+def _mix(x):
+    """SplitMix64 finalizer: a bijective scrambling of uint64 values."""
+    x = np.asarray(x, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
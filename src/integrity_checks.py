@@ -0,0 +1,174 @@
+import time
+import warnings
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+# Thresholds of the integrity checks, the same as the conditions given to
+# the deepchecks checks in `data_deepchecks`
+CLASS_RATIO_THRESHOLD = 0.4
+NULL_RATIO_THRESHOLD = 0.05
+DUPLICATE_RATIO_THRESHOLD = 0
+CORRELATION_THRESHOLD = 0.7
+MAX_CORRELATED_PAIRS = 0
+
+# Rows sampled by deepchecks for the duplicates and correlation checks on
+# larger data. Nulls are counted on all the rows, which is cheap and exact.
+_DUPLICATES_SAMPLE_SIZE = 10_000_000
+_CORRELATION_SAMPLE_SIZE = 10_000
+_SAMPLE_RANDOM_STATE = 42
+
+
+@dataclass
+class DataCheckResult:
+    """Outcome of one data check run by `data_deepchecks` or `integrity_checks`."""
+    name: str
+    passed: bool
+    message: str
+    severity: str
+    seconds: float
+    on_sample: bool
+
+    def raise_if_failed(self):
+        """Raise a ValueError for a failed 'error' check, or warn for a failed 'warning' check."""
+        if self.passed:
+            return
+        if self.severity == "warning":
+            warnings.warn(self.message)
+        else:
+            raise ValueError(self.message)
+
+
+@dataclass
+class DataChecksReport:
+    """Results of the data checks, in the order of the checks, with the number of rows they ran on."""
+    n_rows: int
+    n_sample_rows: int
+    checks: list = field(default_factory=list)
+
+    @property
+    def passed(self):
+        """Whether every check passed, including the ones that only warn."""
+        return all(check.passed for check in self.checks)
+
+    @property
+    def failures(self):
+        """The checks that did not pass."""
+        return [check for check in self.checks if not check.passed]
+
+    @property
+    def timings(self):
+        """Seconds taken by each check, indexed by its name."""
+        return pd.Series({check.name: check.seconds for check in self.checks}, name="seconds")
+
+
+def class_ratio(labels):
+    """
+    Returns the ratio between the least and the most frequent label, ignoring
+    missing labels. The class frequencies are rounded to two decimals first,
+    like deepchecks' `ClassImbalance`.
+    """
+    frequencies = pd.Series(labels).value_counts(normalize=True).round(2)
+    return frequencies.iloc[-1] / frequencies.iloc[0]
+
+
+def null_ratios(features):
+    """Returns the fraction of missing values in each column of `features`."""
+    return features.isna().mean()
+
+
+def duplicate_ratio(data):
+    """Returns the fraction of rows of `data` that repeat an earlier row, comparing rows by their hash."""
+    data = _sample(data, _DUPLICATES_SAMPLE_SIZE)
+    return pd.util.hash_pandas_object(data, index=False).duplicated().mean()
+
+
+def correlated_pairs(features, threshold=CORRELATION_THRESHOLD, ignore_columns=()):
+    """
+    Returns the pairs of numeric features whose Spearman correlation is above
+    `threshold`, like deepchecks' `FeatureFeatureCorrelation`. Columns that
+    are not numeric or are in `ignore_columns` are ignored.
+    """
+    numeric = [col for col in features.columns
+               if col not in ignore_columns and pd.api.types.is_numeric_dtype(features[col])]
+    correlations = _sample(features, _CORRELATION_SAMPLE_SIZE)[numeric].corr(method="spearman").to_numpy()
+    rows, cols = np.nonzero(np.triu(correlations > threshold, k=1))
+    return [(numeric[i], numeric[j]) for i, j in zip(rows, cols)]
+
+
+# The native checks, in the order they are reported by `data_deepchecks`:
+# name, function from (data, label column) to whether the check passed, and
+# the message of a failure
+INTEGRITY_CHECKS = {
+    "class_imbalance": (
+        lambda data, label: class_ratio(data[label]) >= CLASS_RATIO_THRESHOLD,
+        "Class imbalance exceeds the maximum acceptable threshold."),
+    "percent_of_nulls": (
+        lambda data, label: bool((null_ratios(data).drop(label) <= NULL_RATIO_THRESHOLD).all()),
+        "Percent of nulls exceeds the maximum acceptable threshold for at least one column."),
+    "data_duplicates": (
+        lambda data, label: duplicate_ratio(data) <= DUPLICATE_RATIO_THRESHOLD,
+        "Data duplicates exceed the maximum acceptable threshold."),
+    "feature_feature_correlation": (
+        lambda data, label: len(correlated_pairs(data, ignore_columns=[label])) <= MAX_CORRELATED_PAIRS,
+        "Feature-feature correlation exceeds the maximum acceptable threshold."),
+}
+
+
+def run_integrity_check(name, data, label="Outcome"):
+    """Runs the native check `name` of `INTEGRITY_CHECKS` on `data` and returns its timed result."""
+    check, message = INTEGRITY_CHECKS[name]
+    start = time.perf_counter()
+    passed = bool(check(data, label))
+    return DataCheckResult(name, passed, message, "error", time.perf_counter() - start, False)
+
+
+def integrity_checks(diabetes_train_dataframe, label="Outcome", raise_on_failure=True):
+    """
+    Runs the class imbalance, percent of nulls, data duplicates and
+    feature-feature correlation checks with vectorized pandas/NumPy code,
+    with the same thresholds and results as the deepchecks checks in
+    `data_deepchecks` but without building a deepchecks Dataset.
+
+    Parameters
+    ----------
+    diabetes_train_dataframe : pandas.DataFrame
+        The training data, with the label in column `label`.
+    label : str, optional, default 'Outcome'
+        Name of the label column.
+    raise_on_failure : bool, optional, default True
+        Whether to raise a ValueError at the first failed check.
+
+    Returns
+    -------
+    DataChecksReport
+        Whether each check passed and the seconds it took.
+
+    Raises
+    ------
+    TypeError
+        If the input is not a pandas DataFrame.
+    ValueError
+        If the DataFrame is empty, or if a check fails and `raise_on_failure` is True.
+    """
+    if not isinstance(diabetes_train_dataframe, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if diabetes_train_dataframe.empty:
+        raise ValueError("Dataframe must contain observations.")
+
+    report = DataChecksReport(len(diabetes_train_dataframe), len(diabetes_train_dataframe))
+    for name in INTEGRITY_CHECKS:
+        result = run_integrity_check(name, diabetes_train_dataframe, label)
+        report.checks.append(result)
+        if raise_on_failure:
+            result.raise_if_failed()
+    return report
+
+
+def _sample(data, n_samples):
+    """Return `data`, or a random sample of `n_samples` of its rows when it has more."""
+    if len(data) <= n_samples:
+        return data
+    # unlike DataFrame.sample, this does not shuffle all the rows to draw a few
+    rows = np.random.default_rng(_SAMPLE_RANDOM_STATE).choice(len(data), n_samples, replace=False)
+    return data.iloc[np.sort(rows)]
@@ -0,0 +1,163 @@
+import os
+import numpy as np
+
+
+class LinearModel:
+    """
+    A fitted StandardScaler and linear classifier pipeline, as NumPy arrays.
+
+    Predicts like the scikit-learn pipeline it was saved from, with NumPy
+    only: the features are standardized with `mean` and `scale`, and the
+    decision function is their dot product with `coef` plus `intercept`.
+    The probability of the positive class is its logistic sigmoid, as for
+    a binary LogisticRegression (or an SGDClassifier with the log loss).
+
+    Parameters:
+    -----------
+    mean, scale : numpy.ndarray
+        Per-feature offset and scale of the standardization.
+    coef : numpy.ndarray
+        Coefficients of the standardized features, of shape (1, n_features).
+    intercept : numpy.ndarray
+        Intercept, of shape (1,).
+    classes : numpy.ndarray
+        The negative and positive class labels.
+    feature_names : numpy.ndarray, optional
+        Names of the features, checked against the columns of DataFrames.
+    """
+
+    def __init__(self, mean, scale, coef, intercept, classes, feature_names=None):
+        self.mean = mean
+        self.scale = scale
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.feature_names = feature_names
+
+    def decision_function(self, X):
+        """Signed distance of the standardized rows of `X` to the decision boundary."""
+        if self.feature_names is not None and hasattr(X, 'columns') \
+                and list(X.columns) != list(self.feature_names):
+            raise ValueError(f"The columns of X must be {list(self.feature_names)}.")
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean
+        X /= self.scale
+        return X @ self.coef_.T[:, 0] + self.intercept_[0]
+
+    def predict_proba(self, X):
+        """Probabilities of the negative and positive class for each row of `X`."""
+        positive = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        """Class label of each row of `X`."""
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    def score(self, X, y):
+        """Accuracy of the predictions of `X` against `y`."""
+        return float(np.mean(self.predict(X) == np.asarray(y).ravel()))
+
+
+def linear_model_arrays(pipeline):
+    """
+    The arrays of a fitted scaler and linear classifier pipeline, by the
+    parameter names of `LinearModel`.
+
+    Parameters:
+    -----------
+    pipeline : sklearn.pipeline.Pipeline
+        A fitted pipeline of a 'standardscaler' step and a binary linear
+        classifier as the final step, e.g. the `best_estimator_` of the search.
+
+    Returns:
+    --------
+    dict
+        The 'mean', 'scale', 'coef', 'intercept' and 'classes' arrays, and the
+        'feature_names' if the pipeline was fitted on a DataFrame.
+
+    Raises:
+    -------
+    ValueError
+        If the pipeline has no fitted 'standardscaler' step, or its final step
+        is not a fitted binary linear classifier.
+    """
+    scaler = pipeline.named_steps.get('standardscaler')
+    if scaler is None or not hasattr(scaler, 'scale_'):
+        raise ValueError("The pipeline must have a fitted 'standardscaler' step.")
+    classifier = pipeline.steps[-1][1]
+    if not hasattr(classifier, 'coef_') or len(classifier.classes_) != 2:
+        raise ValueError("The final step of the pipeline must be a fitted binary linear classifier.")
+
+    n_features = classifier.coef_.shape[1]
+    arrays = {
+        'mean': scaler.mean_ if scaler.with_mean else np.zeros(n_features),
+        'scale': scaler.scale_ if scaler.with_std else np.ones(n_features),
+        'coef': classifier.coef_,
+        'intercept': classifier.intercept_,
+        'classes': classifier.classes_,
+    }
+    if hasattr(scaler, 'feature_names_in_'):
+        arrays['feature_names'] = scaler.feature_names_in_.astype(str)
+    return arrays
+
+
+def save_linear_model(pipeline, file_path):
+    """
+    Saves the arrays of a fitted scaler and linear classifier pipeline to a NumPy `.npz` file.
+
+    The file holds no pickled objects, so `load_linear_model` reads it with
+    `allow_pickle=False` and without importing scikit-learn.
+
+    Parameters:
+    -----------
+    pipeline : sklearn.pipeline.Pipeline
+        A fitted pipeline, see `linear_model_arrays`.
+    file_path : str
+        Path of the `.npz` file.
+
+    Raises:
+    -------
+    ValueError
+        If the pipeline is not a fitted scaler and binary linear classifier.
+    """
+    arrays = linear_model_arrays(pipeline)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    np.savez(file_path, **arrays)
+
+
+def load_linear_model(file_path):
+    """
+    Loads a model saved by `save_linear_model`.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path of the `.npz` file.
+
+    Returns:
+    --------
+    LinearModel
+        The model, predicting with NumPy only.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    with np.load(file_path, allow_pickle=False) as arrays:
+        return LinearModel(**{name: arrays[name] for name in arrays.files})
+
+
+def save_search_results(search, file_path):
+    """
+    Saves the `cv_results_` of a fitted search to a CSV file, without the
+    'params' column of dicts (the candidates are in the 'param_*' columns).
+    """
+    # imported here rather than at the top, so that loading a model needs NumPy only
+    import pandas as pd
+    from src.save_csv_data import save_csv_data
+
+    cv_results = pd.DataFrame(search.cv_results_).drop(columns=['params'])
+    save_csv_data(cv_results, file_path)
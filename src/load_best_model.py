@@ -0,0 +1,34 @@
+import os
+import pickle
+from src.linear_model_artifact import load_linear_model
+
+
+def load_best_model(file_path):
+    """
+    Loads the best model of the pipeline to predict with.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path of the model: the `.npz` arrays saved by
+        `src.linear_model_artifact.save_linear_model`, or a pickled search
+        or pipeline (e.g. saved by `src.save_model.save_model`).
+
+    Returns:
+    --------
+    src.linear_model_artifact.LinearModel or sklearn.pipeline.Pipeline
+        The model of an `.npz` file, or the best pipeline of a pickled
+        search (`best_estimator_`), or the pickled pipeline itself.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if file_path.endswith('.npz'):
+        return load_linear_model(file_path)
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"The file '{file_path}' does not exist.")
+    with open(file_path, 'rb') as f:
+        model = pickle.load(f)
+    return getattr(model, 'best_estimator_', model)
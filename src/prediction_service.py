@@ -0,0 +1,91 @@
+import asyncio
+import json
+import math
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Scores the rows of concurrent requests together.
+
+    `submit` queues a row and returns a future of its positive-class
+    probability. The queued rows are scored at the next turn of the event
+    loop, after every request that arrived at the same time has queued its
+    row, so batching adds no waiting time to a request that arrives alone.
+
+    Parameters:
+    -----------
+    model : src.fused_linear_kernel.FusedLinearModel
+        The model scoring the rows.
+    max_batch : int, optional, default 256
+        Maximum number of rows scored in one matrix product.
+    """
+
+    def __init__(self, model, max_batch=256):
+        self.model = model
+        self.max_batch = max_batch
+        self._pending = []
+        self._scheduled = False
+
+    def submit(self, row):
+        """Queue `row` (the feature values) and return a future of its probability."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        self._scheduled = False
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            batch = pending[start:start + self.max_batch]
+            probabilities = self.model.predict_proba_1(np.array([row for row, _ in batch]))
+            for (_, future), probability in zip(batch, probabilities):
+                if not future.cancelled():
+                    future.set_result(float(probability))
+
+
+def parse_row(payload, feature_names, n_features):
+    """
+    The feature values of a request body: a JSON object by feature name, or a
+    list in column order.
+
+    Raises:
+    -------
+    ValueError
+        If features are missing, the list has another length, or a value is
+        not a finite number (JSON allows NaN and Infinity, whose probability
+        would not be valid JSON).
+    TypeError
+        If a value is not a number or a string.
+    """
+    if isinstance(payload, dict) and feature_names is not None:
+        missing = [name for name in feature_names if name not in payload]
+        if missing:
+            raise ValueError(f"Missing features: {missing}.")
+        row = [float(payload[name]) for name in feature_names]
+    elif isinstance(payload, list) and len(payload) == n_features:
+        row = [float(value) for value in payload]
+    else:
+        raise ValueError(f"The body must be a JSON object of the features or a list of {n_features} values.")
+    if not all(math.isfinite(value) for value in row):
+        raise ValueError("The feature values must be finite numbers.")
+    return row
+
+
+async def respond(method, path, body, batcher):
+    """The status and JSON response of a request: a prediction for POST /predict, or GET /health."""
+    if method == 'GET' and path == '/health':
+        return 200, {'status': 'ok'}
+    if method != 'POST' or path != '/predict':
+        return 404, {'error': f"No route for {method} {path}."}
+    model = batcher.model
+    try:
+        row = parse_row(json.loads(body), model.feature_names, len(model.weights))
+    except (ValueError, TypeError) as e:
+        return 400, {'error': str(e)}
+    probability = await batcher.submit(row)
+    return 200, {'y_pred': model.classes_[int(probability > 0.5)].item(), 'y_pred_prob_1': probability}
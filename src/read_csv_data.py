@@ -1,7 +1,22 @@
 import pandas as pd
 import os
 
-def read_csv_data(file_path):
+# Compact dtypes for the diabetes columns. The nullable integer/float types
+# keep missing values (allowed by the validation schema) without falling back
+# to float64, and passing them to `pd.read_csv` skips dtype inference.
+DIABETES_DTYPES = {
+    "Pregnancies": "Int8",
+    "Glucose": "Int16",
+    "BloodPressure": "Int16",
+    "SkinThickness": "Int16",
+    "Insulin": "Int16",
+    "BMI": "Float32",
+    "DiabetesPedigreeFunction": "Float32",
+    "Age": "Int8",
+    "Outcome": "Int8",
+}
+
+def read_csv_data(file_path, dtype=None, chunksize=None):
     """
     Reads a CSV file and loads it into a pandas DataFrame.
 
@@ -9,11 +24,19 @@ def read_csv_data(file_path):
     -----------
     file_path : str
         Path to the CSV file.
+    dtype : dict, optional
+        Mapping of column names to dtypes, passed to `pd.read_csv` so that
+        type inference is skipped (e.g. `DIABETES_DTYPES`). Columns not in
+        the mapping are inferred as usual.
+    chunksize : int, optional
+        If given, return an iterator of DataFrames with at most `chunksize`
+        rows each instead of loading the whole file at once.
 
     Returns:
     --------
-    pd.DataFrame
-        A pandas DataFrame containing the data from the CSV file.
+    pd.DataFrame or iterator of pd.DataFrame
+        A pandas DataFrame containing the data from the CSV file, or an
+        iterator over chunks of it when `chunksize` is given.
 
     Raises:
     -------
@@ -22,20 +45,42 @@ def read_csv_data(file_path):
     IsADirectoryError
         If the file_path points to a directory instead of a file.
     ValueError
-        If the file is not a CSV file.
+        If the file is not a CSV file, or if `chunksize` is not a positive integer.
     RuntimeError
         If an error occurs while reading the CSV file.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file at '{file_path}' does not exist.")
-    
+
     if os.path.isdir(file_path):
         raise IsADirectoryError(f"The path '{file_path}' points to a directory, not a file.")
-    
+
     if not file_path.endswith('.csv'):
         raise ValueError(f"The file at '{file_path}' is not a CSV file. Please provide a valid CSV file.")
-    
+
+    if chunksize is not None and (not isinstance(chunksize, int) or chunksize < 1):
+        raise ValueError("The `chunksize` parameter must be a positive integer.")
+
+    if dtype is not None:
+        # only pass dtypes for columns present in the file, so the same mapping
+        # works for X/y files that contain a subset of the diabetes columns
+        header = pd.read_csv(file_path, nrows=0).columns
+        dtype = {col: col_type for col, col_type in dtype.items() if col in header}
+
+    if chunksize is not None:
+        return _read_csv_chunks(file_path, dtype, chunksize)
+
+    try:
+        return pd.read_csv(file_path, dtype=dtype)
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the CSV file: {e}")
+
+
+def _read_csv_chunks(file_path, dtype, chunksize):
+    """Yield chunks of a CSV file, wrapping parser errors like `read_csv_data`."""
     try:
-        return pd.read_csv(file_path)
+        with pd.read_csv(file_path, dtype=dtype, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
     except Exception as e:
         raise RuntimeError(f"An error occurred while reading the CSV file: {e}")
@@ -0,0 +1,162 @@
+import os
+import itertools
+import json
+import numpy as np
+import pandas as pd
+from src.file_format import infer_file_format, npy_columns_path
+from src.read_csv_data import read_csv_data
+
+def read_data(file_path, file_format=None, dtype=None, chunksize=None, mmap_mode=None):
+    """
+    Reads a CSV, Parquet, Feather (Arrow IPC) or NumPy `.npy` file into a pandas DataFrame.
+
+    Parquet and Feather files store column types, so they are loaded without
+    any parsing or type inference. `.npy` files hold a single 2-D array, with
+    the column names in a `<name>.columns.json` sidecar file.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the data file.
+    file_format : str, optional
+        One of 'csv', 'parquet', 'feather' or 'npy'. Inferred from the file
+        extension when omitted.
+    dtype : dict, optional
+        Mapping of column names to dtypes. Only used for CSV files; the binary
+        formats keep the dtypes they were written with.
+    chunksize : int, optional
+        If given, return an iterator of DataFrames with at most `chunksize`
+        rows each instead of loading the whole file at once.
+    mmap_mode : {None, 'r', 'r+', 'c'}, optional
+        Only used for `.npy` files. If given, the array is memory-mapped
+        instead of read, and the returned DataFrame is a view on it, so
+        processes mapping the same file (e.g. joblib workers) share its pages.
+        Defaults to 'r' when `chunksize` is given, so the chunks are read
+        from the file as they are used rather than loaded all at once.
+
+    Returns:
+    --------
+    pd.DataFrame or iterator of pd.DataFrame
+        The data in the file, or an iterator over chunks of it when
+        `chunksize` is given.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist at the given path.
+    IsADirectoryError
+        If the file_path points to a directory instead of a file.
+    ValueError
+        If the file format is not supported, or if `chunksize` is not a positive integer.
+    RuntimeError
+        If an error occurs while reading the file.
+    """
+    file_format = infer_file_format(file_path, file_format)
+    if file_format == 'csv':
+        return read_csv_data(file_path, dtype=dtype, chunksize=chunksize)
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"The file at '{file_path}' does not exist.")
+
+    if os.path.isdir(file_path):
+        raise IsADirectoryError(f"The path '{file_path}' points to a directory, not a file.")
+
+    if chunksize is not None and (not isinstance(chunksize, int) or chunksize < 1):
+        raise ValueError("The `chunksize` parameter must be a positive integer.")
+
+    if file_format == 'npy':
+        if chunksize is not None and mmap_mode is None:
+            mmap_mode = 'r'
+        data = _read_npy(file_path, mmap_mode)
+        if chunksize is not None:
+            return (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+        return data
+
+    if chunksize is not None:
+        return _read_binary_chunks(file_path, file_format, chunksize)
+
+    try:
+        if file_format == 'parquet':
+            return pd.read_parquet(file_path)
+        return pd.read_feather(file_path)
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the {file_format} file: {e}")
+
+
+def zip_chunks(X_chunks, y_chunks):
+    """
+    Pairs the chunks of features and labels read with the same `chunksize`.
+
+    Parameters:
+    -----------
+    X_chunks, y_chunks : iterator of pd.DataFrame
+        Chunks of the features and of the labels, e.g. from `read_data`.
+
+    Yields:
+    -------
+    tuple of pd.DataFrame
+        The features and labels of each chunk.
+
+    Raises:
+    -------
+    ValueError
+        If a pair of chunks differ in length, or one file has more chunks
+        than the other, i.e. the files do not have the same number of rows.
+    """
+    for X_chunk, y_chunk in itertools.zip_longest(X_chunks, y_chunks):
+        if X_chunk is None or y_chunk is None or len(X_chunk) != len(y_chunk):
+            raise ValueError("The chunks of the features and labels must have the same number of rows.")
+        yield X_chunk, y_chunk
+
+
+def _read_npy(file_path, mmap_mode):
+    """Load a `.npy` array and its column names as a DataFrame without copying the array."""
+    try:
+        values = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+        with open(npy_columns_path(file_path)) as f:
+            columns = json.load(f)
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the npy file: {e}")
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    return pd.DataFrame(values, columns=columns, copy=False)
+
+
+def _read_binary_chunks(file_path, file_format, chunksize):
+    """Yield chunks of a Parquet or Feather file as DataFrames."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        if file_format == 'parquet':
+            batches = pq.ParquetFile(file_path).iter_batches(batch_size=chunksize)
+        else:
+            batches = _feather_batches(pa.ipc.open_file(pa.memory_map(file_path)), chunksize)
+        for batch in batches:
+            yield batch.to_pandas()
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while reading the {file_format} file: {e}")
+
+
+def _feather_batches(reader, chunksize):
+    """
+    Yield tables of `chunksize` rows from the record batches of a Feather
+    file. The batches are read (and decompressed, as `to_feather` writes
+    lz4-compressed files) one at a time, so only about one batch of the file
+    and one chunk are in memory at once.
+    """
+    import pyarrow as pa
+
+    pending, n_pending = [], 0
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        while batch.num_rows > 0:
+            n_rows = min(chunksize - n_pending, batch.num_rows)
+            pending.append(batch.slice(0, n_rows))
+            n_pending += n_rows
+            batch = batch.slice(n_rows)
+            if n_pending == chunksize:
+                yield pa.Table.from_batches(pending)
+                pending, n_pending = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
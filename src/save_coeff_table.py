@@ -7,7 +7,9 @@ def save_coefficients_table(best_model, X_train, results_to):
     with feature names and coefficients, and saves it as a CSV file.
     
     Parameters:
-    - best_model: sklearn Pipeline with a logistic regression model as a step
+    - best_model: sklearn Pipeline with a logistic regression model as a step,
+      or a model with the coefficients itself (e.g. a
+      `src.linear_model_artifact.LinearModel`)
     - X_train: pandas DataFrame of training features
     - results_to: Directory path to save the output CSV file
     
@@ -18,11 +20,14 @@ def save_coefficients_table(best_model, X_train, results_to):
     if not isinstance(X_train, pd.DataFrame):
         raise TypeError("X_train should be a pandas DataFrame")
     
-    # Ensure the model has a 'logisticregression' step
-    if 'logisticregression' not in best_model.named_steps:
-        raise ValueError("'logisticregression' step not found in the pipeline.")
-    
-    logistic_model = best_model.named_steps['logisticregression']
+    if hasattr(best_model, 'named_steps'):
+        # Ensure the model has a 'logisticregression' step
+        if 'logisticregression' not in best_model.named_steps:
+            raise ValueError("'logisticregression' step not found in the pipeline.")
+
+        logistic_model = best_model.named_steps['logisticregression']
+    else:
+        logistic_model = best_model
     
     # Ensure the model is trained and has coefficients
     if not hasattr(logistic_model, 'coef_'):
@@ -1,7 +1,7 @@
 import pandas as pd
 import os
 
-def save_csv_data(data, file_path, index=False):
+def save_csv_data(data, file_path, index=False, append=False):
     """
     Saves a pandas DataFrame to a CSV file.
 
@@ -13,6 +13,9 @@ def save_csv_data(data, file_path, index=False):
         Path to save the CSV file.
     index : bool, optional, default False
         Whether to write row names (indices). Defaults to False.
+    append : bool, optional, default False
+        Whether to append the rows to an existing file without writing the
+        header again. Used to write a file chunk by chunk.
 
     Raises:
     -------
@@ -40,7 +43,7 @@ def save_csv_data(data, file_path, index=False):
     
     try:
         # Attempt to save the DataFrame
-        data.to_csv(file_path, index=index)
+        data.to_csv(file_path, index=index, mode='a' if append else 'w', header=not append)
     except PermissionError as e:
         raise PermissionError(f"Permission denied: {e}")
     except IOError as e:
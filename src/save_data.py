@@ -0,0 +1,152 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from src.file_format import infer_file_format, npy_columns_path
+from src.save_csv_data import save_csv_data
+
+def save_data(data, file_path, file_format=None, index=False):
+    """
+    Saves a pandas DataFrame to a CSV, Parquet, Feather (Arrow IPC) or NumPy `.npy` file.
+
+    Parquet and Feather files keep the column dtypes, so the next pipeline
+    stage can load them without parsing text. `.npy` files store the values
+    as one 2-D array of their common dtype (missing values become NaN), with
+    the column names in a `<name>.columns.json` sidecar file, so they can be
+    memory-mapped by `read_data`.
+
+    Parameters:
+    -----------
+    data : pd.DataFrame
+        The DataFrame to be saved.
+    file_path : str
+        Path to save the file.
+    file_format : str, optional
+        One of 'csv', 'parquet', 'feather' or 'npy'. Inferred from the file
+        extension when omitted.
+    index : bool, optional, default False
+        Whether to write row names (indices). Defaults to False. Ignored for
+        `.npy` files.
+
+    Raises:
+    -------
+    TypeError
+        If `data` is not a pandas DataFrame.
+    ValueError
+        If the file format is not supported.
+    PermissionError
+        If the program does not have permission to write to the specified path.
+    IOError
+        For any other I/O-related errors during file writing.
+    """
+    file_format = infer_file_format(file_path, file_format)
+    if file_format == 'csv':
+        save_csv_data(data, file_path, index=index)
+        return
+
+    _check_writable(data, file_path)
+    try:
+        if file_format == 'parquet':
+            data.to_parquet(file_path, index=index)
+        elif file_format == 'npy':
+            np.save(file_path, _to_numpy(data), allow_pickle=False)
+            with open(npy_columns_path(file_path), 'w') as f:
+                json.dump([str(col) for col in data.columns], f)
+        else:
+            # feather only stores a default index, so move any other index to a column
+            data.reset_index(drop=not index).to_feather(file_path)
+    except PermissionError as e:
+        raise PermissionError(f"Permission denied: {e}")
+    except IOError as e:
+        raise IOError(f"An I/O error occurred while saving the file: {e}")
+    except Exception as e:
+        raise RuntimeError(f"An unexpected error occurred: {e}")
+
+
+class DataWriter:
+    """
+    Writes a DataFrame to a CSV, Parquet or Feather file one chunk at a time.
+
+    Use as a context manager; the file is complete once the writer is closed.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to save the file.
+    file_format : str, optional
+        One of 'csv', 'parquet' or 'feather'. Inferred from the file extension
+        when omitted.
+    index : bool, optional, default False
+        Whether to write row names (indices).
+    dtype : dict, optional
+        Mapping of column names to dtypes each chunk is cast to before it is
+        written. Parquet and Feather files keep the column types of the first
+        chunk, so e.g. casting to 'string' lets a later chunk hold raw values
+        that do not fit the type inferred for the first one.
+    """
+    def __init__(self, file_path, file_format=None, index=False, dtype=None):
+        self.file_path = file_path
+        self.file_format = infer_file_format(file_path, file_format)
+        if self.file_format == 'npy':
+            raise ValueError("Chunked writing is not supported for npy files. Please use csv, parquet or feather.")
+        self.index = index
+        self.dtype = dtype
+        self._writer = None
+        self._schema = None
+        self._n_chunks = 0
+
+    def write(self, data):
+        """Append the rows of `data` to the file."""
+        _check_writable(data, self.file_path)
+        if self.dtype is not None:
+            data = data.astype({col: col_type for col, col_type in self.dtype.items() if col in data.columns})
+        if self.file_format == 'csv':
+            save_csv_data(data, self.file_path, index=self.index, append=self._n_chunks > 0)
+        else:
+            self._write_arrow(data)
+        self._n_chunks += 1
+
+    def _write_arrow(self, data):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(data, preserve_index=self.index)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.file_format == 'parquet':
+                self._writer = pq.ParquetWriter(self.file_path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.file_path, self._schema)
+        else:
+            # later chunks may infer slightly different types (e.g. all-null columns)
+            table = table.cast(self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        """Finish writing the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _to_numpy(data):
+    """Convert `data` to a single array, using float64 with NaN for extension dtypes."""
+    if all(isinstance(col_type, np.dtype) for col_type in data.dtypes):
+        return data.to_numpy()
+    return data.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _check_writable(data, file_path):
+    """Raise the same errors as `save_csv_data` for invalid data or unwritable paths."""
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("The `data` parameter must be a pandas DataFrame.")
+
+    directory = os.path.dirname(file_path)
+    if directory and not os.access(directory, os.W_OK):
+        raise PermissionError(f"The directory '{directory}' is not writable.")
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+
+def score_batch(model, batch):
+    """
+    Predict the label and positive-class probability of each row of `batch`.
+
+    The probabilities come from a single pass through the model; the labels
+    are derived from them (the positive class when its probability is over
+    0.5, as `predict` does for a logistic model) rather than from a second
+    pass with `predict`.
+
+    Rows with a missing or non-finite feature value cannot be scored: they
+    are marked False in the 'valid' column and their prediction is left
+    empty, so they are not mistaken for negative predictions.
+
+    Parameters:
+    -----------
+    model : src.fused_linear_kernel.FusedLinearModel
+        The fused model.
+    batch : pandas.DataFrame
+        The rows to score, with at least the feature columns of the model.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        The 'y_pred', 'y_pred_prob_1' and 'valid' columns, with the index of
+        `batch`. 'y_pred' has a nullable dtype, empty for the invalid rows.
+    """
+    if not isinstance(batch, pd.DataFrame):
+        raise TypeError("The `batch` parameter must be a pandas DataFrame.")
+    if model.feature_names is not None:
+        batch = batch[list(model.feature_names)]
+    valid = np.isfinite(batch.to_numpy(dtype=np.float64, na_value=np.nan)).all(axis=1)
+
+    y_pred_prob_1 = np.full(len(batch), np.nan)
+    if valid.any():
+        y_pred_prob_1[valid] = model.predict_proba_1(batch[valid])
+    y_pred = pd.Series(model.classes_[(y_pred_prob_1 > 0.5).astype(int)], index=batch.index)
+    y_pred = y_pred.convert_dtypes().mask(~valid)
+    return batch.iloc[:, :0].assign(y_pred=y_pred, y_pred_prob_1=y_pred_prob_1, valid=valid)
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import shutil
+import pickle
+import hashlib
+import inspect
+from importlib import metadata, util
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(obj):
+    """
+    Returns a sha256 hex digest of the content of `obj`.
+
+    DataFrames and Series are hashed row by row with their index, column
+    names and dtypes, NumPy arrays by their bytes, and plain Python values by
+    their repr. Any other object (e.g. a fitted model) is hashed by its pickle.
+    """
+    h = hashlib.sha256()
+    _update(h, obj)
+    return h.hexdigest()
+
+
+def _update(h, obj, known=None):
+    """
+    Feed the content of `obj` to the hash `h`. Objects in `known`, a dict
+    from `id(obj)` to `(obj, fingerprint)`, are hashed by that fingerprint.
+    """
+    if known is not None and id(obj) in known:
+        h.update(known[id(obj)][1].encode())
+        return
+    h.update(type(obj).__name__.encode())
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(repr(obj.columns.tolist() if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        h.update(repr(obj.dtypes.astype(str).tolist() if isinstance(obj, pd.DataFrame) else str(obj.dtype)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(str(len(obj)).encode())
+        for item in obj:
+            _update(h, item, known)
+    elif isinstance(obj, dict):
+        for name in sorted(obj, key=repr):
+            _update(h, name, known)
+            _update(h, obj[name], known)
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool)):
+        h.update(repr(obj).encode())
+    else:
+        h.update(pickle.dumps(obj, protocol=4))
+
+
+# Libraries whose version is part of every key, as upgrading them may change the results
+_LIBRARIES = ["numpy", "pandas", "scikit-learn", "scipy", "pandera", "deepchecks", "altair", "matplotlib"]
+
+
+def _environment():
+    """Versions of Python and of the libraries in `_LIBRARIES`, read without importing them."""
+    versions = [sys.version]
+    for library in _LIBRARIES:
+        try:
+            versions.append(f"{library}=={metadata.version(library)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{library} missing")
+    return repr(versions)
+
+
+def stage_key(function, args=(), kwargs=None, depends_on=(), known=None):
+    """
+    Returns the cache key of calling `function(*args, **kwargs)`: a sha256 of
+    the source of the function and of the modules or functions in
+    `depends_on`, the library versions, and the content of the arguments.
+    Arguments in `known` are hashed by their recorded fingerprint, see `_update`.
+
+    Modules in `depends_on` may be given by name, e.g. 'src.read_data', in
+    which case their source file is read without importing them.
+    """
+    h = hashlib.sha256()
+    h.update(f"{function.__module__}.{function.__qualname__}".encode())
+    for code in [function, *depends_on]:
+        h.update(_source(code).encode())
+    h.update(_environment().encode())
+    _update(h, list(args), known)
+    _update(h, dict(kwargs or {}), known)
+    return h.hexdigest()
+
+
+def _source(code):
+    """Returns the source of a function, a module, or a module given by name."""
+    if not isinstance(code, str):
+        return inspect.getsource(code)
+    spec = util.find_spec(code)
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(f"No module named '{code}'")
+    with open(spec.origin) as f:
+        return f.read()
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage results.
+
+    Each entry is a directory named by the `stage_key` of the call. It holds the
+    pickled return value of the stage and copies of the files the stage wrote.
+    On a hit the files are restored and the function is not called. When the
+    entries take more than `max_bytes`, the least recently used ones are
+    evicted.
+
+    The values returned by `run`, and their items when they are tuples or
+    lists, are fingerprinted by the key that produced them when passed to a
+    later stage. This avoids hashing large intermediate results again, and
+    fitted models, whose pickle may change across a save and load.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        Directory holding the cache entries. It is created if needed.
+    max_bytes : int, optional
+        Size cap of the cache. Unlimited when omitted.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("`max_bytes` must be a non-negative integer.")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = []
+        self.misses = []
+        # id of each value returned by `run` -> (value, fingerprint); the value
+        # is kept so that its id is not reused by another object
+        self._outputs = {}
+
+    def run(self, function, *args, stage=None, depends_on=(), output_files=(), **kwargs):
+        """
+        Returns `function(*args, **kwargs)`, from the cache if the same call
+        was cached before.
+
+        Parameters:
+        -----------
+        function : callable
+            The stage. It must return a picklable value.
+        stage : str, optional
+            Name of the stage recorded in `hits` and `misses`, by default the
+            name of the function.
+        depends_on : sequence of modules, module names or functions, optional
+            Code the stage relies on besides its own source, e.g. the module
+            of its helper functions.
+        output_files : sequence of str, optional
+            Files written by the stage, restored on a hit. Files that do not
+            exist after the stage ran are skipped.
+        """
+        key = stage_key(function, args, kwargs, depends_on, self._outputs)
+        entry = os.path.join(self.cache_dir, key)
+        stage = stage or function.__name__
+        if os.path.exists(os.path.join(entry, "manifest.json")):
+            self.hits.append(stage)
+            value = self._restore(entry)
+        else:
+            self.misses.append(stage)
+            value = function(*args, **kwargs)
+            self._store(entry, value, output_files)
+            self._evict(keep=entry)
+
+        self._outputs[id(value)] = (value, key)
+        if isinstance(value, (tuple, list)):
+            for i, item in enumerate(value):
+                self._outputs[id(item)] = (item, f"{key}[{i}]")
+        return value
+
+    def size(self):
+        """Total size in bytes of the cache entries."""
+        return sum(_entry_size(entry) for entry in self._entries())
+
+    def _entries(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if os.path.exists(os.path.join(self.cache_dir, name, "manifest.json"))]
+
+    def _restore(self, entry):
+        manifest_path = os.path.join(entry, "manifest.json")
+        with open(manifest_path) as f:
+            output_files = json.load(f)
+        for i, file_path in enumerate(output_files):
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            shutil.copyfile(os.path.join(entry, "files", str(i)), file_path)
+        with open(os.path.join(entry, "value.pkl"), "rb") as f:
+            value = pickle.load(f)
+        # the manifest's modification time records the last use, for eviction
+        os.utime(manifest_path)
+        return value
+
+    def _store(self, entry, value, output_files):
+        # build the entry next to its final place, so a crash never leaves a partial entry
+        tmp_entry = f"{entry}.tmp{os.getpid()}"
+        os.makedirs(os.path.join(tmp_entry, "files"))
+        try:
+            with open(os.path.join(tmp_entry, "value.pkl"), "wb") as f:
+                pickle.dump(value, f, protocol=4)
+            output_files = [file_path for file_path in output_files if os.path.exists(file_path)]
+            for i, file_path in enumerate(output_files):
+                shutil.copyfile(file_path, os.path.join(tmp_entry, "files", str(i)))
+            with open(os.path.join(tmp_entry, "manifest.json"), "w") as f:
+                json.dump(output_files, f)
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # e.g. another process stored the same entry first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def _evict(self, keep):
+        if self.max_bytes is None:
+            return
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((os.path.getmtime(os.path.join(entry, "manifest.json")), _entry_size(entry), entry))
+            except OSError:
+                # evicted meanwhile by a stage running in another thread or process
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            total -= size
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _entry_size(entry):
+    """Size in bytes of all the files of a cache entry."""
+    return sum(os.path.getsize(os.path.join(directory, name))
+               for directory, _, names in os.walk(entry) for name in names)
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class Result:
+    """
+    Placeholder for the result of stage `stage` in the arguments of a later
+    stage, or for its item `item` when the stage returns a tuple.
+    """
+
+    def __init__(self, stage, item=None):
+        self.stage = stage
+        self.item = item
+
+    def resolve(self, results):
+        result = results[self.stage]
+        return result if self.item is None else result[self.item]
+
+
+class StageScheduler:
+    """
+    Runs the stages of a pipeline on a thread pool of `max_workers` threads,
+    each stage as soon as the stages it depends on have finished.
+
+    A stage depends on the stages whose `Result` appears in its arguments,
+    and on the ones listed in its `after` argument. When a stage raises, no
+    new stage is started, the stages not started yet are cancelled, and the
+    exception is re-raised by `run` once the running stages have finished,
+    with a note naming the failed stage.
+
+    Parameters:
+    -----------
+    max_workers : int, optional, default 1
+        Number of stages run at the same time. With 1, the stages run one
+        after another in the order they were added.
+
+    Examples:
+    ---------
+    >>> scheduler = StageScheduler(max_workers=2)
+    >>> scheduler.add('data', read_data, 'data/raw/diabetes.csv')
+    >>> scheduler.add('summary', describe, Result('data'))
+    >>> results = scheduler.run()
+    """
+
+    def __init__(self, max_workers=1):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be at least 1.")
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name, function, *args, after=(), **kwargs):
+        """Adds the stage `name` calling `function(*args, **kwargs)`, with the `Result`s in the arguments resolved."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' was already added.")
+        dependencies = {arg.stage for arg in [*args, *kwargs.values()] if isinstance(arg, Result)} | set(after)
+        missing = [stage for stage in dependencies if stage not in self.stages]
+        if missing:
+            # stages can only depend on earlier stages, so the graph has no cycles
+            raise ValueError(f"Stage '{name}' depends on stage(s) not added before it: {', '.join(sorted(missing))}.")
+        self.stages[name] = (function, args, kwargs, dependencies)
+
+    def run(self):
+        """Runs every stage and returns their results, indexed by stage name."""
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while pending or running:
+                    # stages are started in the order they were added, once their dependencies are done
+                    for name, (function, args, kwargs, dependencies) in list(pending.items()):
+                        if len(running) >= self.max_workers:
+                            break
+                        if dependencies.issubset(results):
+                            del pending[name]
+                            args = [arg.resolve(results) if isinstance(arg, Result) else arg for arg in args]
+                            kwargs = {key: arg.resolve(results) if isinstance(arg, Result) else arg
+                                      for key, arg in kwargs.items()}
+                            running[executor.submit(function, *args, **kwargs)] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        try:
+                            results[name] = future.result()
+                        except BaseException as error:
+                            error.add_note(f"Raised by pipeline stage '{name}'.")
+                            raise
+            finally:
+                # the stages that were not started are cancelled, the running ones finish
+                executor.shutdown(cancel_futures=True)
+        return results
+
+
+def run_concurrently(tasks, max_workers=1):
+    """
+    Calls each function in `tasks` without arguments, on up to `max_workers`
+    threads, and returns their results in order. The first exception raised
+    by a task is re-raised, after cancelling the tasks not started yet.
+    """
+    scheduler = StageScheduler(max_workers)
+    for i, task in enumerate(tasks):
+        scheduler.add(i, task)
+    results = scheduler.run()
+    return [results[i] for i in range(len(tasks))]
@@ -2,8 +2,29 @@
 # author: Jessica Kuo
 # date: 2024-12-11
 
+import numpy as np
 import pandas as pd
 import pandera as pa
+from src.check_diabetes_rules import DIABETES_RULES, RULE_BITS
+
+
+def _column_schema(rule):
+    """Build the pandera column for one entry of `DIABETES_RULES`."""
+    if "isin" in rule:
+        check = pa.Check.isin(rule["isin"])
+    else:
+        check = pa.Check.between(*rule["between"])
+    return pa.Column(rule["dtype"], check, nullable=rule["nullable"])
+
+
+# Built once at import rather than on every call
+DIABETES_SCHEMA = pa.DataFrameSchema(
+    {col: _column_schema(rule) for col, rule in DIABETES_RULES.items()},
+    checks=[
+        pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
+        pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")
+    ]
+)
 
 def validate_diabetes_data(diabetes_dataframe):
     """
@@ -38,31 +59,47 @@ def validate_diabetes_data(diabetes_dataframe):
         - 'DiabetesPedigreeFunction': between 0 and 2.5, inclusive.
         - 'Age': between 18 and 90, inclusive.
         - Additionally, no duplicate rows and no completely empty rows are allowed.
+    The rules are defined in `src.check_diabetes_rules.DIABETES_RULES`; see
+    `check_diabetes_rules` for a faster, non-raising check of the same rules.
     """
     if not isinstance(diabetes_dataframe, pd.DataFrame):
         raise TypeError("Input must be a pandas DataFrame")    
     if diabetes_dataframe.empty:
         raise ValueError("Dataframe must contain observations.")
 
-    schema = pa.DataFrameSchema(
-        { 
-            "Outcome": pa.Column(int, pa.Check.isin([0, 1])),
-            "Pregnancies": pa.Column(int, pa.Check.between(0, 15), nullable=True),
-            "Glucose": pa.Column(int, pa.Check.between(50, 240), nullable=True),
-            "BloodPressure": pa.Column(int, pa.Check.between(40, 180), nullable=True),
-            "SkinThickness": pa.Column(int, pa.Check.between(0, 80), nullable=True),
-            "Insulin": pa.Column(int, pa.Check.between(0, 800), nullable=True),
-            "BMI": pa.Column(float, pa.Check.between(0, 65), nullable=True),
-            "DiabetesPedigreeFunction": pa.Column(float, pa.Check.between(0, 2.5), nullable=True),
-            "Age": pa.Column(int, pa.Check.between(18, 90), nullable=True),
-        },
-        checks=[
-            pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
-            pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")
-        ]
-    )
-
     # Validate the DataFrame. If it fails, pandera will raise a SchemaError.
-    schema.validate(diabetes_dataframe, lazy=True)
+    DIABETES_SCHEMA.validate(diabetes_dataframe, lazy=True)
+
+    return diabetes_dataframe
 
-    return diabetes_dataframe
\ No newline at end of file
+
+def flag_diabetes_data(diabetes_dataframe):
+    """
+    Validates the diabetes data against the pandera schema, like `validate_diabetes_data`, but
+    instead of raising returns for every row a bitmask of the column rules it failed.
+    Parameters
+    ----------
+    diabetes_dataframe : pandas.DataFrame
+        The DataFrame containing diabetes-related data.
+    Returns
+    -------
+    numpy.ndarray of uint16
+        Bitmask per row in the format of `src.check_diabetes_rules.flag_diabetes_rules`.
+        Failures that do not point at a row (column dtypes, duplicate rows) set no bits.
+    Raises
+    ------
+    TypeError
+        If the input is not a pandas DataFrame.
+    ValueError
+        If the DataFrame is empty.
+    """
+    failed_rules = np.zeros(len(diabetes_dataframe), dtype=np.uint16)
+    try:
+        validate_diabetes_data(diabetes_dataframe)
+    except pa.errors.SchemaErrors as e:
+        failure_cases = e.failure_cases.dropna(subset=["index"])
+        failure_cases = failure_cases[failure_cases["column"].isin(list(DIABETES_RULES))]
+        positions = diabetes_dataframe.index.get_indexer(failure_cases["index"])
+        bits = failure_cases["column"].map(RULE_BITS).to_numpy(dtype=np.uint16)
+        np.bitwise_or.at(failed_rules, positions, bits)
+    return failed_rules
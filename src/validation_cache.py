@@ -0,0 +1,139 @@
+import os
+import hashlib
+import inspect
+import numpy as np
+import pandas as pd
+from src.check_diabetes_rules import DIABETES_RULES, RULE_BITS, DUPLICATE_RULE
+from src.hash_split import row_hashes as hash_rows
+
+# Fingerprint of the validation rules and of the row hashing. Verdicts cached
+# under other rules, or keyed by other hashes, are stale, so a cache with a
+# different fingerprint is discarded on load.
+RULES_FINGERPRINT = hashlib.sha256((repr(DIABETES_RULES) + inspect.getsource(hash_rows)).encode()).hexdigest()
+
+
+class ValidationCache:
+    """
+    Persistent index of the rows already validated, keyed by a 64-bit hash of
+    each row, with the bitmask of the rules the row failed as its verdict.
+
+    Rows whose hash is in the index reuse the cached verdict, so only new
+    rows are validated. The same hashes are used to flag rows that
+    duplicate an earlier row of the data. Rows are hashed by their values
+    whatever the dtypes they were read with (see `src.hash_split.row_hashes`),
+    so a refreshed file whose columns infer other dtypes still hits the cache.
+
+    Parameters:
+    -----------
+    row_hashes : numpy.ndarray of uint64, optional
+        Hashes of the validated rows, sorted and unique.
+    failed_rules : numpy.ndarray of uint16, optional
+        Verdict of each row in `row_hashes`, in the format of
+        `src.check_diabetes_rules.flag_diabetes_rules` (0 for valid rows).
+    """
+
+    def __init__(self, row_hashes=None, failed_rules=None):
+        self.row_hashes = np.asarray(row_hashes if row_hashes is not None else [], dtype=np.uint64)
+        self.failed_rules = np.asarray(failed_rules if failed_rules is not None else [], dtype=np.uint16)
+        if self.row_hashes.shape != self.failed_rules.shape:
+            raise ValueError("`row_hashes` and `failed_rules` must have the same length.")
+
+    def __len__(self):
+        return len(self.row_hashes)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads a cache saved by `save`. A missing file, or one saved under
+        different validation rules, gives an empty cache.
+
+        Raises:
+        -------
+        IsADirectoryError
+            If `file_path` is a directory.
+        """
+        if os.path.isdir(file_path):
+            raise IsADirectoryError(f"The path '{file_path}' is a directory, not a file.")
+        if not os.path.exists(file_path):
+            return cls()
+        with np.load(file_path, allow_pickle=False) as cache:
+            if str(cache["rules_fingerprint"]) != RULES_FINGERPRINT:
+                return cls()
+            return cls(cache["row_hashes"], cache["failed_rules"])
+
+    def save(self, file_path):
+        """Saves the cache to an `.npz` file."""
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            raise FileNotFoundError(f"The directory '{directory}' does not exist.")
+        # write to a temporary file first, so an interrupted run keeps the old cache
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, row_hashes=self.row_hashes, failed_rules=self.failed_rules,
+                     rules_fingerprint=np.array(RULES_FINGERPRINT))
+        os.replace(tmp_path, file_path)
+
+    def lookup(self, row_hashes):
+        """
+        Returns the cached verdict of each hash, and a mask that is True
+        where the hash is in the cache (the verdict is 0 elsewhere).
+        """
+        row_hashes = np.asarray(row_hashes, dtype=np.uint64)
+        if len(self) == 0:
+            return np.zeros(len(row_hashes), dtype=np.uint16), np.zeros(len(row_hashes), dtype=bool)
+        # the cached hashes are sorted, so each lookup is a binary search
+        positions = np.minimum(np.searchsorted(self.row_hashes, row_hashes), len(self) - 1)
+        found = self.row_hashes[positions] == row_hashes
+        failed_rules = np.where(found, self.failed_rules[positions], 0).astype(np.uint16)
+        return failed_rules, found
+
+    def update(self, row_hashes, failed_rules):
+        """Adds the verdicts of new rows to the cache. Hashes already cached keep their verdict."""
+        row_hashes = np.asarray(row_hashes, dtype=np.uint64)
+        failed_rules = np.asarray(failed_rules, dtype=np.uint16)
+        all_hashes = np.concatenate([self.row_hashes, row_hashes])
+        all_failed_rules = np.concatenate([self.failed_rules, failed_rules])
+        # np.unique keeps the first occurrence, i.e. the cached verdict
+        self.row_hashes, first = np.unique(all_hashes, return_index=True)
+        self.failed_rules = all_failed_rules[first]
+
+    def flag_rows(self, diabetes_dataframe, flag_new_rows):
+        """
+        Returns the bitmask of the rules each row of `diabetes_dataframe`
+        failed, validating only the rows that are not in the cache.
+
+        A row that repeats an earlier row of `diabetes_dataframe` is flagged
+        as a duplicate. Otherwise its verdict comes from the cache, or from
+        `flag_new_rows`, which is called once on all the new rows and must
+        return their bitmasks without checking for duplicates, e.g.
+        `src.validate_diabetes_data.flag_diabetes_data`. The verdicts of the
+        new rows are added to the cache.
+
+        Parameters:
+        -----------
+        diabetes_dataframe : pd.DataFrame
+            The diabetes data to validate.
+        flag_new_rows : callable
+            Function from a DataFrame to a uint16 bitmask per row.
+
+        Returns:
+        --------
+        failed_rules : numpy.ndarray of uint16
+            Bitmask per row. Valid rows are 0.
+        n_validated : int
+            Number of rows passed to `flag_new_rows`.
+        """
+        if not isinstance(diabetes_dataframe, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame")
+
+        row_hashes = hash_rows(diabetes_dataframe)
+        duplicated = pd.Series(row_hashes).duplicated().to_numpy()
+
+        failed_rules, cached = self.lookup(row_hashes)
+        new = ~cached & ~duplicated
+        if new.any():
+            new_failed_rules = np.asarray(flag_new_rows(diabetes_dataframe[new]), dtype=np.uint16)
+            failed_rules[new] = new_failed_rules
+            self.update(row_hashes[new], new_failed_rules)
+        failed_rules[duplicated] = RULE_BITS[DUPLICATE_RULE]
+        return failed_rules, int(new.sum())
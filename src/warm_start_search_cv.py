@@ -0,0 +1,159 @@
+import time
+import numpy as np
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterSampler
+from sklearn.utils.parallel import Parallel, delayed
+from scipy.stats import rankdata
+from src.fold_cache import FoldCache
+
+
+class WarmStartSearchCV(BaseEstimator):
+    """
+    Randomized search of one hyperparameter of the final step of a pipeline,
+    fitted along a warm-started path.
+
+    The candidates are drawn like `RandomizedSearchCV` draws them, with
+    `ParameterSampler`, and evaluated on the same folds. The preprocessing
+    steps of the pipeline (e.g. the StandardScaler) are fitted once per fold,
+    by a `src.fold_cache.FoldCache`, and the final estimator is fitted for
+    the sorted candidate values one after another with `warm_start=True`,
+    each fit starting from the solution of the previous value. For a
+    LogisticRegression, sorting the C values follows the regularization path
+    from the most regularized model, so each fit only needs a few iterations.
+
+    The fitted object has the `cv_results_`, `best_index_`, `best_params_`,
+    `best_score_` and `best_estimator_` attributes of `RandomizedSearchCV`,
+    with the candidates in the order they were drawn.
+
+    Parameters:
+    -----------
+    estimator : sklearn.pipeline.Pipeline
+        Pipeline whose final step supports `warm_start`.
+    param_distributions : dict
+        Distribution or list of values of a single parameter of the final
+        step, e.g. {'logisticregression__C': loguniform(1e-5, 1e+5)}.
+    n_iter : int, optional, default 10
+        Number of candidates drawn.
+    cv : int or cross-validation generator, optional, default 5
+        Folds, as in `RandomizedSearchCV`.
+    scoring : str or callable, optional
+        Score of the candidates, the estimator's `score` method by default.
+    n_jobs : int, optional
+        Number of folds fitted in parallel.
+    refit : bool, optional, default True
+        Whether to fit `best_estimator_` on all the data.
+    random_state : int, optional
+        Seed of the candidate draws.
+    return_train_score : bool, optional, default False
+        Whether to include the training scores in `cv_results_`.
+    """
+
+    def __init__(self, estimator, param_distributions, n_iter=10, cv=5, scoring=None, n_jobs=None, refit=True,
+                 random_state=None, return_train_score=False):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.refit = refit
+        self.random_state = random_state
+        self.return_train_score = return_train_score
+
+    def fit(self, X, y, fold_cache=None):
+        """
+        Evaluate the candidates on each fold, and refit the best one on all of `X` and `y`.
+
+        `fold_cache` is a `src.fold_cache.FoldCache` of `X` and `y`, with the
+        preprocessing steps of `estimator`, shared with other models. It
+        replaces `cv`, and is computed from `cv` when omitted.
+        """
+        if len(self.param_distributions) != 1:
+            raise ValueError("`param_distributions` must have exactly one parameter.")
+        (param_name,) = self.param_distributions
+        step_name, _, step_param = param_name.partition("__")
+        final_step_name = self.estimator.steps[-1][0]
+        if step_name != final_step_name or not step_param:
+            raise ValueError(f"'{param_name}' is not a parameter of the final step '{final_step_name}'.")
+
+        candidates = list(ParameterSampler(self.param_distributions, self.n_iter, random_state=self.random_state))
+        values = [candidate[param_name] for candidate in candidates]
+        if fold_cache is None:
+            fold_cache = FoldCache(X, y, self.cv, preprocessing=self.estimator[:-1])
+        scorer = check_scoring(self.estimator, scoring=self.scoring)
+
+        folds = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_path)(self.estimator[-1], step_param, values, *fold_cache.fold(k),
+                               fold_cache.preprocessing_times[k], scorer, self.return_train_score)
+            for k in range(len(fold_cache))
+        )
+        self.cv_results_ = _format_results(param_name, candidates, folds, self.return_train_score)
+        self.best_index_ = int(self.cv_results_["rank_test_score"].argmin())
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = self.cv_results_["mean_test_score"][self.best_index_]
+        self.n_splits_ = len(folds)
+
+        if self.refit:
+            self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+            start = time.perf_counter()
+            self.best_estimator_.fit(X, y)
+            self.refit_time_ = time.perf_counter() - start
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.best_estimator_.predict_proba(X)
+
+    def score(self, X, y):
+        return self.best_estimator_.score(X, y)
+
+
+def _fit_path(final_step, param, values, X_train, X_test, y_train, y_test, preprocessing_time, scorer,
+              return_train_score):
+    """
+    Fit `final_step` on the preprocessed arrays of a fold for each value of
+    `param` in increasing order, warm-started. Returns the fit times, score
+    times, test scores and train scores (or None), in the order of `values`.
+    """
+    final_step = clone(final_step).set_params(warm_start=True)
+    n_values = len(values)
+    fit_times, score_times = np.zeros(n_values), np.zeros(n_values)
+    test_scores = np.zeros(n_values)
+    train_scores = np.zeros(n_values) if return_train_score else None
+    for i in sorted(range(n_values), key=lambda i: values[i]):
+        start = time.perf_counter()
+        final_step.set_params(**{param: values[i]}).fit(X_train, y_train)
+        # the preprocessing time is shared by all the candidates
+        fit_times[i] = time.perf_counter() - start + preprocessing_time / n_values
+        start = time.perf_counter()
+        test_scores[i] = scorer(final_step, X_test, y_test)
+        if return_train_score:
+            train_scores[i] = scorer(final_step, X_train, y_train)
+        score_times[i] = time.perf_counter() - start
+    return fit_times, score_times, test_scores, train_scores
+
+
+def _format_results(param_name, candidates, folds, return_train_score):
+    """The `cv_results_` dict of `RandomizedSearchCV`, from the results of `_fit_path` on each fold."""
+    fit_times, score_times, test_scores, train_scores = (np.array(result) for result in zip(*folds))
+    results = {
+        "mean_fit_time": fit_times.mean(axis=0),
+        "std_fit_time": fit_times.std(axis=0),
+        "mean_score_time": score_times.mean(axis=0),
+        "std_score_time": score_times.std(axis=0),
+        f"param_{param_name}": np.ma.MaskedArray([candidate[param_name] for candidate in candidates],
+                                                 mask=False, dtype=object),
+        "params": candidates,
+    }
+    splits = [("test", test_scores)] + ([("train", train_scores)] if return_train_score else [])
+    for split, scores in splits:
+        for k, fold_scores in enumerate(scores):
+            results[f"split{k}_{split}_score"] = fold_scores
+        results[f"mean_{split}_score"] = scores.mean(axis=0)
+        results[f"std_{split}_score"] = scores.std(axis=0)
+        if split == "test":
+            results["rank_test_score"] = rankdata(-results["mean_test_score"], method="min").astype(np.int32)
+    return results
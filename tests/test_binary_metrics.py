@@ -0,0 +1,118 @@
+import os
+import pytest
+import numpy as np
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.binary_metrics import binary_metrics, BinaryMetricsHistogram
+from sklearn.metrics import (accuracy_score, auc, average_precision_score, confusion_matrix, fbeta_score,
+                             precision_recall_curve, roc_curve)
+
+# Test setup
+rng = np.random.default_rng(123)
+y_true = rng.integers(0, 2, size=1000)
+y_prob = 1 / (1 + np.exp(-(2 * y_true - 1 + rng.normal(size=1000) * 2)))
+# probabilities with many ties
+y_prob_ties = np.round(y_prob, 1)
+
+
+def assert_same_as_sklearn(y_true, y_prob):
+    metrics = binary_metrics(y_true, y_prob)
+    y_pred = (y_prob > 0.5).astype(int)
+    np.testing.assert_array_equal(metrics.confusion_matrix, confusion_matrix(y_true, y_pred))
+    assert metrics.accuracy == accuracy_score(y_true, y_pred)
+    assert metrics.fbeta == fbeta_score(y_true, y_pred, beta=2)
+    precision, recall, thresholds = precision_recall_curve(y_true, y_prob)
+    np.testing.assert_array_equal(metrics.precision, precision)
+    np.testing.assert_array_equal(metrics.recall, recall)
+    np.testing.assert_array_equal(metrics.pr_thresholds, thresholds)
+    assert metrics.average_precision == average_precision_score(y_true, y_prob)
+    fpr, tpr, thresholds = roc_curve(y_true, y_prob)
+    np.testing.assert_array_equal(metrics.fpr, fpr)
+    np.testing.assert_array_equal(metrics.tpr, tpr)
+    np.testing.assert_array_equal(metrics.roc_thresholds, thresholds)
+    assert metrics.roc_auc == auc(fpr, tpr)
+    assert metrics.prevalence == y_true.mean()
+
+# Test: the same values as scikit-learn's metrics
+def test_same_as_sklearn():
+    assert_same_as_sklearn(y_true, y_prob)
+
+# Test: the same values with tied probabilities
+def test_ties():
+    assert_same_as_sklearn(y_true, y_prob_ties)
+
+# Test: no row predicted positive gives an F2 score of 0
+def test_no_predicted_positive():
+    metrics = binary_metrics(y_true, y_prob * 0.4)
+    assert metrics.fbeta == 0
+    assert metrics.confusion_matrix[:, 1].sum() == 0
+
+# Test: string labels, with the positive one given
+def test_string_labels():
+    labels = np.where(y_true == 1, "diabetic", "healthy")
+    metrics = binary_metrics(labels, y_prob, pos_label="diabetic")
+    assert metrics.accuracy == binary_metrics(y_true, y_prob).accuracy
+
+# Case: a single class
+def test_single_class():
+    with pytest.raises(ValueError):
+        binary_metrics(np.ones(10), np.linspace(0, 1, 10))
+
+# Case: lengths differ
+def test_different_lengths():
+    with pytest.raises(ValueError):
+        binary_metrics(y_true, y_prob[:-1])
+
+# Test: the histogram of chunks gives the exact confusion matrix and scores
+def test_histogram_exact_scores():
+    histogram = BinaryMetricsHistogram()
+    for start in range(0, 1000, 300):
+        histogram.update(y_true[start:start + 300], y_prob[start:start + 300])
+    metrics, expected = histogram.result(), binary_metrics(y_true, y_prob)
+    assert histogram.n_rows == 1000
+    np.testing.assert_array_equal(metrics.confusion_matrix, expected.confusion_matrix)
+    assert metrics.accuracy == expected.accuracy
+    assert metrics.fbeta == expected.fbeta
+    assert metrics.prevalence == expected.prevalence
+
+# Test: the curves are those of the probabilities rounded down to the bins
+def test_histogram_curves():
+    metrics = BinaryMetricsHistogram(n_bins=10).update(y_true, y_prob).result()
+    expected = binary_metrics(y_true, np.floor(y_prob * 10) / 10)
+    np.testing.assert_allclose(metrics.precision, expected.precision)
+    np.testing.assert_allclose(metrics.recall, expected.recall)
+    np.testing.assert_allclose(metrics.pr_thresholds, expected.pr_thresholds)
+    np.testing.assert_allclose(metrics.fpr, expected.fpr)
+    np.testing.assert_allclose(metrics.tpr, expected.tpr)
+    assert metrics.roc_auc == pytest.approx(expected.roc_auc)
+    assert metrics.average_precision == pytest.approx(expected.average_precision)
+
+# Test: the fine default bins approximate the exact curves closely
+def test_histogram_approximation():
+    metrics, expected = BinaryMetricsHistogram().update(y_true, y_prob).result(), binary_metrics(y_true, y_prob)
+    assert metrics.roc_auc == pytest.approx(expected.roc_auc, abs=1e-3)
+    assert metrics.average_precision == pytest.approx(expected.average_precision, abs=1e-3)
+
+# Test: merging the histograms of workers is the same as one histogram of all the rows
+def test_histogram_merge():
+    first = BinaryMetricsHistogram().update(y_true[:400], y_prob[:400])
+    second = BinaryMetricsHistogram().update(y_true[400:], y_prob[400:])
+    whole = BinaryMetricsHistogram().update(y_true, y_prob)
+    merged = first.merge(second)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_array_equal(merged.predicted_positive, whole.predicted_positive)
+
+# Case: merging histograms with other bins
+def test_histogram_merge_other_bins():
+    with pytest.raises(ValueError):
+        BinaryMetricsHistogram(n_bins=10).merge(BinaryMetricsHistogram(n_bins=20))
+
+# Case: a single class accumulated
+def test_histogram_single_class():
+    with pytest.raises(ValueError):
+        BinaryMetricsHistogram().update(np.ones(10), np.linspace(0, 1, 10)).result()
+
+# Case: invalid number of bins
+def test_histogram_invalid_bins():
+    with pytest.raises(ValueError):
+        BinaryMetricsHistogram(n_bins=0)
@@ -0,0 +1,138 @@
+import pytest
+import os
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.check_diabetes_rules import (
+    check_diabetes_rules,
+    flag_diabetes_rules,
+    decode_failed_rules,
+    count_failed_rules,
+    DIABETES_RULES,
+    RULE_BITS
+)
+
+
+# Valid data example
+valid_data = pd.DataFrame({
+    "Outcome": [0, 1, 0],
+    "Pregnancies": [0, 5, np.nan],
+    "Glucose": [70, np.nan, 240],
+    "BloodPressure": [80, 120, np.nan],
+    "SkinThickness": [20, np.nan, 80],
+    "Insulin": [np.nan, 250, 800],
+    "BMI": [22.5, 35.1, np.nan],
+    "DiabetesPedigreeFunction": [0.2, np.nan, 2.5],
+    "Age": [25, np.nan, 90],
+})
+
+# Case: valid data passes every rule
+def test_check_valid_data():
+    valid, violation_counts = check_diabetes_rules(valid_data)
+    assert valid.tolist() == [True, True, True]
+    assert (violation_counts == 0).all()
+    assert list(violation_counts.index) == list(DIABETES_RULES) + ["duplicate_rows", "empty_rows"]
+
+# Case: wrong type passed to function
+def test_check_data_type():
+    with pytest.raises(TypeError):
+        check_diabetes_rules(valid_data.to_numpy())
+
+# Case: empty data frame
+def test_check_empty_data_frame():
+    with pytest.raises(ValueError):
+        check_diabetes_rules(valid_data.iloc[0:0])
+
+# Case: missing columns (one for each column)
+@pytest.mark.parametrize("col", valid_data.columns)
+def test_check_missing_column(col):
+    with pytest.raises(ValueError, match=f"Column\\(s\\) missing from the diabetes data: {col}."):
+        check_diabetes_rules(valid_data.drop(col, axis=1))
+
+# Cases: one value too large or too small in each column is flagged on its row only
+out_of_range_cases = []
+for col, rule in DIABETES_RULES.items():
+    lower, upper = (min(rule["isin"]), max(rule["isin"])) if "isin" in rule else rule["between"]
+    out_of_range_cases += [(col, upper + 10), (col, lower - 10)]
+
+@pytest.mark.parametrize("col, value", out_of_range_cases)
+def test_check_out_of_range(col, value):
+    data = valid_data.copy()
+    data.loc[1, col] = value
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [True, False, True]
+    assert violation_counts[col] == 1
+    assert violation_counts.drop(col).sum() == 0
+
+# Case: 'Outcome' must be 0 or 1 and cannot be missing
+@pytest.mark.parametrize("value", [0.5, np.nan])
+def test_check_outcome_isin(value):
+    data = valid_data.astype({"Outcome": float})
+    data.loc[0, "Outcome"] = value
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [False, True, True]
+    assert violation_counts["Outcome"] == 1
+
+# Case: values that are not numbers fail the rule of their column
+def test_check_non_numeric_values():
+    data = valid_data.copy().astype({"Glucose": object})
+    data.loc[0, "Glucose"] = "high"
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [False, True, True]
+    assert violation_counts["Glucose"] == 1
+
+# Case: duplicate observations keep the first occurrence
+def test_check_duplicates():
+    data = pd.concat([valid_data, valid_data.iloc[[0], :]], ignore_index=True)
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [True, True, True, False]
+    assert violation_counts["duplicate_rows"] == 1
+
+    valid, violation_counts = check_diabetes_rules(data, check_duplicates=False)
+    assert valid.all()
+    assert violation_counts["duplicate_rows"] == 0
+
+# Case: entire missing observation
+def test_check_empty_rows():
+    nan_row = pd.DataFrame([[np.nan] * valid_data.shape[1]], columns=valid_data.columns)
+    data = pd.concat([valid_data, nan_row], ignore_index=True)
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [True, True, True, False]
+    assert violation_counts["empty_rows"] == 1
+    assert violation_counts["Outcome"] == 1
+
+# Case: compact nullable dtypes are checked like the inferred ones
+def test_check_nullable_dtypes():
+    data = valid_data.astype({"Glucose": "Int16", "BMI": "Float32"})
+    data.loc[0, "Glucose"] = 300
+    valid, violation_counts = check_diabetes_rules(data)
+    assert valid.tolist() == [False, True, True]
+    assert violation_counts["Glucose"] == 1
+
+# Case: each row gets a bitmask of every rule it failed
+def test_flag_rules_bitmask():
+    data = pd.concat([valid_data, valid_data.iloc[[0], :]], ignore_index=True)
+    data.loc[1, "Glucose"] = 10
+    data.loc[1, "Age"] = 100
+    failed_rules, violation_counts = flag_diabetes_rules(data)
+    assert failed_rules.dtype == np.uint16
+    assert failed_rules.tolist() == [0, RULE_BITS["Glucose"] | RULE_BITS["Age"], 0, RULE_BITS["duplicate_rows"]]
+    assert decode_failed_rules(failed_rules[1]) == ["Glucose", "Age"]
+    assert decode_failed_rules(failed_rules[0]) == []
+    assert violation_counts[["Glucose", "Age", "duplicate_rows"]].tolist() == [1, 1, 1]
+
+# Case: the boolean mask of check_diabetes_rules matches the bitmask
+def test_flag_rules_matches_check_rules():
+    data = valid_data.copy()
+    data.loc[2, "BMI"] = 70
+    failed_rules, _ = flag_diabetes_rules(data)
+    valid, _ = check_diabetes_rules(data)
+    assert (valid == (failed_rules == 0)).all()
+
+# Case: counting a bitmask gives the violation counts of flag_diabetes_rules
+def test_count_failed_rules():
+    data = pd.concat([valid_data, valid_data.iloc[[0], :]], ignore_index=True)
+    data.loc[1, "Glucose"] = 10
+    failed_rules, violation_counts = flag_diabetes_rules(data)
+    pd.testing.assert_series_equal(count_failed_rules(failed_rules), violation_counts, check_dtype=False)
@@ -109,4 +109,47 @@ for col in numeric_feats:
 def test_mixed_dtype_warning(warning_data, description):
     # Warning should be raised as rare data type is in dangerous zone of 1% to 20%
     with pytest.warns(UserWarning, match=description):
-        data_deepchecks(warning_data)
\ No newline at end of file
+        data_deepchecks(warning_data)
+
+# Test: a report with the outcome and timing of every check is returned
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_report_timings():
+    report = data_deepchecks(valid_data)
+    assert report.passed
+    assert report.n_rows == report.n_sample_rows == len(valid_data)
+    assert len(report.checks) == 7
+    assert (report.timings >= 0).all()
+    assert not any(check.on_sample for check in report.checks)
+
+# Test: with sample_size, only the outlier and feature-label checks run on a sample
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_sample_size():
+    large_data = pd.DataFrame({col: np.random.permutation(np.tile(valid_data[col].to_numpy(), 3)) for col in valid_data.columns})
+    report = data_deepchecks(large_data, sample_size=120)
+    assert report.n_rows == 300
+    assert report.n_sample_rows == 120
+    assert [check.name for check in report.checks if check.on_sample] == ["outlier_samples", "feature_label_correlation"]
+
+    # samples smaller than the outlier check allows are enlarged
+    report = data_deepchecks(large_data, sample_size=10)
+    assert report.n_sample_rows == 100
+
+# Test: without raising, every check runs and the failures are reported
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_no_raise_reports_failures():
+    report = data_deepchecks(case_duplicate, raise_on_failure=False)
+    assert len(report.checks) == 7
+    assert [check.message for check in report.failures] == ["Data duplicates exceed the maximum acceptable threshold."]
+
+# Test: checks run concurrently raise the same first failure and warnings
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("invalid_data, description", [invalid_data_cases[0], invalid_data_cases[-1]])
+def test_n_jobs_invalid_data(invalid_data, description):
+    with pytest.raises(ValueError, match=description):
+        data_deepchecks(invalid_data, n_jobs=4)
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_n_jobs_warning():
+    warning_data, description = warning_data_cases[0]
+    with pytest.warns(UserWarning, match=description):
+        data_deepchecks(warning_data, n_jobs=4)
@@ -0,0 +1,55 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fold_cache import FoldCache
+from src.warm_start_search_cv import WarmStartSearchCV
+from sklearn.dummy import DummyClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from scipy.stats import loguniform
+
+# Test setup
+rng = np.random.default_rng(123)
+X = pd.DataFrame(rng.normal(size=(200, 3)) * [1, 10, 100], columns=["a", "b", "c"])
+y = pd.Series((X["a"] + rng.normal(size=200) > 0.5).astype(int))
+
+# Test: same folds as StratifiedKFold, standardized with a scaler fitted on the training rows
+def test_folds_standardized():
+    fold_cache = FoldCache(X, y, cv=5, preprocessing=StandardScaler())
+    assert len(fold_cache) == fold_cache.get_n_splits() == 5
+    for k, (train, test) in enumerate(StratifiedKFold(5).split(X, y)):
+        cached_train, cached_test = list(fold_cache.split())[k]
+        np.testing.assert_array_equal(cached_train, train)
+        np.testing.assert_array_equal(cached_test, test)
+        scaler = StandardScaler().fit(X.iloc[train])
+        X_train, X_test, y_train, y_test = fold_cache.fold(k)
+        np.testing.assert_array_equal(X_train, scaler.transform(X.iloc[train]))
+        np.testing.assert_array_equal(X_test, scaler.transform(X.iloc[test]))
+        np.testing.assert_array_equal(y_test, y.iloc[test])
+
+# Test: passed as `cv`, the cache splits the rows like scikit-learn's 5 folds
+def test_cross_val_score():
+    fold_cache = FoldCache(X.to_numpy(), y.to_numpy(), cv=5)
+    dummy = DummyClassifier(strategy="most_frequent")
+    np.testing.assert_array_equal(cross_val_score(dummy, X, y, cv=fold_cache), cross_val_score(dummy, X, y, cv=5))
+
+# Test: memory-mapped arrays, shared with the warm-start search
+def test_memmap_shared_with_search(tmp_path):
+    fold_cache = FoldCache(X, y, cv=3, preprocessing=StandardScaler(), memmap_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 12
+    assert isinstance(fold_cache.fold(0)[0], np.memmap)
+    pipe = make_pipeline(StandardScaler(), LogisticRegression(random_state=123))
+    param_dist = {"logisticregression__C": loguniform(1e-5, 1e+5)}
+    search = WarmStartSearchCV(pipe, param_dist, n_iter=5, cv=3, random_state=0)
+    cached_fit = search.fit(X, y, fold_cache=fold_cache).cv_results_
+    np.testing.assert_allclose(cached_fit["mean_test_score"], search.fit(X, y).cv_results_["mean_test_score"])
+
+# Case: memory-map directory that does not exist
+def test_missing_memmap_dir():
+    with pytest.raises(FileNotFoundError):
+        FoldCache(X, y, memmap_dir="no_such_directory")
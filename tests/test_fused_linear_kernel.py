@@ -0,0 +1,60 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fused_linear_kernel import FusedLinearModel
+from src.linear_model_artifact import LinearModel, linear_model_arrays
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Test setup
+rng = np.random.default_rng(123)
+X = pd.DataFrame(rng.normal(size=(300, 4)) * [1, 10, 100, 0.1] + [0, 50, 500, 1], columns=["a", "b", "c", "d"])
+y = pd.Series((X["a"] + X["b"] / 10 - 5 + rng.normal(size=300) > 0).astype(int))
+pipe = make_pipeline(StandardScaler(), LogisticRegression()).fit(X, y)
+
+# Test: the fused weights give the probabilities and labels of the pipeline
+def test_same_as_pipeline():
+    fused = FusedLinearModel.from_model(pipe)
+    np.testing.assert_allclose(fused.predict_proba(X), pipe.predict_proba(X), rtol=1e-10)
+    np.testing.assert_allclose(fused.decision_function(X), pipe.decision_function(X), rtol=1e-10, atol=1e-12)
+    np.testing.assert_array_equal(fused.predict(X), pipe.predict(X))
+    assert list(fused.feature_names) == ["a", "b", "c", "d"]
+
+# Test: fused from a LinearModel, scoring a single row
+def test_from_linear_model_single_row():
+    fused = FusedLinearModel.from_model(LinearModel(**linear_model_arrays(pipe)))
+    np.testing.assert_allclose(fused.predict_proba_1(X.to_numpy()[0]), pipe.predict_proba(X.iloc[:1])[0, 1])
+
+# Test: float32 features are scored in float32, close to the float64 probabilities
+def test_float32():
+    fused = FusedLinearModel.from_model(pipe)
+    probabilities = fused.predict_proba_1(X.to_numpy(dtype=np.float32))
+    assert probabilities.dtype == np.float32
+    np.testing.assert_allclose(probabilities, pipe.predict_proba(X)[:, 1], rtol=1e-5, atol=1e-6)
+    assert fused.predict_proba_1(X, dtype=np.float32).dtype == np.float32
+    assert fused.predict_proba_1(X.to_numpy(dtype=np.int64)).dtype == np.float64
+
+# Test: the result is written to the `out` buffer, which can be reused
+def test_out_buffer():
+    fused = FusedLinearModel.from_model(pipe)
+    out = np.empty(100)
+    for start in range(0, len(X), 100):
+        result = fused.predict_proba_1(X.to_numpy()[start:start + 100], out=out)
+        assert result is out
+        np.testing.assert_allclose(out, pipe.predict_proba(X.iloc[start:start + 100])[:, 1], rtol=1e-10)
+
+# Test: extreme rows give probabilities of 0 and 1 without warnings
+def test_extreme_rows():
+    fused = FusedLinearModel.from_model(pipe)
+    extreme = np.array([[-1e6, -1e6, 0, 0], [1e6, 1e6, 0, 0]])
+    with np.errstate(over="raise"):
+        np.testing.assert_array_equal(fused.predict_proba_1(extreme), [0, 1])
+
+# Case: dtype other than float32 and float64
+def test_unsupported_dtype():
+    with pytest.raises(ValueError):
+        FusedLinearModel.from_model(pipe).predict_proba_1(X, dtype=np.float16)
@@ -0,0 +1,117 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.hash_split import HashSplitter, STRATIFY_BLOCK_SIZE, row_hashes
+from src.read_data import read_data
+
+# Test setup
+rng = np.random.default_rng(0)
+n_rows = 1000
+test_df = pd.DataFrame({
+    "Glucose": rng.integers(50, 240, n_rows),
+    "BMI": rng.uniform(15, 60, n_rows).round(1),
+    "Age": rng.integers(18, 90, n_rows),
+    "Outcome": (rng.uniform(size=n_rows) < 0.3).astype(int),
+})
+
+def chunked_mask(splitter, data, chunksize):
+    return np.concatenate([splitter.train_mask(data.iloc[i:i + chunksize]) for i in range(0, len(data), chunksize)])
+
+# Test: the train fraction is close to train_size
+def test_train_fraction():
+    train = HashSplitter(train_size=0.7).train_mask(test_df)
+    assert train.dtype == bool
+    assert abs(train.mean() - 0.7) < 0.05
+
+# Test: the split does not depend on the chunk size
+@pytest.mark.parametrize("stratify", [False, True])
+def test_chunk_size_independent(stratify):
+    train = HashSplitter(stratify=stratify).train_mask(test_df)
+    for chunksize in [1, 37, 500]:
+        assert (chunked_mask(HashSplitter(stratify=stratify), test_df, chunksize) == train).all()
+
+# Test: the split depends on the seed only, not on the dtypes the data was read with
+def test_seed_and_dtypes():
+    train = HashSplitter(random_state=123).train_mask(test_df)
+    assert (HashSplitter(random_state=123).train_mask(test_df) == train).all()
+    assert not (HashSplitter(random_state=124).train_mask(test_df) == train).all()
+    nullable = test_df.astype({"Glucose": "Int16", "BMI": "Float32", "Age": "Int8", "Outcome": "Int8"})
+    assert (HashSplitter(random_state=123).train_mask(nullable) == train).all()
+
+# Test: a row is split by its values, wherever it is
+def test_row_order_independent():
+    train = HashSplitter().train_mask(test_df)
+    shuffled = rng.permutation(n_rows)
+    assert (HashSplitter().train_mask(test_df.iloc[shuffled]) == train[shuffled]).all()
+
+# Test: each class has the train fraction of each full block
+def test_stratified_fraction():
+    splitter = HashSplitter(train_size=0.7, stratify=True)
+    train = splitter.train_mask(test_df)
+    for outcome in [0, 1]:
+        in_class = (test_df["Outcome"] == outcome).to_numpy()
+        n_full = in_class.sum() // STRATIFY_BLOCK_SIZE * STRATIFY_BLOCK_SIZE
+        assert train[in_class][:n_full].sum() == round(0.7 * n_full)
+    assert splitter.class_counts == test_df["Outcome"].value_counts().to_dict()
+
+# Test: train sizes that are not a whole number of rows per block are carried over across blocks
+@pytest.mark.parametrize("train_size", [0.004, 0.123, 0.996])
+def test_stratified_fractional_rows_per_block(train_size):
+    data = pd.concat([test_df] * 5, ignore_index=True)
+    train = HashSplitter(train_size=train_size, stratify=True).train_mask(data)
+    for outcome in [0, 1]:
+        in_class = (data["Outcome"] == outcome).to_numpy()
+        n_full = in_class.sum() // STRATIFY_BLOCK_SIZE * STRATIFY_BLOCK_SIZE
+        assert train[in_class][:n_full].sum() == int(round(train_size * n_full, 6))
+    assert (chunked_mask(HashSplitter(train_size=train_size, stratify=True), data, 37) == train).all()
+
+# Test: split returns the train and test rows
+def test_split():
+    train, test = HashSplitter().split(test_df)
+    assert len(train) + len(test) == n_rows
+    assert train.index.intersection(test.index).empty
+
+# Case: train_size out of range
+@pytest.mark.parametrize("train_size", [0, 1, 1.5])
+def test_invalid_train_size(train_size):
+    with pytest.raises(ValueError):
+        HashSplitter(train_size=train_size)
+
+# Case: stratifying without the label column, or with missing labels
+def test_stratify_invalid_label():
+    with pytest.raises(ValueError):
+        HashSplitter(stratify=True).train_mask(test_df.drop(columns="Outcome"))
+    with pytest.raises(ValueError):
+        HashSplitter(stratify=True).train_mask(test_df.astype({"Outcome": "Int8"}).assign(Outcome=pd.NA))
+
+# Case: not a DataFrame
+def test_not_dataframe():
+    with pytest.raises(TypeError):
+        HashSplitter().train_mask(test_df.to_numpy())
+
+# Test: a row read in chunks that infer different dtypes (int, then float because of a blank) has one hash
+def test_row_hashes_chunks_with_different_dtypes(tmp_path):
+    file_path = os.path.join(tmp_path, "chunks.csv")
+    pd.DataFrame({"Glucose": ["148", "85", "", "148"], "BMI": ["33.6", "26.6", "30.1", "33.6"],
+                  "Age": ["50", "31", "40", "50"]}).to_csv(file_path, index=False)
+    first, second = read_data(file_path, chunksize=2)
+    assert first["Glucose"].dtype != second["Glucose"].dtype
+    assert row_hashes(second)[1] == row_hashes(first)[0]
+    assert row_hashes(second)[0] != row_hashes(first)[1]
+
+# Test: numbers hash alike in any dtype or as text, and other text by its value
+def test_row_hashes_dtypes_and_text():
+    data = pd.DataFrame({"Glucose": [148, 85], "BMI": [33.6, 26.6]})
+    hashes = row_hashes(data)
+    assert (row_hashes(data.astype({"Glucose": "Int16", "BMI": "Float32"})) == hashes).all()
+    assert (row_hashes(data.astype(str)) == hashes).all()
+    malformed = data.astype(object)
+    malformed.loc[1, "Glucose"] = "abc"
+    other = data.astype(object)
+    other.loc[1, "Glucose"] = "xyz"
+    assert row_hashes(malformed)[0] == hashes[0]
+    assert len({row_hashes(malformed)[1], row_hashes(other)[1], hashes[1]}) == 3
+    assert row_hashes(malformed)[1] != row_hashes(data.assign(Glucose=[148, None]))[1]
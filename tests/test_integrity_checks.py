@@ -0,0 +1,84 @@
+import warnings
+for warning_type in [FutureWarning, DeprecationWarning]:
+    warnings.filterwarnings("ignore", category=warning_type)
+
+import pytest
+import os
+import sys
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.integrity_checks import integrity_checks, class_ratio, null_ratios, duplicate_ratio, correlated_pairs, INTEGRITY_CHECKS
+from src.data_deepchecks import data_deepchecks
+
+# Generate a dataset with 100 samples
+np.random.seed(123)
+valid_data = pd.DataFrame({
+    'Pregnancies': np.random.randint(0, 15, size=100),
+    'Glucose': np.random.randint(50, 240, size=100),
+    'BloodPressure': np.random.randint(40, 180, size=100),
+    'SkinThickness': np.random.randint(0, 80, size=100),
+    'Insulin': np.random.randint(0, 800, size=100),
+    'BMI': np.random.uniform(0, 65, size=100),
+    'DiabetesPedigreeFunction': np.random.uniform(0, 2.5, size=100),
+    'Age': np.random.randint(18, 90, size=100),
+    'Outcome': np.random.choice([0, 1], size=100)
+})
+
+# Cases around the thresholds, each breaking one check
+case_imbalanced = valid_data.assign(Outcome=[1] * 72 + [0] * 28)
+case_balanced_enough = valid_data.assign(Outcome=[1] * 70 + [0] * 30)
+case_nulls = valid_data.copy()
+case_nulls.loc[:5, 'Insulin'] = np.nan
+case_few_nulls = valid_data.copy()
+case_few_nulls.loc[:4, 'Insulin'] = np.nan
+case_duplicate = pd.concat([valid_data, valid_data.iloc[[0], :]], ignore_index=True)
+case_correlated = valid_data.assign(Age=valid_data['Glucose'] * 0.5)
+case_anticorrelated = valid_data.assign(Age=-valid_data['Glucose'])
+case_mixed_dtype = valid_data.astype({'Age': object})
+case_mixed_dtype.loc[:9, 'Age'] = 'string'
+all_cases = [valid_data, case_imbalanced, case_balanced_enough, case_nulls, case_few_nulls,
+             case_duplicate, case_correlated, case_anticorrelated, case_mixed_dtype]
+
+# Test: valid data passes every check
+def test_valid_data():
+    report = integrity_checks(valid_data)
+    assert report.passed
+    assert list(report.timings.index) == list(INTEGRITY_CHECKS)
+
+# Test: each check fails with the message used by data_deepchecks
+@pytest.mark.parametrize("data, description", [
+    (case_imbalanced, "Class imbalance exceeds the maximum acceptable threshold."),
+    (case_nulls, "Percent of nulls exceeds the maximum acceptable threshold for at least one column."),
+    (case_duplicate, "Data duplicates exceed the maximum acceptable threshold."),
+    (case_correlated, "Feature-feature correlation exceeds the maximum acceptable threshold."),
+])
+def test_failed_checks(data, description):
+    with pytest.raises(ValueError, match=description):
+        integrity_checks(data)
+    assert [check.message for check in integrity_checks(data, raise_on_failure=False).failures] == [description]
+
+# Test: the native checks agree with the deepchecks checks on every case
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("data", all_cases)
+def test_same_results_as_deepchecks(data):
+    native = integrity_checks(data, raise_on_failure=False)
+    full = data_deepchecks(data, raise_on_failure=False, full_report=True)
+    full_results = {check.name: check.passed for check in full.checks}
+    assert {check.name: check.passed for check in native.checks} == {name: full_results[name] for name in INTEGRITY_CHECKS}
+
+# Test: the statistics behind the checks
+def test_statistics():
+    assert class_ratio(case_imbalanced['Outcome']) == pytest.approx(0.28 / 0.72)
+    assert null_ratios(case_nulls)['Insulin'] == pytest.approx(0.06)
+    assert duplicate_ratio(case_duplicate) == pytest.approx(1 / 101)
+    assert correlated_pairs(case_correlated, ignore_columns=['Outcome']) == [('Glucose', 'Age')]
+    assert correlated_pairs(case_anticorrelated) == []
+
+# Test: wrong input type and empty data frame
+def test_errors():
+    with pytest.raises(TypeError):
+        integrity_checks(valid_data.to_numpy())
+    with pytest.raises(ValueError):
+        integrity_checks(valid_data.iloc[0:0])
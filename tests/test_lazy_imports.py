@@ -0,0 +1,32 @@
+import os
+import glob
+import subprocess
+import sys
+import pytest
+
+# Modules that take seconds to import and must only be imported by the
+# functions that use them, not by `<script> --help`
+HEAVY_MODULES = ["deepchecks", "altair", "altair_ally", "matplotlib", "sklearn", "scipy", "pandera"]
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+scripts = sorted(glob.glob(os.path.join(root_dir, "scripts", "*.py")))
+
+# Runs a script with --help and prints the heavy modules it imported
+check_code = """
+import runpy, sys
+script, heavy_modules = sys.argv[1], sys.argv[2:]
+sys.argv = [script, '--help']
+try:
+    runpy.run_path(script, run_name='__main__')
+except SystemExit:
+    pass
+print('imported:', *(name for name in heavy_modules if name in sys.modules))
+"""
+
+# Test: --help of each script does not import the heavy modules
+@pytest.mark.parametrize("script", scripts, ids=os.path.basename)
+def test_help_skips_heavy_imports(script):
+    result = subprocess.run([sys.executable, "-c", check_code, script, *HEAVY_MODULES],
+                            capture_output=True, text=True, cwd=root_dir)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == "imported:"
@@ -0,0 +1,75 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.linear_model_artifact import LinearModel, save_linear_model, load_linear_model, save_search_results
+from src.save_coeff_table import save_coefficients_table
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Test setup
+rng = np.random.default_rng(123)
+X = pd.DataFrame(rng.normal(size=(200, 3)) * [1, 10, 100] + [0, 5, 50], columns=["a", "b", "c"])
+y = pd.Series((X["a"] + rng.normal(size=200) > 0).astype(int))
+pipe = make_pipeline(StandardScaler(), LogisticRegression()).fit(X, y)
+
+# Test: the loaded model predicts like the pipeline it was saved from
+def test_same_predictions(tmp_path):
+    file_path = str(tmp_path / "model.npz")
+    save_linear_model(pipe, file_path)
+    model = load_linear_model(file_path)
+    assert isinstance(model, LinearModel)
+    np.testing.assert_allclose(model.predict_proba(X), pipe.predict_proba(X), rtol=1e-12)
+    np.testing.assert_array_equal(model.predict(X), pipe.predict(X))
+    assert model.score(X, y) == pipe.score(X, y)
+    np.testing.assert_array_equal(model.predict(X.to_numpy()), pipe.predict(X))
+
+# Test: the file holds arrays only, readable without pickle
+def test_no_pickle(tmp_path):
+    file_path = str(tmp_path / "model.npz")
+    save_linear_model(pipe, file_path)
+    with np.load(file_path, allow_pickle=False) as arrays:
+        assert set(arrays.files) == {"mean", "scale", "coef", "intercept", "classes", "feature_names"}
+        assert list(arrays["feature_names"]) == ["a", "b", "c"]
+
+# Test: SGD pipeline without centering, and the coefficient table of a loaded model
+def test_sgd_without_mean(tmp_path):
+    sgd_pipe = make_pipeline(StandardScaler(with_mean=False), SGDClassifier(loss="log_loss", random_state=0))
+    sgd_pipe.fit(X, y)
+    file_path = str(tmp_path / "model.npz")
+    save_linear_model(sgd_pipe, file_path)
+    model = load_linear_model(file_path)
+    np.testing.assert_allclose(model.predict_proba(X), sgd_pipe.predict_proba(X), rtol=1e-12)
+    coeff_df = save_coefficients_table(model, X, tmp_path)
+    assert sorted(coeff_df["Features"]) == ["a", "b", "c"]
+
+# Test: the search scores are saved without the 'params' column
+def test_save_search_results(tmp_path):
+    search = RandomizedSearchCV(make_pipeline(StandardScaler(), LogisticRegression()),
+                                {"logisticregression__C": [0.1, 1, 10]}, n_iter=3, cv=3, random_state=0).fit(X, y)
+    file_path = str(tmp_path / "cv_results.csv")
+    save_search_results(search, file_path)
+    cv_results = pd.read_csv(file_path)
+    assert "params" not in cv_results.columns
+    np.testing.assert_allclose(cv_results["mean_test_score"], search.cv_results_["mean_test_score"])
+
+# Case: columns in another order than the training features
+def test_wrong_columns(tmp_path):
+    file_path = str(tmp_path / "model.npz")
+    save_linear_model(pipe, file_path)
+    with pytest.raises(ValueError):
+        load_linear_model(file_path).predict(X[["c", "b", "a"]])
+
+# Case: pipeline without a scaler
+def test_pipeline_without_scaler(tmp_path):
+    with pytest.raises(ValueError):
+        save_linear_model(make_pipeline(LogisticRegression()).fit(X, y), str(tmp_path / "model.npz"))
+
+# Case: file does not exist
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        load_linear_model("no_such_model.npz")
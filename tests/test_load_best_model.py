@@ -0,0 +1,43 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.load_best_model import load_best_model
+from src.linear_model_artifact import LinearModel, save_linear_model
+from src.save_model import save_model
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Test setup
+rng = np.random.default_rng(123)
+X = pd.DataFrame(rng.normal(size=(100, 2)), columns=["a", "b"])
+y = pd.Series((X["a"] > 0).astype(int))
+pipe = make_pipeline(StandardScaler(), LogisticRegression()).fit(X, y)
+search = GridSearchCV(pipe, {"logisticregression__C": [0.1, 1.0]}, cv=3).fit(X, y)
+
+# Test: the arrays of an .npz file are loaded as a LinearModel
+def test_load_best_model_npz(tmp_path):
+    file_path = str(tmp_path / "best_model.npz")
+    save_linear_model(pipe, file_path)
+    model = load_best_model(file_path)
+    assert isinstance(model, LinearModel)
+    np.testing.assert_allclose(model.predict_proba(X), pipe.predict_proba(X), rtol=1e-12)
+
+# Test: a pickled search gives its best pipeline, and a pickled pipeline itself
+def test_load_best_model_pickle(tmp_path):
+    save_model(search, str(tmp_path / "random_fit.pkl"))
+    save_model(pipe, str(tmp_path / "log_pipe.pkl"))
+    best = load_best_model(str(tmp_path / "random_fit.pkl"))
+    assert best.get_params()["logisticregression__C"] == search.best_params_["logisticregression__C"]
+    np.testing.assert_array_equal(best.predict(X), search.predict(X))
+    np.testing.assert_array_equal(load_best_model(str(tmp_path / "log_pipe.pkl")).predict(X), pipe.predict(X))
+
+# Case: missing files
+@pytest.mark.parametrize("file_name", ["missing.npz", "missing.pkl"])
+def test_load_best_model_missing(tmp_path, file_name):
+    with pytest.raises(FileNotFoundError):
+        load_best_model(str(tmp_path / file_name))
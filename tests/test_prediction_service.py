@@ -0,0 +1,96 @@
+import os
+import asyncio
+import json
+import pytest
+import numpy as np
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fused_linear_kernel import FusedLinearModel
+from src.prediction_service import MicroBatcher, parse_row, respond
+
+# Test setup
+feature_names = np.array(["Glucose", "BMI", "Age"])
+model = FusedLinearModel(np.array([0.03, 0.08, 0.02]), -7.0, np.array([0, 1]), feature_names)
+row = [148.0, 33.6, 50.0]
+
+
+class CountingModel:
+    """Wraps `model`, recording the number of rows of each call to predict_proba_1."""
+    def __init__(self):
+        self.batch_sizes = []
+        self.weights, self.classes_, self.feature_names = model.weights, model.classes_, model.feature_names
+
+    def predict_proba_1(self, X):
+        self.batch_sizes.append(len(X))
+        return model.predict_proba_1(X)
+
+
+async def submit_all(batcher, rows):
+    return await asyncio.gather(*(batcher.submit(row) for row in rows))
+
+# Test: a JSON object by feature name and a list in column order give the same row
+def test_parse_row():
+    assert parse_row({"Age": 50, "BMI": 33.6, "Glucose": 148}, feature_names, 3) == row
+    assert parse_row([148, 33.6, 50], feature_names, 3) == row
+
+# Case: missing features, a list of the wrong length, or a value that is not a number
+@pytest.mark.parametrize("payload", [{"Glucose": 148, "BMI": 33.6}, [148, 33.6], "148", ["abc", 33.6, 50]])
+def test_parse_row_invalid(payload):
+    with pytest.raises(ValueError):
+        parse_row(payload, feature_names, 3)
+
+# Case: NaN and infinite values, which JSON allows
+@pytest.mark.parametrize("body", ["[NaN, 33.6, 50]", "[148, Infinity, 50]", '{"Glucose": -Infinity, "BMI": 1, "Age": 1}',
+                                  '["nan", 33.6, 50]'])
+def test_parse_row_not_finite(body):
+    with pytest.raises(ValueError):
+        parse_row(json.loads(body), feature_names, 3)
+
+# Test: rows submitted together are scored in one batch, with the probabilities of each row
+def test_micro_batcher_batches_concurrent_rows():
+    counting = CountingModel()
+    rows = [[100.0 + i, 30.0, 40.0] for i in range(5)]
+    probabilities = asyncio.run(submit_all(MicroBatcher(counting), rows))
+    assert counting.batch_sizes == [5]
+    np.testing.assert_allclose(probabilities, model.predict_proba_1(np.array(rows)))
+
+# Test: batches hold at most max_batch rows
+def test_micro_batcher_max_batch():
+    counting = CountingModel()
+    rows = [[100.0 + i, 30.0, 40.0] for i in range(5)]
+    probabilities = asyncio.run(submit_all(MicroBatcher(counting, max_batch=2), rows))
+    assert counting.batch_sizes == [2, 2, 1]
+    np.testing.assert_allclose(probabilities, model.predict_proba_1(np.array(rows)))
+
+# Test: rows submitted one after another are scored alone
+def test_micro_batcher_sequential_rows():
+    counting = CountingModel()
+
+    async def submit_one_by_one(batcher):
+        return [await batcher.submit(row), await batcher.submit(row)]
+
+    asyncio.run(submit_one_by_one(MicroBatcher(counting)))
+    assert counting.batch_sizes == [1, 1]
+
+# Test: the prediction and health routes
+def test_respond():
+    batcher = MicroBatcher(model)
+    status, response = asyncio.run(respond("POST", "/predict", json.dumps(row).encode(), batcher))
+    assert status == 200
+    assert response["y_pred_prob_1"] == pytest.approx(model.predict_proba_1(np.array(row)))
+    assert response["y_pred"] == int(response["y_pred_prob_1"] > 0.5)
+    json.dumps(response, allow_nan=False)
+    assert asyncio.run(respond("GET", "/health", b"", batcher)) == (200, {"status": "ok"})
+
+# Case: unknown routes, malformed JSON and non-finite values
+@pytest.mark.parametrize("method, path, body, expected_status", [
+    ("GET", "/predict", b"", 404),
+    ("POST", "/other", b"[1, 2, 3]", 404),
+    ("POST", "/predict", b"{not json", 400),
+    ("POST", "/predict", b"[NaN, 1, 1]", 400),
+    ("POST", "/predict", b"[1, 1]", 400),
+])
+def test_respond_errors(method, path, body, expected_status):
+    status, response = asyncio.run(respond(method, path, body, MicroBatcher(model)))
+    assert status == expected_status
+    assert "error" in response
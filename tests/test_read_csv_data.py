@@ -7,12 +7,13 @@ import os
 import pandas as pd
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_csv_data import read_csv_data
+from src.read_csv_data import read_csv_data, DIABETES_DTYPES
 
 # Test setup
 test_csv_path = 'tests/test_csv_data/test.csv'
 test_invalid_csv_path = 'tests/test_csv_data/test.txt'
 test_dir_path = 'tests/test_csv_data_dir'
+test_diabetes_csv_path = 'tests/test_csv_data/diabetes.csv'
 
 # Setup test directory and files
 if not os.path.exists('tests/test_csv_data'):
@@ -22,6 +23,20 @@ if not os.path.exists('tests/test_csv_data'):
 df = pd.DataFrame({'col1': [1, 2], 'col2': [3, 4]})
 df.to_csv(test_csv_path, index=False)
 
+# Create a CSV file with the diabetes columns for testing dtypes
+diabetes_df = pd.DataFrame({
+    'Pregnancies': [6, 1, 8, None, 0],
+    'Glucose': [148, 85, 183, 89, 137],
+    'BloodPressure': [72, 66, 64, 66, 40],
+    'SkinThickness': [35, 29, 0, 23, 35],
+    'Insulin': [0, 0, 0, 94, 168],
+    'BMI': [33.6, 26.6, 23.3, 28.1, 43.1],
+    'DiabetesPedigreeFunction': [0.627, 0.351, 0.672, 0.167, 2.288],
+    'Age': [50, 31, 32, 21, 33],
+    'Outcome': [1, 0, 1, 0, 1]
+})
+diabetes_df.to_csv(test_diabetes_csv_path, index=False)
+
 # Create a non-CSV file for testing
 with open(test_invalid_csv_path, 'w') as f:
     f.write("This is not a CSV file.")
@@ -54,6 +69,33 @@ def test_read_csv_data_invalid_file_type():
     with pytest.raises(ValueError, match=f"The file at '{test_invalid_csv_path}' is not a CSV file."):
         read_csv_data(test_invalid_csv_path)
 
+# Test that known dtypes are applied instead of inferred ones
+def test_read_csv_data_dtype():
+    data = read_csv_data(test_diabetes_csv_path, dtype=DIABETES_DTYPES)
+    for col, col_type in DIABETES_DTYPES.items():
+        assert data[col].dtype == col_type
+    assert data['Pregnancies'].isna().sum() == 1
+
+# Test that dtypes for columns missing from the file are ignored
+def test_read_csv_data_dtype_subset_of_columns():
+    data = read_csv_data(test_csv_path, dtype=DIABETES_DTYPES)
+    assert list(data.columns) == ['col1', 'col2']
+
+# Test that chunksize returns an iterator of chunks covering the whole file
+def test_read_csv_data_chunksize():
+    chunks = list(read_csv_data(test_diabetes_csv_path, dtype=DIABETES_DTYPES, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0]['Glucose'].dtype == 'Int16'
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks),
+        read_csv_data(test_diabetes_csv_path, dtype=DIABETES_DTYPES)
+    )
+
+# Test that ValueError is raised for an invalid chunksize
+def test_read_csv_data_invalid_chunksize():
+    with pytest.raises(ValueError, match="The `chunksize` parameter must be a positive integer."):
+        read_csv_data(test_csv_path, chunksize=0)
+
 
 # Clean up
 @pytest.fixture(scope="module", autouse=True)
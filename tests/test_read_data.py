@@ -0,0 +1,129 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import shutil
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.file_format import infer_file_format
+from src.read_data import read_data, zip_chunks
+from src.read_csv_data import DIABETES_DTYPES
+from src.save_data import save_data
+
+# Test setup
+test_dir = "tests/test_read_data_dir"
+test_df = pd.DataFrame({
+    'Glucose': pd.array([148, 85, None, 89, 137], dtype='Int16'),
+    'BMI': pd.array([33.6, 26.6, 23.3, 28.1, 43.1], dtype='Float32'),
+    'Outcome': pd.array([1, 0, 1, 0, 1], dtype='Int8')
+})
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_and_teardown():
+    os.makedirs(test_dir, exist_ok=True)
+    test_df.to_csv(os.path.join(test_dir, "test.csv"), index=False)
+    test_df.to_parquet(os.path.join(test_dir, "test.parquet"), index=False)
+    test_df.to_feather(os.path.join(test_dir, "test.feather"))
+    test_df.to_feather(os.path.join(test_dir, "test.arrow"))
+    save_data(test_df, os.path.join(test_dir, "test.npy"))
+    yield
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+
+# Test: format is inferred from the extension or taken from the argument
+@pytest.mark.parametrize("file_path, file_format, expected", [
+    ("data.csv", None, "csv"),
+    ("data.parquet", None, "parquet"),
+    ("data.feather", None, "feather"),
+    ("data.arrow", None, "feather"),
+    ("data.npy", None, "npy"),
+    ("data.bin", "parquet", "parquet"),
+])
+def test_infer_file_format(file_path, file_format, expected):
+    assert infer_file_format(file_path, file_format) == expected
+
+# Test: unknown extensions and formats raise ValueError
+def test_infer_file_format_unsupported():
+    with pytest.raises(ValueError, match="Cannot infer the file format of 'data.txt'."):
+        infer_file_format("data.txt")
+    with pytest.raises(ValueError, match="Unsupported file format 'xlsx'."):
+        infer_file_format("data.csv", "xlsx")
+
+# Test: binary formats are read back with their dtypes
+@pytest.mark.parametrize("file_name", ["test.parquet", "test.feather", "test.arrow"])
+def test_read_data_binary_keeps_dtypes(file_name):
+    data = read_data(os.path.join(test_dir, file_name))
+    pd.testing.assert_frame_equal(data, test_df)
+
+# Test: CSV files are read through read_csv_data, including the dtype option
+def test_read_data_csv():
+    data = read_data(os.path.join(test_dir, "test.csv"), dtype=DIABETES_DTYPES)
+    pd.testing.assert_frame_equal(data, test_df)
+
+# Test: binary formats can be read in chunks
+@pytest.mark.parametrize("file_name", ["test.parquet", "test.feather"])
+def test_read_data_binary_chunksize(file_name):
+    chunks = list(read_data(os.path.join(test_dir, file_name), chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), test_df)
+
+# Case: a Feather file written in several record batches, which the chunks straddle
+def test_read_data_feather_chunks_across_batches(tmp_path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    file_path = os.path.join(tmp_path, "batches.feather")
+    feather.write_feather(pa.Table.from_pandas(test_df), file_path, chunksize=2)
+    assert pa.ipc.open_file(file_path).num_record_batches == 3
+    chunks = list(read_data(file_path, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), test_df)
+
+# Test: FileNotFoundError is raised for a non-existent file
+def test_read_data_file_not_found():
+    with pytest.raises(FileNotFoundError, match="The file at 'non_existent.parquet' does not exist."):
+        read_data('non_existent.parquet')
+
+# Test: npy files are read back with their column names, as float64 with NaN for missing values
+def test_read_data_npy():
+    data = read_data(os.path.join(test_dir, "test.npy"))
+    pd.testing.assert_frame_equal(data, test_df.astype('float64'))
+    assert np.isnan(data.loc[2, 'Glucose'])
+
+# Test: npy files can be memory-mapped, and the DataFrame is a view on the mapped array
+def test_read_data_npy_mmap():
+    data = read_data(os.path.join(test_dir, "test.npy"), mmap_mode='r')
+    values = data.to_numpy()
+    while not isinstance(values, np.memmap) and values.base is not None:
+        values = values.base
+    assert isinstance(values, np.memmap)
+    pd.testing.assert_frame_equal(data, test_df.astype('float64'))
+
+# Test: npy files can be read in chunks
+def test_read_data_npy_chunksize():
+    chunks = list(read_data(os.path.join(test_dir, "test.npy"), chunksize=2, mmap_mode='r'))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+# Test: npy files read in chunks are memory-mapped without asking, not loaded at once
+def test_read_data_npy_chunksize_mmap():
+    chunk = next(read_data(os.path.join(test_dir, "test.npy"), chunksize=2))
+    values = chunk.to_numpy()
+    while not isinstance(values, np.memmap) and values.base is not None:
+        values = values.base
+    assert isinstance(values, np.memmap)
+
+# Test: chunks of features and labels are paired
+def test_zip_chunks():
+    X_chunks = [test_df.iloc[:2], test_df.iloc[2:]]
+    y_chunks = [test_df[['Outcome']].iloc[:2], test_df[['Outcome']].iloc[2:]]
+    pairs = list(zip_chunks(X_chunks, y_chunks))
+    assert [(len(X), len(y)) for X, y in pairs] == [(2, 2), (3, 3)]
+
+# Case: features and labels with different numbers of rows
+@pytest.mark.parametrize("y_chunks", [
+    [test_df.iloc[:2], test_df.iloc[2:4]],
+    [test_df.iloc[:2]],
+    [test_df.iloc[:2], test_df.iloc[2:], test_df.iloc[:1]],
+])
+def test_zip_chunks_different_lengths(y_chunks):
+    with pytest.raises(ValueError):
+        list(zip_chunks([test_df.iloc[:2], test_df.iloc[2:]], y_chunks))
@@ -37,6 +37,14 @@ def test_save_csv_data_success():
     loaded_df = pd.read_csv(test_csv_path)
     pd.testing.assert_frame_equal(loaded_df, test_df)
 
+# Test: Append rows to an existing file without repeating the header
+def test_save_csv_data_append():
+    save_csv_data(test_df.iloc[:2], test_csv_path)
+    save_csv_data(test_df.iloc[2:], test_csv_path, append=True)
+
+    loaded_df = pd.read_csv(test_csv_path)
+    pd.testing.assert_frame_equal(loaded_df, test_df)
+
 # Test: Raise TypeError for invalid data type
 def test_save_csv_data_type_error():
     with pytest.raises(TypeError, match="The `data` parameter must be a pandas DataFrame."):
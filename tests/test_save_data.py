@@ -0,0 +1,118 @@
+import os
+import json
+import pytest
+import numpy as np
+import pandas as pd
+import shutil
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.save_data import save_data, DataWriter
+
+# Test setup
+test_dir = "tests/test_save_data_dir"
+test_df = pd.DataFrame({
+    'Glucose': pd.array([148, 85, None, 89, 137], dtype='Int16'),
+    'BMI': pd.array([33.6, 26.6, 23.3, 28.1, 43.1], dtype='Float32'),
+    'Outcome': pd.array([1, 0, 1, 0, 1], dtype='Int8')
+})
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_and_teardown():
+    os.makedirs(test_dir, exist_ok=True)
+    yield
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+
+# Test: binary formats round-trip with their dtypes
+@pytest.mark.parametrize("file_name, reader", [
+    ("test.parquet", pd.read_parquet),
+    ("test.feather", pd.read_feather),
+    ("test.arrow", pd.read_feather),
+])
+def test_save_data_binary(file_name, reader):
+    file_path = os.path.join(test_dir, file_name)
+    save_data(test_df, file_path)
+    pd.testing.assert_frame_equal(reader(file_path), test_df)
+
+# Test: npy files hold the values in one array, with the column names in a sidecar file
+def test_save_data_npy():
+    file_path = os.path.join(test_dir, "test.npy")
+    save_data(test_df, file_path)
+    values = np.load(file_path)
+    assert values.dtype == np.float64
+    assert values.shape == test_df.shape
+    with open(os.path.join(test_dir, "test.columns.json")) as f:
+        assert json.load(f) == list(test_df.columns)
+
+# Test: npy files of a numpy integer column keep their dtype
+def test_save_data_npy_keeps_numpy_dtype():
+    file_path = os.path.join(test_dir, "y.npy")
+    save_data(pd.DataFrame({'Outcome': [0, 1, 1]}), file_path)
+    assert np.load(file_path).dtype == np.int64
+
+# Test: chunked writing to npy is not supported
+def test_data_writer_npy():
+    with pytest.raises(ValueError, match="Chunked writing is not supported for npy files."):
+        DataWriter(os.path.join(test_dir, "chunks.npy"))
+
+# Test: an explicit format overrides the extension
+def test_save_data_explicit_format():
+    file_path = os.path.join(test_dir, "test.data")
+    save_data(test_df, file_path, file_format="parquet")
+    pd.testing.assert_frame_equal(pd.read_parquet(file_path), test_df)
+
+# Test: CSV files are written through save_csv_data
+def test_save_data_csv():
+    file_path = os.path.join(test_dir, "test.csv")
+    save_data(test_df, file_path)
+    assert pd.read_csv(file_path).shape == test_df.shape
+
+# Test: Raise TypeError for invalid data type
+def test_save_data_type_error():
+    with pytest.raises(TypeError, match="The `data` parameter must be a pandas DataFrame."):
+        save_data([1, 2, 3], os.path.join(test_dir, "test.parquet"))
+
+# Test: Raise PermissionError for unwritable directory
+def test_save_data_permission_error():
+    with pytest.raises(PermissionError, match="The directory '/invalid' is not writable."):
+        save_data(test_df, "/invalid/test.parquet")
+
+# Test: DataWriter writes chunks that read back as one DataFrame
+@pytest.mark.parametrize("file_name, reader", [
+    ("chunks.csv", pd.read_csv),
+    ("chunks.parquet", pd.read_parquet),
+    ("chunks.feather", pd.read_feather),
+])
+def test_data_writer_chunks(file_name, reader):
+    file_path = os.path.join(test_dir, file_name)
+    with DataWriter(file_path) as writer:
+        writer.write(test_df.iloc[:2])
+        writer.write(test_df.iloc[2:])
+    loaded_df = reader(file_path)
+    assert loaded_df.shape == test_df.shape
+    if not file_name.endswith('.csv'):
+        pd.testing.assert_frame_equal(loaded_df, test_df)
+
+# Test: a malformed value in a later chunk is written when the columns are cast to strings
+@pytest.mark.parametrize("file_name, reader", [
+    ("raw_chunks.csv", lambda path: pd.read_csv(path, dtype=str)),
+    ("raw_chunks.parquet", pd.read_parquet),
+    ("raw_chunks.feather", pd.read_feather),
+])
+def test_data_writer_dtype_malformed_later_chunk(file_name, reader):
+    file_path = os.path.join(test_dir, file_name)
+    malformed_df = pd.DataFrame({'Glucose': ['abc'], 'BMI': ['33.6'], 'Outcome': [1]})
+    with DataWriter(file_path, dtype={'Glucose': 'string', 'BMI': 'string'}) as writer:
+        writer.write(test_df.iloc[:2])
+        writer.write(malformed_df)
+    loaded_df = reader(file_path)
+    assert loaded_df['Glucose'].tolist() == ['148', '85', 'abc']
+    assert loaded_df['BMI'].tolist() == ['33.6', '26.6', '33.6']
+
+# Case: without the cast, the first chunk's column types cannot hold the malformed value
+def test_data_writer_malformed_later_chunk_without_dtype():
+    import pyarrow as pa
+    with pytest.raises(pa.ArrowInvalid):
+        with DataWriter(os.path.join(test_dir, "typed_chunks.parquet")) as writer:
+            writer.write(test_df.iloc[:2])
+            writer.write(pd.DataFrame({'Glucose': ['abc'], 'BMI': [33.6], 'Outcome': [1]}))
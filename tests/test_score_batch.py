@@ -0,0 +1,61 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fused_linear_kernel import FusedLinearModel
+from src.score_batch import score_batch
+from src.save_data import DataWriter
+from src.read_data import read_data
+
+# Test setup
+feature_names = np.array(["Glucose", "BMI", "Age"])
+model = FusedLinearModel(np.array([0.03, 0.08, 0.02]), -7.0, np.array([0, 1]), feature_names)
+batch = pd.DataFrame({
+    "Outcome": [1, 0, 1, 0],
+    "Glucose": [148.0, 85.0, 183.0, 89.0],
+    "BMI": [33.6, 26.6, 23.3, 28.1],
+    "Age": [50.0, 31.0, 32.0, 21.0],
+}, index=[10, 11, 12, 13])
+
+# Test: probabilities and labels of the feature columns, with the index of the batch
+def test_score_batch():
+    scores = score_batch(model, batch)
+    expected = model.predict_proba_1(batch[list(feature_names)])
+    assert list(scores.columns) == ["y_pred", "y_pred_prob_1", "valid"]
+    assert list(scores.index) == [10, 11, 12, 13]
+    np.testing.assert_allclose(scores["y_pred_prob_1"], expected)
+    assert scores["y_pred"].tolist() == (expected > 0.5).astype(int).tolist()
+    assert scores["valid"].all()
+
+# Case: a missing and an infinite feature value are flagged invalid, with an empty prediction
+def test_score_batch_invalid_rows():
+    invalid = batch.astype({"Glucose": "Float64"})
+    invalid.loc[11, "Glucose"] = pd.NA
+    invalid.loc[13, "BMI"] = np.inf
+    scores = score_batch(model, invalid)
+    assert scores["valid"].tolist() == [True, False, True, False]
+    assert scores["y_pred"].isna().tolist() == [False, True, False, True]
+    assert scores["y_pred_prob_1"].isna().tolist() == [False, True, False, True]
+    np.testing.assert_allclose(scores["y_pred_prob_1"][[10, 12]], score_batch(model, batch)["y_pred_prob_1"][[10, 12]])
+
+# Case: a batch with no valid row
+def test_score_batch_all_invalid():
+    scores = score_batch(model, batch.assign(Age=np.nan))
+    assert not scores["valid"].any()
+    assert scores["y_pred"].isna().all()
+
+# Test: the empty predictions are written as empty CSV fields, not as 0
+def test_score_batch_written(tmp_path):
+    file_path = os.path.join(tmp_path, "predictions.csv")
+    with DataWriter(file_path) as writer:
+        writer.write(score_batch(model, batch.assign(Age=[50.0, np.nan, 32.0, 21.0])))
+    predictions = read_data(file_path)
+    assert predictions["y_pred"].isna().tolist() == [False, True, False, False]
+    assert predictions["valid"].tolist() == [True, False, True, True]
+
+# Case: the batch is not a DataFrame
+def test_score_batch_wrong_type():
+    with pytest.raises(TypeError):
+        score_batch(model, batch.to_numpy())
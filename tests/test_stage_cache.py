@@ -0,0 +1,131 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import shutil
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stage_cache import StageCache, fingerprint, stage_key
+
+# Test setup
+test_dir = "tests/test_stage_cache_dir"
+cache_dir = os.path.join(test_dir, "cache")
+output_path = os.path.join(test_dir, "output.txt")
+test_df = pd.DataFrame({"Glucose": [70, 120, 95], "Outcome": [0, 1, 0]})
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    os.makedirs(test_dir, exist_ok=True)
+    yield
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+
+calls = []
+
+def count_rows(data, offset=0):
+    calls.append(len(data))
+    return len(data) + offset
+
+def write_rows(data, file_path):
+    calls.append(len(data))
+    with open(file_path, "w") as f:
+        f.write(str(len(data)))
+    return "written"
+
+def split_rows(data):
+    calls.append(len(data))
+    return data.iloc[:2], data.iloc[2:]
+
+# Test: the fingerprint depends on the content, not on the object
+def test_fingerprint_content():
+    assert fingerprint(test_df) == fingerprint(test_df.copy())
+    assert fingerprint(test_df) != fingerprint(test_df.assign(Glucose=[70, 121, 95]))
+    assert fingerprint(test_df) != fingerprint(test_df.astype({"Glucose": float}))
+    assert fingerprint(np.arange(3)) != fingerprint(np.arange(3).reshape(3, 1))
+    assert fingerprint([1, "a"]) != fingerprint([1, "b"])
+
+# Test: the key depends on the function, the arguments and the dependencies
+def test_stage_key():
+    key = stage_key(count_rows, (test_df,))
+    assert key == stage_key(count_rows, (test_df.copy(),))
+    assert key != stage_key(count_rows, (test_df,), {"offset": 1})
+    assert key != stage_key(write_rows, (test_df,))
+    assert key != stage_key(count_rows, (test_df,), depends_on=[write_rows])
+    assert key != stage_key(count_rows, (test_df,), depends_on=["src.stage_cache"])
+    with pytest.raises(ModuleNotFoundError):
+        stage_key(count_rows, (test_df,), depends_on=["src.no_such_module"])
+
+# Test: editing the source of a module the stage depends on misses the cache
+def test_run_dependency_edited():
+    calls.clear()
+    module_path = os.path.join(test_dir, "stage_dependency.py")
+    with open(module_path, "w") as f:
+        f.write("THRESHOLD = 0.5\n")
+    sys.path.insert(0, test_dir)
+    try:
+        cache = StageCache(cache_dir)
+        cache.run(count_rows, test_df, depends_on=["stage_dependency"])
+        cache.run(count_rows, test_df, depends_on=["stage_dependency"])
+        assert calls == [3]
+        with open(module_path, "w") as f:
+            f.write("THRESHOLD = 0.6\n")
+        cache.run(count_rows, test_df, depends_on=["stage_dependency"])
+        assert calls == [3, 3]
+        assert cache.misses == ["count_rows", "count_rows"]
+    finally:
+        sys.path.remove(test_dir)
+
+# Test: a second identical call is a hit and does not run the function
+def test_run_hit():
+    calls.clear()
+    cache = StageCache(cache_dir)
+    assert cache.run(count_rows, test_df, offset=1) == 4
+    assert StageCache(cache_dir).run(count_rows, test_df.copy(), offset=1) == 4
+    assert calls == [3]
+    assert cache.misses == ["count_rows"]
+    cache.run(count_rows, test_df, offset=2, stage="count")
+    assert calls == [3, 3]
+    assert cache.misses == ["count_rows", "count"]
+
+# Test: output files are restored on a hit
+def test_run_restores_output_files():
+    calls.clear()
+    cache = StageCache(cache_dir)
+    cache.run(write_rows, test_df, output_path, output_files=[output_path])
+    os.remove(output_path)
+    assert cache.run(write_rows, test_df, output_path, output_files=[output_path]) == "written"
+    assert calls == [3]
+    with open(output_path) as f:
+        assert f.read() == "3"
+
+# Test: values returned by a stage are keyed by the stage, so later stages hit after a restore
+def test_run_chained_stages():
+    calls.clear()
+    cache = StageCache(cache_dir)
+    train, test = cache.run(split_rows, test_df)
+    cache.run(count_rows, train)
+    cache = StageCache(cache_dir)
+    train, test = cache.run(split_rows, test_df)
+    cache.run(count_rows, train)
+    assert calls == [3, 2]
+    assert cache.hits == ["split_rows", "count_rows"]
+
+# Test: the least recently used entries are evicted beyond the size cap
+def test_run_eviction():
+    cache = StageCache(cache_dir)
+    cache.run(count_rows, test_df, offset=1)
+    entry_size = cache.size()
+    cache = StageCache(cache_dir, max_bytes=2 * entry_size)
+    cache.run(count_rows, test_df, offset=2)
+    cache.run(count_rows, test_df, offset=1)
+    cache.run(count_rows, test_df, offset=3)
+    assert cache.size() <= 2 * entry_size
+    calls.clear()
+    cache.run(count_rows, test_df, offset=1)
+    cache.run(count_rows, test_df, offset=2)
+    assert calls == [3]
+
+# Case: negative size cap
+def test_negative_max_bytes():
+    with pytest.raises(ValueError):
+        StageCache(cache_dir, max_bytes=-1)
@@ -0,0 +1,85 @@
+import os
+import pytest
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.stage_scheduler import StageScheduler, Result, run_concurrently
+
+# Test setup
+def add(a, b):
+    return a + b
+
+def pair(a):
+    return a, a * 10
+
+def fail():
+    raise RuntimeError("stage failed")
+
+# Test: results are passed to the dependent stages
+def test_run_results():
+    scheduler = StageScheduler(max_workers=2)
+    scheduler.add('one', add, 0, 1)
+    scheduler.add('pair', pair, Result('one'))
+    scheduler.add('sum', add, Result('pair', 0), b=Result('pair', 1))
+    assert scheduler.run() == {'one': 1, 'pair': (1, 10), 'sum': 11}
+
+# Test: with one worker, stages run in the order they were added
+def test_run_sequential_order():
+    order = []
+    scheduler = StageScheduler()
+    for name in ['a', 'b', 'c']:
+        scheduler.add(name, order.append, name)
+    scheduler.run()
+    assert order == ['a', 'b', 'c']
+
+# Test: independent stages run at the same time
+def test_run_concurrent_stages():
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = StageScheduler(max_workers=2)
+    scheduler.add('a', barrier.wait)
+    scheduler.add('b', barrier.wait)
+    scheduler.run()
+
+# Test: a stage listed in `after` runs first
+def test_run_after():
+    order = []
+    scheduler = StageScheduler(max_workers=2)
+    scheduler.add('a', order.append, 'a')
+    scheduler.add('b', order.append, 'b', after=['a'])
+    scheduler.run()
+    assert order == ['a', 'b']
+
+# Case: a failed stage is re-raised and the stages depending on it do not run
+def test_run_failure():
+    ran = []
+    scheduler = StageScheduler(max_workers=2)
+    scheduler.add('fail', fail)
+    scheduler.add('after', ran.append, 'after', after=['fail'])
+    with pytest.raises(RuntimeError, match="stage failed") as error:
+        scheduler.run()
+    assert "Raised by pipeline stage 'fail'." in error.value.__notes__
+    assert ran == []
+
+# Case: dependency on a stage not added before
+def test_add_unknown_dependency():
+    scheduler = StageScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add('a', add, Result('b'), 1)
+
+# Case: duplicated stage name
+def test_add_duplicate_stage():
+    scheduler = StageScheduler()
+    scheduler.add('a', add, 1, 1)
+    with pytest.raises(ValueError):
+        scheduler.add('a', add, 1, 1)
+
+# Case: no workers
+def test_zero_workers():
+    with pytest.raises(ValueError):
+        StageScheduler(max_workers=0)
+
+# Test: run_concurrently returns the results in order and propagates failures
+def test_run_concurrently():
+    assert run_concurrently([lambda: 1, lambda: 2, lambda: 3], max_workers=2) == [1, 2, 3]
+    with pytest.raises(RuntimeError):
+        run_concurrently([lambda: 1, fail], max_workers=2)
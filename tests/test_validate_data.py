@@ -9,7 +9,8 @@ import pandas as pd
 import pandera as pa
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.validate_diabetes_data import validate_diabetes_data
+from src.validate_diabetes_data import validate_diabetes_data, flag_diabetes_data
+from src.check_diabetes_rules import flag_diabetes_rules, RULE_BITS
 
 
 # Valid data example
@@ -94,3 +95,14 @@ invalid_data_cases.append((case_missing_obs, f"Check absent or incorrect for mis
 def test_valid_w_invalid_data(invalid_data, description):
     with pytest.raises(pa.errors.SchemaErrors):
         validate_diabetes_data(invalid_data)
+
+# Case: flag_diabetes_data returns the same bitmask per row as the vectorized rule checks
+def test_flag_diabetes_data_matches_rule_checks():
+    data = valid_data.copy()
+    data.loc[0, "Glucose"] = 300
+    data.loc[2, "Age"] = 10
+    data.loc[2, "BMI"] = -1
+    failed_rules = flag_diabetes_data(data)
+    assert failed_rules.tolist() == [RULE_BITS["Glucose"], 0, RULE_BITS["BMI"] | RULE_BITS["Age"]]
+    assert (failed_rules == flag_diabetes_rules(data, check_duplicates=False)[0]).all()
+    assert (flag_diabetes_data(valid_data) == 0).all()
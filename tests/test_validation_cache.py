@@ -0,0 +1,118 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import shutil
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validation_cache import ValidationCache
+from src.check_diabetes_rules import flag_diabetes_rules, RULE_BITS
+
+# Test setup
+test_dir = "tests/test_validation_cache_dir"
+cache_path = os.path.join(test_dir, "cache.npz")
+test_df = pd.DataFrame({
+    "Outcome": [0, 1, 0, 1],
+    "Pregnancies": [0, 5, np.nan, 2],
+    "Glucose": [70, np.nan, 300, 120],
+    "BloodPressure": [80, 120, np.nan, 70],
+    "SkinThickness": [20, np.nan, 80, 30],
+    "Insulin": [np.nan, 250, 800, 100],
+    "BMI": [22.5, 35.1, np.nan, 30.2],
+    "DiabetesPedigreeFunction": [0.2, np.nan, 2.5, 0.5],
+    "Age": [25, np.nan, 90, 40],
+})
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    os.makedirs(test_dir, exist_ok=True)
+    yield
+    if os.path.exists(test_dir):
+        shutil.rmtree(test_dir)
+
+class RecordingFlagger:
+    """Vectorized rule checks that remember how many rows they were called on."""
+    def __init__(self):
+        self.n_rows = []
+
+    def __call__(self, data):
+        self.n_rows.append(len(data))
+        return flag_diabetes_rules(data, check_duplicates=False)[0]
+
+# Test: verdicts match the rule checks, and a second run validates nothing
+def test_flag_rows_uses_cache():
+    flagger = RecordingFlagger()
+    cache = ValidationCache()
+    failed_rules, n_validated = cache.flag_rows(test_df, flagger)
+    assert failed_rules.tolist() == [0, 0, RULE_BITS["Glucose"], 0]
+    assert n_validated == 4
+    assert len(cache) == 4
+
+    failed_rules, n_validated = cache.flag_rows(test_df, flagger)
+    assert failed_rules.tolist() == [0, 0, RULE_BITS["Glucose"], 0]
+    assert n_validated == 0
+    assert flagger.n_rows == [4]
+
+# Test: only rows not seen before are validated
+def test_flag_rows_new_rows_only():
+    flagger = RecordingFlagger()
+    cache = ValidationCache()
+    cache.flag_rows(test_df.iloc[:2], flagger)
+    failed_rules, n_validated = cache.flag_rows(test_df, flagger)
+    assert n_validated == 2
+    assert flagger.n_rows == [2, 2]
+    assert failed_rules.tolist() == [0, 0, RULE_BITS["Glucose"], 0]
+
+# Case: the refreshed data appends a row with a missing Glucose and a BMI
+# written as text, so both columns are read with other dtypes
+def test_flag_rows_refreshed_dtypes(tmp_path):
+    old = test_df.iloc[[0, 3]].astype({"Glucose": "int64"})
+    old.to_csv(tmp_path / "old.csv", index=False)
+    pd.concat([old, test_df.iloc[[1]]]).to_csv(tmp_path / "new.csv", index=False)
+    old = pd.read_csv(tmp_path / "old.csv")
+    new = pd.read_csv(tmp_path / "new.csv", dtype={"BMI": "string"})
+    assert old["Glucose"].dtype == "int64" and new["Glucose"].dtype == "float64"
+
+    flagger = RecordingFlagger()
+    cache = ValidationCache()
+    cache.flag_rows(old, flagger)
+    failed_rules, n_validated = cache.flag_rows(new, flagger)
+    assert n_validated == 1
+    assert flagger.n_rows == [2, 1]
+    assert failed_rules.tolist() == [0, 0, 0]
+
+# Test: rows repeating an earlier row are flagged as duplicates, whether cached or not
+def test_flag_rows_duplicates():
+    data = pd.concat([test_df, test_df.iloc[[0, 2]]], ignore_index=True)
+    cache = ValidationCache()
+    for _ in range(2):
+        failed_rules, _ = cache.flag_rows(data, RecordingFlagger())
+        assert failed_rules.tolist()[4:] == [RULE_BITS["duplicate_rows"]] * 2
+        assert failed_rules.tolist()[:4] == [0, 0, RULE_BITS["Glucose"], 0]
+
+# Test: the cache is saved and loaded, and a missing file gives an empty cache
+def test_save_and_load():
+    assert len(ValidationCache.load(cache_path)) == 0
+    cache = ValidationCache()
+    cache.flag_rows(test_df, RecordingFlagger())
+    cache.save(cache_path)
+    loaded = ValidationCache.load(cache_path)
+    np.testing.assert_array_equal(loaded.row_hashes, cache.row_hashes)
+    np.testing.assert_array_equal(loaded.failed_rules, cache.failed_rules)
+    assert not os.path.exists(cache_path + ".tmp")
+
+# Test: a cache saved under other validation rules is discarded
+def test_load_stale_rules():
+    with open(cache_path, "wb") as f:
+        np.savez(f, row_hashes=np.array([1], dtype=np.uint64), failed_rules=np.array([0], dtype=np.uint16),
+                 rules_fingerprint=np.array("other rules"))
+    assert len(ValidationCache.load(cache_path)) == 0
+
+# Test: errors for a directory path and a wrong input type
+def test_errors():
+    with pytest.raises(IsADirectoryError):
+        ValidationCache.load(test_dir)
+    with pytest.raises(FileNotFoundError):
+        ValidationCache().save(os.path.join(test_dir, "missing", "cache.npz"))
+    with pytest.raises(TypeError):
+        ValidationCache().flag_rows(test_df.to_numpy(), RecordingFlagger())
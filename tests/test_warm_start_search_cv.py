@@ -0,0 +1,53 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.warm_start_search_cv import WarmStartSearchCV
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from scipy.stats import loguniform
+
+# Test setup
+rng = np.random.default_rng(123)
+X = pd.DataFrame(rng.normal(size=(300, 4)) * [1, 10, 100, 0.1], columns=["a", "b", "c", "d"])
+y = pd.Series((X["a"] + X["b"] / 10 + rng.normal(size=300) > 0).astype(int))
+pipe = make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000, random_state=123))
+param_dist = {"logisticregression__C": loguniform(1e-5, 1e+5)}
+
+# Test: same candidates, scores and best model as RandomizedSearchCV
+def test_same_as_randomized_search():
+    random_fit = RandomizedSearchCV(pipe, param_dist, n_iter=10, cv=5, return_train_score=True,
+                                    random_state=123).fit(X, y)
+    warm_fit = WarmStartSearchCV(pipe, param_dist, n_iter=10, cv=5, return_train_score=True,
+                                 random_state=123).fit(X, y)
+    assert list(warm_fit.cv_results_) == list(random_fit.cv_results_)
+    assert warm_fit.cv_results_["params"] == random_fit.cv_results_["params"]
+    for key in ["mean_test_score", "mean_train_score", "split0_test_score", "std_test_score"]:
+        np.testing.assert_allclose(warm_fit.cv_results_[key], random_fit.cv_results_[key], atol=1e-3)
+    assert warm_fit.best_params_ == random_fit.best_params_
+    assert warm_fit.best_index_ == random_fit.best_index_
+    np.testing.assert_allclose(warm_fit.predict_proba(X), random_fit.predict_proba(X))
+    assert warm_fit.score(X, y) == random_fit.score(X, y)
+
+# Test: numpy arrays and no training scores
+def test_arrays_without_train_score():
+    warm_fit = WarmStartSearchCV(pipe, param_dist, n_iter=5, cv=3, random_state=0).fit(X.to_numpy(), y.to_numpy())
+    assert "mean_train_score" not in warm_fit.cv_results_
+    assert "split2_test_score" in warm_fit.cv_results_
+    assert warm_fit.cv_results_["rank_test_score"].min() == 1
+    assert len(warm_fit.predict(X.to_numpy())) == len(X)
+
+# Case: more than one parameter
+def test_several_parameters():
+    params = dict(param_dist, logisticregression__tol=[1e-4, 1e-3])
+    with pytest.raises(ValueError):
+        WarmStartSearchCV(pipe, params).fit(X, y)
+
+# Case: parameter of another step than the final one
+def test_parameter_not_of_final_step():
+    with pytest.raises(ValueError):
+        WarmStartSearchCV(pipe, {"standardscaler__with_mean": [True, False]}).fit(X, y)